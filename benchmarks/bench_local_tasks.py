@@ -0,0 +1,113 @@
+"""
+Event loop lag caused by blocking local tasks, inline versus offloaded.
+
+Every pipeline runs a local task that blocks for ``--block-ms`` (standing in
+for a synchronous ``pd.read_csv`` or ``os.listdir``) and then requests one
+adaptive step. We report the event loop lag seen by the manager, the p50/max
+delay of the adaptive steps and the wall time, once with local tasks running
+inline on the loop and once on the manager's worker threads.
+
+Usage:
+    python benchmarks/bench_local_tasks.py [--pipelines 200] [--block-ms 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from radical.asyncflow import NoopExecutionBackend
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.logger import ImpressLogger
+
+
+class ReadingPipeline(ImpressBasePipeline):
+    """Pipeline with one blocking local task and one adaptive step."""
+
+    def __init__(self, name, flow, block=0.02, **kwargs):
+        self.block = block
+        super().__init__(name, flow, **kwargs)
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task(local_task=True)
+        async def check_results():
+            time.sleep(self.block)
+
+    async def run(self):
+        await self.check_results()
+        self.state["requested"] = time.perf_counter()
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def record_latency(pipeline):
+    pipeline.state["latency"] = time.perf_counter() - pipeline.state["requested"]
+
+
+async def run_once(pipelines, block, workers):
+    manager = ImpressManager(
+        NoopExecutionBackend(), local_task_workers=workers, loop_lag_interval=0.005
+    )
+    manager.logger = ImpressLogger(output_stream=open(os.devnull, "w"))
+
+    finished = []
+    release = manager.admission.release
+
+    def tracking_release(pipeline):
+        finished.append(pipeline)
+        return release(pipeline)
+
+    manager.admission.release = tracking_release
+
+    setups = [
+        PipelineSetup(
+            name=f"p{i}",
+            type=ReadingPipeline,
+            adaptive_fn=record_latency,
+            kwargs={"block": block},
+        )
+        for i in range(pipelines)
+    ]
+
+    wall_start = time.perf_counter()
+    await manager.start(setups)
+    wall = time.perf_counter() - wall_start
+    await manager.flow.shutdown()
+
+    latencies = sorted(p.state["latency"] for p in finished)
+    lag = manager.loop_lag.metrics()
+    return {
+        "wall_s": wall,
+        "lag_mean_ms": lag["mean_lag_ms"],
+        "lag_max_ms": lag["max_lag_ms"],
+        "adaptive_p50_ms": statistics.median(latencies) * 1e3,
+        "adaptive_max_ms": latencies[-1] * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pipelines", type=int, default=200)
+    parser.add_argument("--block-ms", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':>10} {'wall s':>8} {'lag mean ms':>12} {'lag max ms':>11} "
+        f"{'adapt p50 ms':>13} {'adapt max ms':>13}"
+    )
+    for mode, workers in (("inline", 0), ("offloaded", args.workers)):
+        r = asyncio.run(run_once(args.pipelines, args.block_ms / 1e3, workers))
+        print(
+            f"{mode:>10} {r['wall_s']:>8.3f} {r['lag_mean_ms']:>12.1f} "
+            f"{r['lag_max_ms']:>11.1f} {r['adaptive_p50_ms']:>13.1f} "
+            f"{r['adaptive_max_ms']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Per-event latency and CPU cost of the ImpressManager event loop.
+
+Every pipeline requests one adaptive step and then finishes. For each run we
+record the delay between ``run_adaptive_step()`` and the start of the adaptive
+function (the manager's reaction time) plus the CPU time the whole run took.
+Every pipeline requests its step at start-up, so at large sizes the latency is
+time spent queueing behind the rest of the burst, not a polling delay. Each
+run starts after a full garbage collection, so the collection of the freshly
+imported heap is not charged to the first size.
+
+With ``--max-p50-ms`` the script exits non-zero when any size's median latency
+exceeds that bound.
+
+Usage:
+    python benchmarks/bench_manager_events.py [--sizes 10 1000 10000]
+        [--max-p50-ms 50]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import statistics
+import sys
+import time
+
+from radical.asyncflow import NoopExecutionBackend
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.logger import ImpressLogger
+
+
+class EventPipeline(ImpressBasePipeline):
+    """Pipeline with no tasks: one adaptive round-trip and done."""
+
+    def register_pipeline_tasks(self):
+        pass
+
+    async def run(self):
+        self.state["requested"] = time.perf_counter()
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def record_latency(pipeline):
+    pipeline.state["latency"] = time.perf_counter() - pipeline.state["requested"]
+
+
+async def run_once(size):
+    manager = ImpressManager(NoopExecutionBackend())
+    manager.logger = ImpressLogger(output_stream=open(os.devnull, "w"))
+
+    pipelines = []
+    original_submit = manager.submit_new_pipelines
+
+    def tracking_submit(setups):
+        before = set(manager.pipeline_tasks)
+        original_submit(setups)
+        pipelines.extend(p for p in manager.pipeline_tasks if p not in before)
+
+    manager.submit_new_pipelines = tracking_submit
+
+    setups = [
+        PipelineSetup(name=f"p{i}", type=EventPipeline, adaptive_fn=record_latency)
+        for i in range(size)
+    ]
+
+    gc.collect()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await manager.start(setups)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    await manager.flow.shutdown()
+
+    latencies = sorted(p.state["latency"] for p in pipelines)
+    return {
+        "pipelines": size,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_per_event_us": cpu / size * 1e6,
+        "latency_p50_ms": statistics.median(latencies) * 1e3,
+        "latency_max_ms": latencies[-1] * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument(
+        "--max-p50-ms", type=float, help="fail when a median latency exceeds this"
+    )
+    args = parser.parse_args()
+
+    regressions = []
+
+    print(
+        f"{'pipelines':>10} {'wall s':>8} {'cpu s':>8} {'cpu/event us':>13} "
+        f"{'p50 ms':>8} {'max ms':>8}"
+    )
+    for size in args.sizes:
+        r = asyncio.run(run_once(size))
+        print(
+            f"{r['pipelines']:>10} {r['wall_s']:>8.3f} {r['cpu_s']:>8.3f} "
+            f"{r['cpu_per_event_us']:>13.1f} {r['latency_p50_ms']:>8.2f} "
+            f"{r['latency_max_ms']:>8.2f}"
+        )
+        if args.max_p50_ms is not None and r["latency_p50_ms"] > args.max_p50_ms:
+            regressions.append(
+                f"{size} pipelines: p50 {r['latency_p50_ms']:.2f} ms "
+                f"> {args.max_p50_ms:g} ms"
+            )
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
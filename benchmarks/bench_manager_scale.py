@@ -0,0 +1,262 @@
+"""
+Scalability of ImpressManager at 100 to 50k concurrent pipelines.
+
+Each size runs in a fresh process on the no-op backend. All root pipelines
+start and stay alive together (so memory is measured at full concurrency),
+then each requests one adaptive step whose function spawns one child.
+
+Per size we record:
+
+- ``submit_s``: time spent in the initial ``submit_new_pipelines()`` call
+- ``start_rate_per_s``: root pipelines started per second by ``start()``
+- ``rss_per_pipeline_kb``: resident memory growth per live pipeline
+- ``adaptive_p50_ms`` / ``adaptive_p95_ms`` / ``adaptive_max_ms``: delay from
+  ``run_adaptive_step()`` to the start of the adaptive function
+- ``spawn_rate_per_s`` / ``spawn_p95_ms``: children started per second and
+  delay from the child request to the child's ``run()``
+- ``cpu_s`` / ``cpu_per_pipeline_us``: process CPU time of the whole run
+
+Results are written as JSON. With ``--baseline`` the run is compared against
+an earlier result file and the script exits non-zero when a metric regressed
+by more than ``--tolerance``.
+
+Usage:
+    python benchmarks/bench_manager_scale.py [--sizes 100 1000 10000 50000]
+        [--output bench_manager_scale.json] [--baseline old.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from radical.asyncflow import NoopExecutionBackend
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.logger import ImpressLogger
+
+# Metric -> direction that counts as better, for the baseline comparison
+TRACKED_METRICS = {
+    "submit_s": "lower",
+    "start_rate_per_s": "higher",
+    "rss_per_pipeline_kb": "lower",
+    "adaptive_p95_ms": "lower",
+    "spawn_rate_per_s": "higher",
+    "cpu_per_pipeline_us": "lower",
+}
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class Campaign:
+    """Shared timestamps and the gate holding root pipelines alive."""
+
+    def __init__(self, size):
+        self.size = size
+        self.started = 0
+        self.gate = asyncio.Event()
+        self.all_started = None
+        self.rss_live = None
+        self.adaptive = []
+        self.spawn = []
+        self.child_starts = []
+
+
+class ScalePipeline(ImpressBasePipeline):
+    """Root: start, wait for every root, one adaptive round-trip.
+    Child: record its spawn delay and finish."""
+
+    def __init__(self, name, flow, campaign=None, requested=None, **kwargs):
+        self.campaign = campaign
+        self.requested = requested
+        super().__init__(name, flow, **kwargs)
+
+    def register_pipeline_tasks(self):
+        pass
+
+    async def run(self):
+        campaign = self.campaign
+        now = time.perf_counter()
+        if self.requested is not None:
+            campaign.spawn.append(now - self.requested)
+            campaign.child_starts.append(now)
+            return
+
+        campaign.started += 1
+        if campaign.started == campaign.size:
+            campaign.all_started = now
+            campaign.rss_live = rss_bytes()
+            campaign.gate.set()
+        await campaign.gate.wait()
+
+        self.state["requested"] = time.perf_counter()
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def spawn_child(pipeline):
+    now = time.perf_counter()
+    pipeline.campaign.adaptive.append(now - pipeline.state["requested"])
+    pipeline.submit_child_pipeline_request(
+        {
+            "name": f"{pipeline.name}-child",
+            "type": ScalePipeline,
+            "campaign": pipeline.campaign,
+            "requested": now,
+        }
+    )
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+async def run_size(size):
+    campaign = Campaign(size)
+    manager = ImpressManager(NoopExecutionBackend(), loop_lag_interval=None)
+    manager.logger = ImpressLogger(output_stream=open(os.devnull, "w"))
+
+    submit_times = []
+    original_submit = manager.submit_new_pipelines
+
+    def timed_submit(setups):
+        started = time.perf_counter()
+        original_submit(setups)
+        submit_times.append(time.perf_counter() - started)
+
+    manager.submit_new_pipelines = timed_submit
+
+    setups = [
+        PipelineSetup(
+            name=f"p{i}",
+            type=ScalePipeline,
+            adaptive_fn=spawn_child,
+            kwargs={"campaign": campaign},
+        )
+        for i in range(size)
+    ]
+
+    rss_start = rss_bytes()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await manager.start(setups)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    await manager.flow.shutdown()
+
+    spawn_window = max(campaign.child_starts) - campaign.all_started
+    return {
+        "pipelines": size,
+        "wall_s": wall,
+        "submit_s": submit_times[0],
+        "start_rate_per_s": size / (campaign.all_started - wall_start),
+        "rss_per_pipeline_kb": (campaign.rss_live - rss_start) / size / 1024,
+        "adaptive_p50_ms": statistics.median(campaign.adaptive) * 1e3,
+        "adaptive_p95_ms": percentile(campaign.adaptive, 95) * 1e3,
+        "adaptive_max_ms": max(campaign.adaptive) * 1e3,
+        "spawn_rate_per_s": len(campaign.spawn) / spawn_window,
+        "spawn_p95_ms": percentile(campaign.spawn, 95) * 1e3,
+        "cpu_s": cpu,
+        "cpu_per_pipeline_us": cpu / (2 * size) * 1e6,
+    }
+
+
+def measure(size):
+    """Run one size (in a fresh worker process)."""
+    return asyncio.run(run_size(size))
+
+
+def compare(results, baseline, tolerance):
+    """
+    List the metrics that regressed against a baseline result file.
+
+    Returns:
+        Human readable regression descriptions
+    """
+    previous = {r["pipelines"]: r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(result["pipelines"])
+        if old is None:
+            continue
+        for metric, better in TRACKED_METRICS.items():
+            before, after = old[metric], result[metric]
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            worse = change > tolerance if better == "lower" else -change > tolerance
+            if worse:
+                regressions.append(
+                    f"{result['pipelines']} pipelines: {metric} "
+                    f"{before:.4g} -> {after:.4g} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000]
+    )
+    parser.add_argument("--output", default="bench_manager_scale.json")
+    parser.add_argument("--baseline", help="earlier result file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    print(
+        f"{'pipelines':>10} {'submit s':>9} {'start/s':>9} {'rss kb/p':>9} "
+        f"{'adapt p95':>10} {'spawn/s':>9} {'cpu/p us':>9}"
+    )
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            r = pool.submit(measure, size).result()
+        results.append(r)
+        print(
+            f"{r['pipelines']:>10} {r['submit_s']:>9.3f} "
+            f"{r['start_rate_per_s']:>9.0f} {r['rss_per_pipeline_kb']:>9.1f} "
+            f"{r['adaptive_p95_ms']:>10.2f} {r['spawn_rate_per_s']:>9.0f} "
+            f"{r['cpu_per_pipeline_us']:>9.1f}"
+        )
+
+    document = {
+        "benchmark": "manager_scale",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
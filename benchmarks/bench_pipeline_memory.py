@@ -0,0 +1,168 @@
+"""
+Memory held by idle pipelines, i.e. pending branches queued in a manager.
+
+For each pipeline kind we build ``--pipelines`` pipelines under tracemalloc
+and report the bytes allocated per pipeline:
+
+- ``constructed``: the pipeline objects alone
+- ``queued``: ``submit_new_pipelines()`` with every pipeline but the first
+  left waiting for admission (pipeline plus manager bookkeeping: lineage
+  node, admission queue entry)
+
+Kinds: ``class_tasks`` declares three tasks with ``pipeline_task``;
+``instance_tasks`` registers the same tasks per instance in
+``register_pipeline_tasks()``. A stub flow stands in for the workflow engine
+so only IMPRESS objects are counted.
+
+Usage:
+    python benchmarks/bench_pipeline_memory.py [--pipelines 20000]
+        [--output bench_pipeline_memory.json]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import Mock
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup, pipeline_task
+from impress.utils.logger import ImpressLogger
+
+
+class StubFlow:
+    """Flow whose executable tasks are returned undecorated."""
+
+    def executable_task(self, **task_kwargs):
+        return lambda func: func
+
+
+class ClassTaskPipeline(ImpressBasePipeline):
+    """Three executable tasks declared on the class."""
+
+    def __init__(self, name, flow, start_step=1, **kwargs):
+        self.start_step = start_step
+        super().__init__(name, flow, **kwargs)
+
+    @pipeline_task()
+    async def design(self, task_description={"gpus_per_rank": 1}):  # noqa: B006
+        return f"design {self.name}"
+
+    @pipeline_task()
+    async def fold(self, task_description={"gpus_per_rank": 1}):  # noqa: B006
+        return f"fold {self.name}"
+
+    @pipeline_task()
+    async def score(self):
+        return f"score {self.name}"
+
+    async def run(self):
+        pass
+
+    async def finalize(self):
+        pass
+
+
+class InstanceTaskPipeline(ClassTaskPipeline):
+    """The same tasks registered per instance (one closure each)."""
+
+    design = fold = score = None
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task()
+        async def design(task_description={"gpus_per_rank": 1}):  # noqa: B006
+            return f"design {self.name}"
+
+        @self.auto_register_task()
+        async def fold(task_description={"gpus_per_rank": 1}):  # noqa: B006
+            return f"fold {self.name}"
+
+        @self.auto_register_task()
+        async def score():
+            return f"score {self.name}"
+
+
+KINDS = {"class_tasks": ClassTaskPipeline, "instance_tasks": InstanceTaskPipeline}
+
+
+def traced(build):
+    """Bytes still allocated after calling ``build()`` (result kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+async def queued(kind, count):
+    """Bytes per pipeline left pending in a manager's admission queue."""
+    manager = ImpressManager(
+        Mock(), max_in_flight=1, loop_lag_interval=None, collect_stats=False
+    )
+    manager.logger = ImpressLogger(output_stream=open(os.devnull, "w"))
+    manager.flow = StubFlow()
+    setups = [PipelineSetup(name=f"p{i}", type=KINDS[kind]) for i in range(count)]
+
+    def submit():
+        manager.submit_new_pipelines(setups)
+        return manager
+
+    size = traced(submit)
+    for task in manager.pipeline_tasks.values():
+        task.cancel()
+    return size / count
+
+
+def measure(kind, count):
+    """Measure one pipeline kind (in a fresh worker process)."""
+    flow = StubFlow()
+    constructed = traced(lambda: [KINDS[kind](f"p{i}", flow) for i in range(count)])
+    return {
+        "kind": kind,
+        "pipelines": count,
+        "constructed_bytes": constructed / count,
+        "queued_bytes": asyncio.run(queued(kind, count)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pipelines", type=int, default=20_000)
+    parser.add_argument("--output", default="bench_pipeline_memory.json")
+    args = parser.parse_args()
+
+    print(f"{'kind':>15} {'pipelines':>10} {'constructed B':>14} {'queued B':>9}")
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for kind in KINDS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            r = pool.submit(measure, kind, args.pipelines).result()
+        results.append(r)
+        print(
+            f"{r['kind']:>15} {r['pipelines']:>10} "
+            f"{r['constructed_bytes']:>14.0f} {r['queued_bytes']:>9.0f}"
+        )
+
+    document = {
+        "benchmark": "pipeline_memory",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
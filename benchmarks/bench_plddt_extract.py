@@ -0,0 +1,108 @@
+"""
+Wall time of the protein binding ``s5`` step (plddt_extract_pipeline.py).
+
+We write a synthetic AlphaFold output tree (``--models`` best models of
+``--residues`` residues, their ptm JSON and top-ranked result pickle) and run
+the script as ``s5`` does, in a fresh interpreter, for each B-factor reader
+and worker count: once for pass 1 (everything scored) and once for pass 2
+with unchanged models (everything from the score cache). The PyRosetta
+reader is skipped when PyRosetta is not installed.
+
+Usage:
+    python benchmarks/bench_plddt_extract.py [--models 20] [--residues 300]
+        [--workers 1 4]
+"""
+
+import argparse
+import importlib.util
+import json
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT = (
+    Path(__file__).parents[1]
+    / "examples"
+    / "protien_binding_usecase"
+    / "plddt_extract_pipeline.py"
+)
+
+
+def write_tree(base, models, residues):
+    prediction = base / "af_pipeline_outputs_multi" / "bench" / "af/prediction"
+    rng = np.random.default_rng(0)
+    for i in range(models):
+        name = f"design_{i}"
+        for sub in ("best_models", "best_ptm", f"dimer_models/{name}"):
+            (prediction / sub).mkdir(parents=True, exist_ok=True)
+
+        lines = []
+        for residue in range(1, residues + 1):
+            chain = "A" if residue <= residues - 10 else "B"
+            for atom in ("N", "CA", "C", "O"):
+                lines.append(
+                    f"ATOM  {len(lines) + 1:>5}  {atom:<3} GLY {chain}{residue:>4}    "
+                    f"{0.0:>8.3f}{0.0:>8.3f}{0.0:>8.3f}{1.0:>6.2f}"
+                    f"{rng.uniform(30, 95):>6.2f}           {atom[0]}  \n"
+                )
+        (prediction / f"best_models/{name}.pdb").write_text("".join(lines) + "END\n")
+        (prediction / f"best_ptm/{name}.json").write_text(
+            json.dumps({"iptm+ptm": {"model_1": 0.8}, "order": ["model_1"]})
+        )
+        pae = (rng.random((residues, residues)) * 31.75).astype(np.float32)
+        with open(prediction / f"dimer_models/{name}/result_model_1.pkl", "wb") as f:
+            pickle.dump({"predicted_aligned_error": pae}, f)
+
+
+def run_s5(base, reader, workers, iteration):
+    started = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            str(SCRIPT),
+            f"--path={base}",
+            f"--iter={iteration}",
+            "--out=bench",
+            f"--reader={reader}",
+            f"--workers={workers}",
+        ],
+        cwd=base,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--models", type=int, default=20)
+    parser.add_argument("--residues", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    readers = ["numpy"]
+    if importlib.util.find_spec("pyrosetta") is not None:
+        readers.append("pyrosetta")
+
+    print(
+        f"{'reader':>10} {'workers':>8} {'models':>7} {'pass 1 s':>9} {'pass 2 s':>9}"
+    )
+    for reader in readers:
+        for workers in args.workers:
+            base = Path(tempfile.mkdtemp(prefix="impress-bench-"))
+            write_tree(base, args.models, args.residues)
+            first = run_s5(base, reader, workers, 1)
+            second = run_s5(base, reader, workers, 2)
+            print(
+                f"{reader:>10} {workers:>8} {args.models:>7} "
+                f"{first:>9.3f} {second:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Throughput of ShardedImpressManager as the number of shards grows.
+
+Every root pipeline requests one adaptive step whose function burns
+``--adaptive-ms`` of CPU in Python (standing in for CSV parsing and ranking)
+and spawns one child. On a single manager these calls share one interpreter;
+with N shards they run in N processes. We report the wall time and pipelines
+finished per second for each shard count, on the no-op backend.
+
+Usage:
+    python benchmarks/bench_sharded_manager.py [--pipelines 200]
+        [--shards 1 2 4] [--adaptive-ms 20]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from radical.asyncflow import NoopExecutionBackend
+
+from impress import ImpressBasePipeline, PipelineSetup, ShardedImpressManager
+
+
+class BranchingPipeline(ImpressBasePipeline):
+    """Root: one adaptive step. Child: finish."""
+
+    def __init__(self, name, flow, burn=0.02, child=False, **kwargs):
+        self.burn = burn
+        self.child = child
+        super().__init__(name, flow, **kwargs)
+
+    async def run(self):
+        if not self.child:
+            await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+def burn_cpu(seconds):
+    deadline = time.thread_time() + seconds
+    total = 0
+    while time.thread_time() < deadline:
+        total += sum(range(1000))
+    return total
+
+
+async def rank_and_branch(pipeline):
+    burn_cpu(pipeline.burn)
+    pipeline.submit_child_pipeline_request(
+        {"name": f"{pipeline.name}-child", "type": BranchingPipeline, "child": True}
+    )
+
+
+async def run_once(pipelines, shards, burn):
+    manager = ShardedImpressManager(
+        NoopExecutionBackend,
+        shards=shards,
+        use_colors=False,
+        log_console=False,
+        loop_lag_interval=None,
+        collect_stats=False,
+    )
+    manager.logger.console = False
+    setups = [
+        PipelineSetup(
+            name=f"p{i}",
+            type=BranchingPipeline,
+            adaptive_fn=rank_and_branch,
+            kwargs={"burn": burn},
+        )
+        for i in range(pipelines)
+    ]
+    started = time.perf_counter()
+    await manager.start(setups)
+    wall = time.perf_counter() - started
+    finished = manager.lineage_snapshot()["counts"]["completed"]
+    return wall, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pipelines", type=int, default=200)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--adaptive-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="impress-bench-"))
+    print(f"{'shards':>7} {'wall s':>8} {'pipelines/s':>12} {'speedup':>8}")
+    baseline = None
+    for shards in args.shards:
+        wall, finished = asyncio.run(
+            run_once(args.pipelines, shards, args.adaptive_ms / 1e3)
+        )
+        baseline = baseline or wall
+        print(
+            f"{shards:>7} {wall:>8.2f} {finished / wall:>12.0f} {baseline / wall:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ import pathlib
 
 import pandas as pd
 
-from impress.pipelines.impress_pipeline import ImpressBasePipeline
+from impress.pipelines.impress_pipeline import ImpressBasePipeline, pipeline_task
 
 
 # ── State-machine step constants ────────────────────────────────────────────
@@ -173,17 +173,10 @@ class DiscontinuousScaffoldsPipeline(ImpressBasePipeline):
         self.diffusion_batch_size = kwargs.get("diffusion_batch_size", DEFAULT_DIFFUSION_BATCH_SIZE)
         self.lmpnn_num_batches    = kwargs.get("lmpnn_num_batches",    DEFAULT_LMPNN_NUM_BATCHES)
 
-        # Derive LMPNN JSONs from RFD input if not explicitly provided.
-        # Branch pipelines always receive explicit (pre-filtered) JSONs, so
-        # generation is only triggered for root pipelines.
-        if kwargs.get("lmpnn_pdb_multi_json") and kwargs.get("lmpnn_fixed_res_json"):
-            self.lmpnn_pdb_multi_json = kwargs["lmpnn_pdb_multi_json"]
-            self.lmpnn_fixed_res_json = kwargs["lmpnn_fixed_res_json"]
-        else:
-            gen_dir = os.path.join(self.base_path, self.branch_id)
-            self.lmpnn_pdb_multi_json, self.lmpnn_fixed_res_json = generate_lmpnn_jsons(
-                self.rfd_input_filepath, self.diffusion_batch_size, gen_dir
-            )
+        # Branch pipelines receive explicit (pre-filtered) LMPNN JSONs;
+        # root pipelines derive them from the RFD input in on_prepare().
+        self.lmpnn_pdb_multi_json = kwargs.get("lmpnn_pdb_multi_json")
+        self.lmpnn_fixed_res_json = kwargs.get("lmpnn_fixed_res_json")
 
         # ── backbone thresholds — (lower, upper) or None to disable ─────────
         self.backbone_rog_bounds      = kwargs.get('backbone_rog_bounds',      None)
@@ -197,326 +190,331 @@ class DiscontinuousScaffoldsPipeline(ImpressBasePipeline):
         self.seq_ligand_conf_bounds  = kwargs.get('seq_ligand_conf_bounds',  None)
         self.seq_overall_conf_bounds = kwargs.get('seq_overall_conf_bounds', None)
 
-        # super().__init__ calls register_pipeline_tasks(), so all self.* must
-        # be set before this call.
         super().__init__(name, flow, **configs, **kwargs)
 
         # Pre-populate state for branch pipelines that skip early stages
         # (e.g. a seq-start branch needs pdb_dir already set).
         self.state.update(kwargs.get('initial_state', {}))
 
-    # ── Task registration ───────────────────────────────────────────────────
-
-    def register_pipeline_tasks(self):
-        """Register all eight pipeline steps plus the local analysis checks."""
-
-        # ── Step 1: Backbone generation (GPU) ───────────────────────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def backbone_gen(task_description={"gpus_per_rank": 1}):
-            self.taskcount += 1
-            taskname = "backbone_gen"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            output_dir = f"{taskdir}/out"
-            self.state['rfd3_out_dir'] = output_dir
-
-            return (
-                f"bash {self.scripts_path}/step1_backbone_gen.sh "
-                f"{self.foundry_sif_path} "
-                f"{output_dir} "
-                f"{self.rfd_input_filepath} "
-                f"{self.diffusion_batch_size}"
-            )
-
-        # ── Step 2: Backbone postprocessing — CIF.GZ → PDB (CPU) ────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def backbone_post(task_description={}):
-            self.taskcount += 1
-            taskname = "backbone_post"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-            print(f"state.rfd3_out_dir value before bb-post update is {self.state['rfd3_out_dir']}")
-            rfd3_out = self.state['rfd3_out_dir']
-            print(f"state.rfd3_out_dir value after bb-post update is {rfd3_out}")
-            # Conversion is in-place; PDB files land alongside the CIFs.
-            self.state['pdb_dir'] = rfd3_out
-
-            return (
-                f"bash {self.scripts_path}/step2_backbone_post.sh "
-                f"{self.scripts_path} "
-                f"{rfd3_out}"
-            )
-
-        # ── Step 3: Backbone analysis (CPU) ─────────────────────────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def backbone_analysis(task_description={}):
-            self.taskcount += 1
-            taskname = "backbone_analysis"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            pdb_dir    = self.state['pdb_dir']
-            output_csv = f"{taskdir}/out/campaign_analysis_backbone.csv"
-            output_dir = f"{taskdir}/out"
-
-            self.state['backbone_analysis_csv']     = output_csv
-            self.state['backbone_analysis_out_dir'] = output_dir
-
-            return (
-                f"bash {self.scripts_path}/step3_backbone_analysis.sh "
-                f"{self.scripts_path} "
-                f"{pdb_dir} "
-                f"{output_csv} "
-                f"{output_dir} "
-                f"{self.island_counts_csv}"
-            )
-
-        # ── Step 4: Sequence prediction — LigandMPNN (CPU) ──────────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def seq_pred(task_description={"gpus_per_rank": 1}):
-            self.taskcount += 1
-            taskname = "seq_pred"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            output_dir = f"{taskdir}/out"
-            self.state['lmpnn_out_dir'] = output_dir
-
-            # Use filtered JSONs if the backbone adaptive step created them;
-            # otherwise fall back to the original pipeline inputs.
-            lmpnn_json = self.state.get(
-                'current_lmpnn_pdb_multi_json', self.lmpnn_pdb_multi_json)
-            fixed_json = self.state.get(
-                'current_lmpnn_fixed_res_json', self.lmpnn_fixed_res_json)
-
-            # Remap static JSON keys to runtime pdb_dir paths.
-            # The static JSONs use relative paths (e.g. "./outputs_rfd3/model.pdb")
-            # but PDB files are generated at runtime under self.state['pdb_dir'].
-            pdb_dir = self.state['pdb_dir']
-
-            def _remap_json(src_path, dst_path):
-                with open(src_path) as fh:
-                    data = json.load(fh)
-                remapped = {
-                    os.path.join(pdb_dir, os.path.basename(k)): v
-                    for k, v in data.items()
-                }
-                with open(dst_path, 'w') as fh:
-                    json.dump(remapped, fh, indent=2)
-                return dst_path
-
-            runtime_json       = _remap_json(lmpnn_json,  f"{taskdir}/in/lmpnn_pdb_multi.json")
-            runtime_fixed_json = _remap_json(fixed_json,   f"{taskdir}/in/lmpnn_fixed_res.json")
-
-            return (
-                f"bash {self.scripts_path}/step4_seq_pred.sh "
-                f"{self.mpnn_dir} "
-                f"{output_dir} "
-                f"{runtime_json} "
-                f"{runtime_fixed_json} "
-                f"{self.lmpnn_num_batches} "
-            )
-
-        # ── Step 5: Sequence postprocessing — split_seqs (CPU) ──────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def seq_post(task_description={}):
-            self.taskcount += 1
-            taskname = "seq_post"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            lmpnn_out  = self.state['lmpnn_out_dir']
-            seqs_dir   = f"{lmpnn_out}/seqs"
-            split_dir  = f"{taskdir}/out/seqs_split"
-            self.state['seqs_split_dir'] = split_dir
-
-            return (
-                f"bash {self.scripts_path}/step5_seq_post.sh "
-                f"{self.scripts_path} "
-                f"{seqs_dir} "
-                f"{split_dir}"
-            )
-
-        # ── Step 6: Sequence analysis (CPU) ──────────────────────────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def seq_analysis(task_description={}):
-            self.taskcount += 1
-            taskname = "seq_analysis"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            seqs_split = self.state['seqs_split_dir']
-            output_csv = f"{taskdir}/out/campaign_analysis_sequence.csv"
-            output_dir = f"{taskdir}/out"
-
-            self.state['seq_analysis_csv']     = output_csv
-            self.state['seq_analysis_out_dir'] = output_dir
-
-            return (
-                f"bash {self.scripts_path}/step6_seq_analysis.sh "
-                f"{self.scripts_path} "
-                f"{seqs_split} "
-                f"{output_csv} "
-                f"{output_dir} "
-                f"{self.island_counts_csv}"
-            )
-
-        # ── Step 7: Fold prediction — Chai-lab (GPU) ─────────────────────────
-        @self.auto_register_task(capture_stdio=True)
-        async def fold_pred(task_description={"gpus_per_rank": 1}):
-            self.taskcount += 1
-            taskname = "fold_pred"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            # Use filtered seqs dir if the sequence adaptive step created one.
-            input_dir  = self.state.get(
-                'current_seqs_split_dir', self.state['seqs_split_dir'])
-            output_dir = f"{taskdir}/out"
-            self.state['chai_out_dir'] = output_dir
-
-            return (
-                f"bash {self.scripts_path}/step7_fold_pred.sh "
-                f"{self.scripts_path} "
-                f"{input_dir} "
-                f"{output_dir}"
-            )
-
-        # ── Step 8: Pipeline analysis — analysis.py + plot_campaign.py (CPU) ─
-        @self.auto_register_task(capture_stdio=True)
-        async def pipeline_analysis(task_description={}):
-            self.taskcount += 1
-            taskname = "pipeline_analysis"
-            taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
-            os.makedirs(f"{taskdir}/in",  exist_ok=True)
-            os.makedirs(f"{taskdir}/out", exist_ok=True)
-
-            chai_out   = self.state['chai_out_dir']
-            output_csv = f"{taskdir}/out/campaign_analysis.csv"
-            output_dir = f"{taskdir}/out"
-
-            self.state['analysis_csv']     = output_csv
-            self.state['analysis_out_dir'] = output_dir
-
-            return (
-                f"bash {self.scripts_path}/step8_pipeline_analysis.sh "
-                f"{self.scripts_path} "
-                f"{chai_out} "
-                f"{output_csv} "
-                f"{output_dir} "
-                f"{self.mcsa_pdb_dir} "
-                f"{self.island_counts_csv} "
-                f"{self.rmsd_threshold}"
-            )
-
-        # ── Local check: backbone analysis results ────────────────────────────
-        @self.auto_register_task(local_task=True)
-        async def check_backbone_results():
-            csv = self.state.get('backbone_analysis_csv')
-            self.state['last_analysis_step'] = 'backbone'
-
-            if not csv or not os.path.isfile(csv):
-                self.logger.pipeline_log(
-                    f"[check_backbone] CSV not found at {csv!r}; treating all models as failing"
-                )
-                self.state['passing_backbone_models'] = []
-                self.state['failing_backbone_models'] = []
-                return
-
-            df = pd.read_csv(csv)
-            thresholds = {
-                'radius_of_gyration':           self.backbone_rog_bounds,
-                'alanine_content':              self.backbone_ala_bounds,
-                'glycine_content':              self.backbone_gly_bounds,
-                'helix_fraction':               self.backbone_helix_bounds,
-                'sheet_fraction':               self.backbone_sheet_bounds,
-                'n_clashing.ligand_min_distance': self.backbone_lig_dist_bounds,
+    # ── Setup and tasks ─────────────────────────────────────────────────────
+
+    async def on_prepare(self):
+        """Derive the LMPNN JSONs from the RFD input if not given explicitly."""
+        if self.lmpnn_pdb_multi_json and self.lmpnn_fixed_res_json:
+            return
+        gen_dir = os.path.join(self.base_path, self.branch_id)
+        self.lmpnn_pdb_multi_json, self.lmpnn_fixed_res_json = await asyncio.to_thread(
+            generate_lmpnn_jsons,
+            self.rfd_input_filepath, self.diffusion_batch_size, gen_dir,
+        )
+
+    # ── Step 1: Backbone generation (GPU) ───────────────────────────────
+    @pipeline_task(capture_stdio=True)
+    async def backbone_gen(self, task_description={"gpus_per_rank": 1}):
+        self.taskcount += 1
+        taskname = "backbone_gen"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        output_dir = f"{taskdir}/out"
+        self.state['rfd3_out_dir'] = output_dir
+
+        return (
+            f"bash {self.scripts_path}/step1_backbone_gen.sh "
+            f"{self.foundry_sif_path} "
+            f"{output_dir} "
+            f"{self.rfd_input_filepath} "
+            f"{self.diffusion_batch_size}"
+        )
+
+    # ── Step 2: Backbone postprocessing — CIF.GZ → PDB (CPU) ────────────
+    @pipeline_task(capture_stdio=True)
+    async def backbone_post(self, task_description={}):
+        self.taskcount += 1
+        taskname = "backbone_post"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+        print(f"state.rfd3_out_dir value before bb-post update is {self.state['rfd3_out_dir']}")
+        rfd3_out = self.state['rfd3_out_dir']
+        print(f"state.rfd3_out_dir value after bb-post update is {rfd3_out}")
+        # Conversion is in-place; PDB files land alongside the CIFs.
+        self.state['pdb_dir'] = rfd3_out
+
+        return (
+            f"bash {self.scripts_path}/step2_backbone_post.sh "
+            f"{self.scripts_path} "
+            f"{rfd3_out}"
+        )
+
+    # ── Step 3: Backbone analysis (CPU) ─────────────────────────────────
+    @pipeline_task(capture_stdio=True)
+    async def backbone_analysis(self, task_description={}):
+        self.taskcount += 1
+        taskname = "backbone_analysis"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        pdb_dir    = self.state['pdb_dir']
+        output_csv = f"{taskdir}/out/campaign_analysis_backbone.csv"
+        output_dir = f"{taskdir}/out"
+
+        self.state['backbone_analysis_csv']     = output_csv
+        self.state['backbone_analysis_out_dir'] = output_dir
+
+        return (
+            f"bash {self.scripts_path}/step3_backbone_analysis.sh "
+            f"{self.scripts_path} "
+            f"{pdb_dir} "
+            f"{output_csv} "
+            f"{output_dir} "
+            f"{self.island_counts_csv}"
+        )
+
+    # ── Step 4: Sequence prediction — LigandMPNN (CPU) ──────────────────
+    @pipeline_task(capture_stdio=True)
+    async def seq_pred(self, task_description={"gpus_per_rank": 1}):
+        self.taskcount += 1
+        taskname = "seq_pred"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        output_dir = f"{taskdir}/out"
+        self.state['lmpnn_out_dir'] = output_dir
+
+        # Use filtered JSONs if the backbone adaptive step created them;
+        # otherwise fall back to the original pipeline inputs.
+        lmpnn_json = self.state.get(
+            'current_lmpnn_pdb_multi_json', self.lmpnn_pdb_multi_json)
+        fixed_json = self.state.get(
+            'current_lmpnn_fixed_res_json', self.lmpnn_fixed_res_json)
+
+        # Remap static JSON keys to runtime pdb_dir paths.
+        # The static JSONs use relative paths (e.g. "./outputs_rfd3/model.pdb")
+        # but PDB files are generated at runtime under self.state['pdb_dir'].
+        pdb_dir = self.state['pdb_dir']
+
+        def _remap_json(src_path, dst_path):
+            with open(src_path) as fh:
+                data = json.load(fh)
+            remapped = {
+                os.path.join(pdb_dir, os.path.basename(k)): v
+                for k, v in data.items()
             }
-            passing, failing = _identify_passing_models(df, 'model_name', thresholds)
-
-            self.state['passing_backbone_models'] = passing
-            self.state['failing_backbone_models'] = failing
+            with open(dst_path, 'w') as fh:
+                json.dump(remapped, fh, indent=2)
+            return dst_path
+
+        runtime_json       = _remap_json(lmpnn_json,  f"{taskdir}/in/lmpnn_pdb_multi.json")
+        runtime_fixed_json = _remap_json(fixed_json,   f"{taskdir}/in/lmpnn_fixed_res.json")
+
+        return (
+            f"bash {self.scripts_path}/step4_seq_pred.sh "
+            f"{self.mpnn_dir} "
+            f"{output_dir} "
+            f"{runtime_json} "
+            f"{runtime_fixed_json} "
+            f"{self.lmpnn_num_batches} "
+        )
+
+    # ── Step 5: Sequence postprocessing — split_seqs (CPU) ──────────────
+    @pipeline_task(capture_stdio=True)
+    async def seq_post(self, task_description={}):
+        self.taskcount += 1
+        taskname = "seq_post"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        lmpnn_out  = self.state['lmpnn_out_dir']
+        seqs_dir   = f"{lmpnn_out}/seqs"
+        split_dir  = f"{taskdir}/out/seqs_split"
+        self.state['seqs_split_dir'] = split_dir
+
+        return (
+            f"bash {self.scripts_path}/step5_seq_post.sh "
+            f"{self.scripts_path} "
+            f"{seqs_dir} "
+            f"{split_dir}"
+        )
+
+    # ── Step 6: Sequence analysis (CPU) ──────────────────────────────────
+    @pipeline_task(capture_stdio=True)
+    async def seq_analysis(self, task_description={}):
+        self.taskcount += 1
+        taskname = "seq_analysis"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        seqs_split = self.state['seqs_split_dir']
+        output_csv = f"{taskdir}/out/campaign_analysis_sequence.csv"
+        output_dir = f"{taskdir}/out"
+
+        self.state['seq_analysis_csv']     = output_csv
+        self.state['seq_analysis_out_dir'] = output_dir
+
+        return (
+            f"bash {self.scripts_path}/step6_seq_analysis.sh "
+            f"{self.scripts_path} "
+            f"{seqs_split} "
+            f"{output_csv} "
+            f"{output_dir} "
+            f"{self.island_counts_csv}"
+        )
+
+    # ── Step 7: Fold prediction — Chai-lab (GPU) ─────────────────────────
+    @pipeline_task(capture_stdio=True)
+    async def fold_pred(self, task_description={"gpus_per_rank": 1}):
+        self.taskcount += 1
+        taskname = "fold_pred"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        # Use filtered seqs dir if the sequence adaptive step created one.
+        input_dir  = self.state.get(
+            'current_seqs_split_dir', self.state['seqs_split_dir'])
+        output_dir = f"{taskdir}/out"
+        self.state['chai_out_dir'] = output_dir
+
+        return (
+            f"bash {self.scripts_path}/step7_fold_pred.sh "
+            f"{self.scripts_path} "
+            f"{input_dir} "
+            f"{output_dir}"
+        )
+
+    # ── Step 8: Pipeline analysis — analysis.py + plot_campaign.py (CPU) ─
+    @pipeline_task(capture_stdio=True)
+    async def pipeline_analysis(self, task_description={}):
+        self.taskcount += 1
+        taskname = "pipeline_analysis"
+        taskdir  = f"{self.base_path}/{self.branch_id}/{self.taskcount}_{taskname}"
+        os.makedirs(f"{taskdir}/in",  exist_ok=True)
+        os.makedirs(f"{taskdir}/out", exist_ok=True)
+
+        chai_out   = self.state['chai_out_dir']
+        output_csv = f"{taskdir}/out/campaign_analysis.csv"
+        output_dir = f"{taskdir}/out"
+
+        self.state['analysis_csv']     = output_csv
+        self.state['analysis_out_dir'] = output_dir
+
+        return (
+            f"bash {self.scripts_path}/step8_pipeline_analysis.sh "
+            f"{self.scripts_path} "
+            f"{chai_out} "
+            f"{output_csv} "
+            f"{output_dir} "
+            f"{self.mcsa_pdb_dir} "
+            f"{self.island_counts_csv} "
+            f"{self.rmsd_threshold}"
+        )
+
+    # ── Local check: backbone analysis results ────────────────────────────
+    @pipeline_task(local_task=True)
+    async def check_backbone_results(self):
+        csv = self.state.get('backbone_analysis_csv')
+        self.state['last_analysis_step'] = 'backbone'
+
+        if not csv or not os.path.isfile(csv):
             self.logger.pipeline_log(
-                f"[check_backbone] passing={len(passing)} failing={len(failing)} models"
+                f"[check_backbone] CSV not found at {csv!r}; treating all models as failing"
             )
+            self.state['passing_backbone_models'] = []
+            self.state['failing_backbone_models'] = []
+            return
+
+        df = pd.read_csv(csv)
+        thresholds = {
+            'radius_of_gyration':           self.backbone_rog_bounds,
+            'alanine_content':              self.backbone_ala_bounds,
+            'glycine_content':              self.backbone_gly_bounds,
+            'helix_fraction':               self.backbone_helix_bounds,
+            'sheet_fraction':               self.backbone_sheet_bounds,
+            'n_clashing.ligand_min_distance': self.backbone_lig_dist_bounds,
+        }
+        passing, failing = _identify_passing_models(df, 'model_name', thresholds)
+
+        self.state['passing_backbone_models'] = passing
+        self.state['failing_backbone_models'] = failing
+        self.logger.pipeline_log(
+            f"[check_backbone] passing={len(passing)} failing={len(failing)} models"
+        )
 
-        # ── Local check: sequence analysis results ────────────────────────────
-        @self.auto_register_task(local_task=True)
-        async def check_seq_results():
-            csv = self.state.get('seq_analysis_csv')
-            self.state['last_analysis_step'] = 'sequence'
+    # ── Local check: sequence analysis results ────────────────────────────
+    @pipeline_task(local_task=True)
+    async def check_seq_results(self):
+        csv = self.state.get('seq_analysis_csv')
+        self.state['last_analysis_step'] = 'sequence'
 
-            if not csv or not os.path.isfile(csv):
-                self.logger.pipeline_log(
-                    f"[check_seq] CSV not found at {csv!r}; treating all models as failing"
-                )
-                self.state['passing_seq_models'] = []
-                self.state['failing_seq_models'] = []
-                return
+        if not csv or not os.path.isfile(csv):
+            self.logger.pipeline_log(
+                f"[check_seq] CSV not found at {csv!r}; treating all models as failing"
+            )
+            self.state['passing_seq_models'] = []
+            self.state['failing_seq_models'] = []
+            return
+
+        df = pd.read_csv(csv)
+        thresholds = {
+            'ligand_confidence':  self.seq_ligand_conf_bounds,
+            'overall_confidence': self.seq_overall_conf_bounds,
+        }
+        passing, failing = _identify_passing_models(df, 'model_name', thresholds)
+
+        self.state['passing_seq_models'] = passing
+        self.state['failing_seq_models'] = failing
+        self.logger.pipeline_log(
+            f"[check_seq] passing={len(passing)} failing={len(failing)} models"
+        )
 
-            df = pd.read_csv(csv)
-            thresholds = {
-                'ligand_confidence':  self.seq_ligand_conf_bounds,
-                'overall_confidence': self.seq_overall_conf_bounds,
-            }
-            passing, failing = _identify_passing_models(df, 'model_name', thresholds)
+    # ── Local check: fold/pipeline analysis results ───────────────────────
+    @pipeline_task(local_task=True)
+    async def check_fold_results(self):
+        self.state['last_analysis_step'] = 'fold'
+        csv = self.state.get('analysis_csv')
 
-            self.state['passing_seq_models'] = passing
-            self.state['failing_seq_models'] = failing
+        if not csv or not os.path.isfile(csv):
             self.logger.pipeline_log(
-                f"[check_seq] passing={len(passing)} failing={len(failing)} models"
+                f"[check_fold] CSV not found at {csv!r}; treating all models as failing"
             )
+            self.state['best_fold'] = {}
+            self.state['passing_fold_models'] = []
+            self.state['failing_fold_models'] = []
+            return
+
+        df = pd.read_csv(csv)
+        chai_out = self.state.get('chai_out_dir', '')
+        best_fold = {}
+        for model_name, group in df.groupby('model_name'):
+            best_row = group.loc[group['motif_rmsd'].idxmin()]
+            best_fold[model_name] = {
+                'motif_rmsd':         float(best_row['motif_rmsd']),
+                'run_dir':            os.path.abspath(
+                                          os.path.join(chai_out, str(best_row['run_dir']))
+                                      ),
+                'seed':               int(best_row['seed']),
+                'chai1_model_idx':    int(best_row['chai1_model_idx']),
+                'anchor_residues':     ('' if pd.isna(v := best_row.get('anchor_residues',    '')) else str(v)),
+                'anchor_sequences':    ('' if pd.isna(v := best_row.get('anchor_sequences',   '')) else str(v)),
+                'anchor_ref_residues': ('' if pd.isna(v := best_row.get('anchor_ref_residues','')) else str(v)),
+            }
 
-        # ── Local check: fold/pipeline analysis results ───────────────────────
-        @self.auto_register_task(local_task=True)
-        async def check_fold_results():
-            self.state['last_analysis_step'] = 'fold'
-            csv = self.state.get('analysis_csv')
+        self.state['best_fold'] = best_fold
 
-            if not csv or not os.path.isfile(csv):
-                self.logger.pipeline_log(
-                    f"[check_fold] CSV not found at {csv!r}; treating all models as failing"
-                )
-                self.state['best_fold'] = {}
-                self.state['passing_fold_models'] = []
-                self.state['failing_fold_models'] = []
-                return
+        passing = [m for m, v in best_fold.items() if v['motif_rmsd'] < self.rmsd_threshold]
+        failing = [m for m, v in best_fold.items() if v['motif_rmsd'] >= self.rmsd_threshold]
 
-            df = pd.read_csv(csv)
-            chai_out = self.state.get('chai_out_dir', '')
-            best_fold = {}
-            for model_name, group in df.groupby('model_name'):
-                best_row = group.loc[group['motif_rmsd'].idxmin()]
-                best_fold[model_name] = {
-                    'motif_rmsd':         float(best_row['motif_rmsd']),
-                    'run_dir':            os.path.abspath(
-                                              os.path.join(chai_out, str(best_row['run_dir']))
-                                          ),
-                    'seed':               int(best_row['seed']),
-                    'chai1_model_idx':    int(best_row['chai1_model_idx']),
-                    'anchor_residues':     ('' if pd.isna(v := best_row.get('anchor_residues',    '')) else str(v)),
-                    'anchor_sequences':    ('' if pd.isna(v := best_row.get('anchor_sequences',   '')) else str(v)),
-                    'anchor_ref_residues': ('' if pd.isna(v := best_row.get('anchor_ref_residues','')) else str(v)),
-                }
-
-            self.state['best_fold'] = best_fold
-
-            passing = [m for m, v in best_fold.items() if v['motif_rmsd'] < self.rmsd_threshold]
-            failing = [m for m, v in best_fold.items() if v['motif_rmsd'] >= self.rmsd_threshold]
-
-            self.state['passing_fold_models'] = passing
-            self.state['failing_fold_models'] = failing
-            self.logger.pipeline_log(
-                f"[check_fold] passing={len(passing)} failing={len(failing)} models"
-            )
+        self.state['passing_fold_models'] = passing
+        self.state['failing_fold_models'] = failing
+        self.logger.pipeline_log(
+            f"[check_fold] passing={len(passing)} failing={len(failing)} models"
+        )
 
     # ── Main execution loop ─────────────────────────────────────────────────
 
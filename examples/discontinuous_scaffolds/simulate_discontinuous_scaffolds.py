@@ -0,0 +1,138 @@
+"""
+Predict the makespan and GPU utilization of the discontinuous scaffolds
+campaign without running it.
+
+Tasks run on a SimulationBackend with a virtual clock: each task holds its
+GPU slots for a duration sampled per task name, either from the estimates
+below or fitted from the trace of a previous run (``trace_path`` passed to
+ImpressManager). The adaptive logic runs for real, so the campaign finishes
+in seconds.
+
+The analysis tasks do not run either, so the simulation writes stub score
+CSVs in which every model passes, and the campaign runs all of its stages.
+Pipelines write to a temporary directory instead of the working tree.
+
+Usage:
+    python simulate_discontinuous_scaffolds.py [--gpus 4] [--trace trace.json]
+"""
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+
+from impress.backends.simulation import (
+    LogNormal,
+    SimulationBackend,
+    durations_from_trace,
+    simulate,
+)
+from campaign import (
+    BACKBONE_ALA_BOUNDS,
+    BACKBONE_GLY_BOUNDS,
+    BACKBONE_HELIX_BOUNDS,
+    BACKBONE_LIG_DIST_BOUNDS,
+    BACKBONE_ROG_BOUNDS,
+    BACKBONE_SHEET_BOUNDS,
+    SEQ_LIGAND_CONF_BOUNDS,
+    SEQ_OVERALL_CONF_BOUNDS,
+    build_pipeline_setups,
+)
+
+# The campaign inputs shipped with the example
+LOCAL_SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+
+# Median run time (seconds) and log-spread of each task
+ESTIMATED_DURATIONS = {
+    "backbone_gen":      LogNormal(1800, 0.3),
+    "backbone_post":     LogNormal(60, 0.2),
+    "backbone_analysis": LogNormal(300, 0.2),
+    "seq_pred":          LogNormal(900, 0.3),
+    "seq_post":          LogNormal(30, 0.2),
+    "seq_analysis":      LogNormal(120, 0.2),
+    "fold_pred":         LogNormal(3600, 0.4),
+    "pipeline_analysis": LogNormal(300, 0.2),
+}
+
+
+def _midpoint(bounds):
+    return None if bounds is None else (bounds[0] + bounds[1]) / 2
+
+
+# Passing score row written for each analysis task, keyed by task name
+STUB_SCORES = {
+    "backbone_analysis": {
+        "model_name":                     "simulated",
+        "radius_of_gyration":             _midpoint(BACKBONE_ROG_BOUNDS),
+        "alanine_content":                _midpoint(BACKBONE_ALA_BOUNDS),
+        "glycine_content":                _midpoint(BACKBONE_GLY_BOUNDS),
+        "helix_fraction":                 _midpoint(BACKBONE_HELIX_BOUNDS),
+        "sheet_fraction":                 _midpoint(BACKBONE_SHEET_BOUNDS),
+        "n_clashing.ligand_min_distance": _midpoint(BACKBONE_LIG_DIST_BOUNDS),
+    },
+    "seq_analysis": {
+        "model_name":         "simulated",
+        "ligand_confidence":  _midpoint(SEQ_LIGAND_CONF_BOUNDS),
+        "overall_confidence": _midpoint(SEQ_OVERALL_CONF_BOUNDS),
+    },
+    "pipeline_analysis": {
+        "model_name":      "simulated",
+        "motif_rmsd":      0.0,
+        "run_dir":         "simulated",
+        "seed":            0,
+        "chai1_model_idx": 0,
+    },
+}
+
+
+def write_stub_scores(task):
+    """
+    SimulationBackend ``on_complete`` hook: write the score CSV of a
+    completed analysis task, which its command takes as third argument.
+    """
+    row = STUB_SCORES.get(task["name"])
+    if row is None:
+        return
+    output_csv = task["arguments"][3]
+    with open(output_csv, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(row))
+        writer.writeheader()
+        writer.writerow(row)
+
+
+def simulate_campaign(durations, gpus=4, seed=0):
+    """
+    Simulate the campaign in a temporary directory.
+
+    Returns:
+        The SimulationBackend report
+    """
+    backend = SimulationBackend(
+        durations,
+        resources={"gpus": gpus},
+        on_complete=write_stub_scores,
+        seed=seed,
+    )
+    with tempfile.TemporaryDirectory(prefix="impress-sim-") as base_path:
+        setups = build_pipeline_setups(LOCAL_SCRIPTS_PATH, base_path=base_path)
+        return simulate(setups, backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--gpus", type=int, default=4)
+    parser.add_argument("--trace", help="fit task durations from this trace")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    durations = dict(ESTIMATED_DURATIONS)
+    if args.trace:
+        durations.update(durations_from_trace(args.trace, fit="lognormal"))
+
+    report = simulate_campaign(durations, gpus=args.gpus, seed=args.seed)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
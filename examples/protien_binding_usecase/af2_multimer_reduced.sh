@@ -21,6 +21,9 @@ INPUT_FASTA_FILE_DIR=$1
 INPUT_FASTA_FILE_NAME=$2
 OUTPUT_DATA_DIR=$3
 
+# $2 may be a comma separated batch of FASTA files, folded in one run
+FASTA_PATHS=$(echo "$INPUT_FASTA_FILE_NAME" | sed 's|[^,][^,]*|/fasta/&|g')
+
 apptainer run --nv \
   --bind $INPUT_FASTA_FILE_DIR:/fasta \
   --bind $OUTPUT_DATA_DIR:/dimer_models \
@@ -31,7 +34,7 @@ apptainer run --nv \
   --mgnify_database_path=/database/mgnify/mgy_clusters_2022_05.fa \
   --template_mmcif_dir=/database/pdb_mmcif/mmcif_files/ \
   --obsolete_pdbs_path=/database/pdb_mmcif/obsolete.dat \
-  --fasta_paths=/fasta/$INPUT_FASTA_FILE_NAME \
+  --fasta_paths=$FASTA_PATHS \
   --output_dir=/dimer_models \
   --model_preset=multimer \
   --db_preset=reduced_dbs \
@@ -1,132 +1,305 @@
-from biopandas.pdb import PandasPdb
-import os
-import pandas as pd
-import json
-import operator
-from pyrosetta import *
 import argparse
-parser = argparse.ArgumentParser()
-parser.add_argument('--iter', type=str, help='pass iteration')
-parser.add_argument('--out', type=str, help='pipeline name')
-parser.add_argument('--path', type=str, help='base path')
-#parser.add_argument('--seq',type=str, help='sequence')
-args = parser.parse_args()
+import csv
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+BACKBONE_ATOMS = (b' N  ', b' CA ', b' C  ')
+STATS_HEADER = ['ID', 'avg_plddt', 'ptm', 'avg_pae']
+# Scores of the models of earlier passes, by model file, next to best_models
+SCORE_CACHE = 'score_cache.json'
+
+_rosetta = None
+
+
+def read_backbone_b_factors(pdb_path):
+    """
+    Read the B-factors of the N, CA and C atoms of every residue of a PDB file
+    straight from the fixed ATOM columns.
+
+    Returns:
+        Array of shape (residues, 3); a missing backbone atom counts as 0
+    """
+    with open(pdb_path, 'rb') as f:
+        atoms = [line for line in f if line.startswith(b'ATOM  ')]
+    if not atoms:
+        return np.zeros((0, 3))
+
+    columns = np.array(atoms, dtype='S80').view('S1').reshape(len(atoms), 80)
+    names = columns[:, 12:16].copy().view('S4').ravel()
+    residues = columns[:, 21:27].copy().view('S6').ravel()  # chain, number, icode
+    b_factors = columns[:, 60:66].copy().view('S6').ravel().astype(np.float64)
+
+    residue_index = np.cumsum(np.r_[True, residues[1:] != residues[:-1]]) - 1
+    backbone = np.zeros((residue_index[-1] + 1, 3))
+    for column, name in enumerate(BACKBONE_ATOMS):
+        atom = names == name
+        backbone[residue_index[atom], column] = b_factors[atom]
+    return backbone
+
+
+def average_plddt(pdb_path, reader='numpy'):
+    """
+    Mean backbone B-factor (pLDDT for AlphaFold models) and residue count.
 
+    The NumPy reader sums in the same order as ``get_b_factor``; PDB files it
+    cannot parse fall back to PyRosetta, as does ``reader='pyrosetta'``.
+    """
+    if reader == 'numpy':
+        try:
+            backbone = read_backbone_b_factors(pdb_path)
+        except ValueError:
+            pass
+        else:
+            residues = len(backbone)
+            if residues == 0:
+                return 0.0, 0
+            per_residue = (backbone[:, 0] + backbone[:, 1] + backbone[:, 2]) / 3
+            return float(np.cumsum(per_residue)[-1]) / residues, residues
 
+    pose = rosetta().pose_from_pdb(pdb_path)
+    residues = len(pose.sequence())
+    temp_sum = 0
+    for i in range(residues):
+        temp_sum += get_b_factor(pose, i + 1)
+    return (temp_sum / residues if residues else 0.0), residues
 
-init()
-filename=[]
-plddt_list=[]
-ptm_list=[]
-pae_list=[]
-ppdb=PandasPdb()
 
+def rosetta():
+    """PyRosetta, initialized on first use only"""
+    global _rosetta
+    if _rosetta is None:
+        import pyrosetta
+
+        pyrosetta.init()
+        _rosetta = pyrosetta
+    return _rosetta
 
-af_path= os.path.join(args.path, 'af_pipeline_outputs_multi', args.out, 'af/prediction')
 
 def get_b_factor(pose, residue):
-	""" 
-	Given a pose and a residue number, will return the average b-factor of the 
-	backbone atoms (N, CA, C) for the specified residue. Requires residue to  
-	be input as a pose number, as opposed to a PDB number. 
-	"""
-	bfactor = pose.pdb_info().bfactor
-	atom_index = pose.residue(residue).atom_index
-
-	total_b = 0.0
-	for atom in ['N', 'CA', 'C']:
-		total_b += bfactor(residue, atom_index(atom))
-
-	# Return average for three atoms
-	return total_b / 3
-
-#for jobs in os.listdir('PDZ_structures/'):
-#	print(jobs)
-best_models_path = os.path.join(af_path, 'best_models')
-for files in os.listdir(best_models_path):
-	print(files)
-	full_path_pdb = os.path.join(af_path, 'best_models', files)
-	full_path_ptm = os.path.join(af_path, 'best_ptm')
-
-	pose=pose_from_pdb(full_path_pdb)
-	temp_sum=0
-	for i in range(len(pose.sequence())):
-		temp_sum+=get_b_factor(pose,i+1)
-
-	# ppdb.read_pdb(full_path_pdb)
-	# temp_list=ppdb.df['ATOM']['b_factor']
-	# counter = 0
-	# temp_sum = 0
-	# for entries in temp_list:
-	# 	temp_sum+=entries
-	# 	counter+=1
-	if len(pose.sequence())>0:
-		temp_avg=temp_sum/len(pose.sequence())
-		filename.append(files)
-		plddt_list.append(temp_avg)
-		query=files.split('.')
-		temp_max=0
-		for jsons in os.listdir(full_path_ptm):
-			hit = jsons.split('.')
-			if query[0]==hit[0]:
-				data_path = os.path.join(full_path_ptm, jsons)
-				data = json.load(open(data_path))
-				for keys, values in data.items():
-					if keys == 'iptm+ptm':
-						for keys2, values2 in values.items():
-							if values2 > temp_max:
-								temp_max=values2
-						ptm_list.append(temp_max)
-					elif keys == 'order':
-						top_rank=values[0]
-				
-				
-				#df_json=pd.json_normalize(data)
-				#order=df_json['order']
-				#ptm=df_json['iptm+ptm']
-				break
-
-		dimer_models_path = os.path.join(af_path, 'dimer_models')
-		for folders in os.listdir(dimer_models_path):
-			folder_name = files.split('.')[0]
-			if folders==folder_name:
-				for output in os.listdir(os.path.join(af_path, 'dimer_models', folders)):
-					#print(top_rank)
-					top_rank_compare="result_"+top_rank+".pkl"
-					#print("$$$$$$$$$$$$$$$$$$$$")
-					#print(top_rank_compare)
-					#print(output)
-					#print("$$$$$$$$$$$$$$$$$$$$")
-					if output == top_rank_compare: 
-						details = pd.read_pickle(os.path.join(af_path, 'dimer_models', folders, output))
-						#print(details)
-						for keys3, values3 in details.items():
-							if keys3=='predicted_aligned_error':
-								length=values3.shape[0]
-								running_sum=0
-								counter2=0
-								row_index=0
-								target_range=range(length-10,length)
-								for a in values3:
-									col_index=0
-									for b in a:
-										#print(str(row_index) +','+str(col_index))
-										#if row_index in target_range and col_index in target_range:
-										#print("do nothing")
-										if operator.xor(row_index in target_range, col_index in target_range):
-											#print("adding")
-											running_sum+=values3[row_index][col_index]
-											counter2+=1
-										col_index+=1
-									row_index+=1
-								avg_pae=running_sum/counter2
-								pae_list.append(avg_pae)
-print(len(filename))
-print(len(plddt_list))
-print(len(ptm_list))
-print(len(pae_list))
-final=tuple(zip(filename, plddt_list, ptm_list, pae_list))
-#print(final)
-df=pd.DataFrame(final, columns = ['ID', 'avg_plddt', 'ptm', 'avg_pae'])
-#print(df)	
-df.to_csv('af_stats_'+args.out+'_pass_'+args.iter+'.csv', index=False)
+    """
+    Given a pose and a residue number, will return the average b-factor of the
+    backbone atoms (N, CA, C) for the specified residue. Requires residue to
+    be input as a pose number, as opposed to a PDB number.
+    """
+    bfactor = pose.pdb_info().bfactor
+    atom_index = pose.residue(residue).atom_index
+
+    total_b = 0.0
+    for atom in ['N', 'CA', 'C']:
+        total_b += bfactor(residue, atom_index(atom))
+
+    # Return average for three atoms
+    return total_b / 3
+
+
+def chain_starts_from_arg(value, length):
+    """
+    Residue indices at which the chains after the first one start.
+
+    Args:
+        value: Comma separated 0-based indices; negative ones count from the
+            end, so ``-10`` makes the last 10 residues the second chain
+        length: Number of residues of the model
+    """
+    starts = []
+    for item in value.split(','):
+        start = int(item)
+        starts.append(start + length if start < 0 else start)
+    return sorted(starts)
+
+
+def interface_pae(pae, chain_starts):
+    """
+    Average predicted aligned error between residues of different chains.
+
+    Cells (i, j) whose residues belong to different chains are selected with
+    one mask and summed in row-major order with a running sum, so the result
+    is bit-identical to adding them up cell by cell.
+
+    Args:
+        pae: Square ``predicted_aligned_error`` matrix
+        chain_starts: Residue indices at which the second, third, ... chain
+            start
+
+    Returns:
+        Mean PAE over the inter-chain cells, in the matrix dtype
+    """
+    pae = np.asarray(pae)
+    chain_of = np.searchsorted(chain_starts, np.arange(pae.shape[0]), side='right')
+    values = pae[chain_of[:, None] != chain_of[None, :]]
+    if values.size == 0:
+        raise ValueError('PAE matrix has no inter-chain residue pairs')
+    return np.cumsum(values)[-1] / values.size
+
+
+def index_directory(path):
+    """Map the stem (up to the first dot) of every file in a directory to its name"""
+    index = {}
+    for name in os.listdir(path):
+        index.setdefault(name.split('.')[0], name)
+    return index
+
+
+def result_pickle(ranking, dimer_path):
+    """Path of the top-ranked result pickle named by a model's ranking JSON"""
+    return os.path.join(dimer_path, 'result_' + ranking['order'][0] + '.pkl')
+
+
+def model_key(pdb_path, ptm_path, dimer_path, chain_starts):
+    """
+    Hash of everything a model's scores depend on: its best model PDB, its
+    ranking JSON, the top-ranked result pickle that JSON names (path, mtime
+    and size, as the pickle is too large to hash) and the chain boundaries.
+    """
+    digest = hashlib.sha256(chain_starts.encode())
+    for path in (pdb_path, ptm_path):
+        if path is not None:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    if ptm_path is not None:
+        with open(ptm_path) as f:
+            result_path = result_pickle(json.load(f), dimer_path)
+        try:
+            stat = os.stat(result_path)
+            digest.update(f'{result_path}:{stat.st_mtime_ns}:{stat.st_size}'.encode())
+        except FileNotFoundError:
+            digest.update(f'{result_path}:missing'.encode())
+    return digest.hexdigest()
+
+
+def available_cpus():
+    """CPUs this process may run on: its task's allocation, not the whole node"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on this platform
+        return 1
+
+
+def score_model(pdb_path, ptm_path, dimer_path, reader='numpy', chain_starts='-10'):
+    """
+    Score one best model.
+
+    Returns:
+        ``(avg_plddt, ptm, avg_pae)``, or None when the model has no residues
+        or its ranking JSON or top-ranked result pickle is missing
+    """
+    plddt, residues = average_plddt(pdb_path, reader)
+    if residues == 0 or ptm_path is None:
+        return None
+
+    with open(ptm_path) as f:
+        data = json.load(f)
+    ptm = max([0, *data['iptm+ptm'].values()])
+    result_path = result_pickle(data, dimer_path)
+    if not os.path.exists(result_path):
+        return None
+
+    with open(result_path, 'rb') as f:
+        pae = pickle.load(f).get('predicted_aligned_error')
+    if pae is None:
+        return None
+    starts = chain_starts_from_arg(chain_starts, len(pae))
+    return plddt, ptm, float(interface_pae(pae, starts))
+
+
+def score_models(jobs, workers):
+    """Run ``score_model`` over argument tuples, in a process pool if worthwhile"""
+    workers = min(workers or 1, len(jobs))
+    if workers <= 1:
+        return [score_model(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(score_model, *zip(*jobs)))
+
+
+def written_models(stats_path):
+    """Models already present in a stats CSV"""
+    if not os.path.exists(stats_path):
+        return set()
+    with open(stats_path, newline='') as f:
+        return {row[0] for row in csv.reader(f) if row and row != STATS_HEADER}
+
+
+def load_score_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path) as f:
+        return json.load(f)
+
+
+def save_score_cache(cache_path, cache):
+    """Write the cache through a temporary file so a crash never truncates it"""
+    temp_path = cache_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(temp_path, cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iter', type=str, help='pass iteration')
+    parser.add_argument('--out', type=str, help='pipeline name')
+    parser.add_argument('--path', type=str, help='base path')
+    parser.add_argument('--chain_starts', type=str, default='-10',
+                        help='comma separated residue indices where the chains '
+                             'after the first start (negative: from the end)')
+    parser.add_argument('--reader', choices=['numpy', 'pyrosetta'], default='numpy',
+                        help='how to read B-factors from the best models')
+    parser.add_argument('--workers', type=int, default=available_cpus(),
+                        help='processes scoring models in parallel '
+                             '(default: the CPUs this task may use)')
+    args = parser.parse_args()
+
+    af_path = os.path.join(
+        args.path, 'af_pipeline_outputs_multi', args.out, 'af/prediction'
+    )
+    best_models_path = os.path.join(af_path, 'best_models')
+    stats_path = 'af_stats_' + args.out + '_pass_' + args.iter + '.csv'
+    cache_path = os.path.join(af_path, SCORE_CACHE)
+
+    written = written_models(stats_path)
+    cache = load_score_cache(cache_path)
+    ptm_index = index_directory(os.path.join(af_path, 'best_ptm'))
+
+    scores = {}
+    jobs = []
+    models = [files for files in os.listdir(best_models_path) if files not in written]
+    for files in models:
+        stem = files.split('.')[0]
+        pdb_path = os.path.join(best_models_path, files)
+        ptm_path = None
+        if stem in ptm_index:
+            ptm_path = os.path.join(af_path, 'best_ptm', ptm_index[stem])
+        dimer_path = os.path.join(af_path, 'dimer_models', stem)
+        key = model_key(pdb_path, ptm_path, dimer_path, args.chain_starts)
+        entry = cache.get(files)
+        if entry is not None and entry['key'] == key:
+            scores[files] = entry['row']
+        else:
+            job = (pdb_path, ptm_path, dimer_path, args.reader, args.chain_starts)
+            jobs.append((files, key, job))
+
+    print(f'{len(written)} already written, {len(scores)} cached, {len(jobs)} to score')
+    results = score_models([job for *_, job in jobs], args.workers)
+    for (files, key, _), score in zip(jobs, results):
+        if score is None:
+            print(f'{files}: no residues, ranking or result pickle, skipped')
+            continue
+        cache[files] = {'key': key, 'row': list(score)}
+        scores[files] = list(score)
+
+    new_file = not os.path.exists(stats_path)
+    with open(stats_path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(STATS_HEADER)
+        writer.writerows([files, *scores[files]] for files in models if files in scores)
+    save_score_cache(cache_path, cache)
+
+
+if __name__ == '__main__':
+    main()
@@ -41,7 +41,7 @@ async def adaptive_decision(pipeline: ProteinBindingPipeline) -> Optional[Dict[s
         Pipeline configuration dictionary for new child pipeline if needed,
         None otherwise
     """
-    MAX_SUB_PIPELINES: int = 3
+    MAX_SUB_PIPELINES: int = pipeline.max_sub_order
     sub_iter_seqs: Dict[str, str] = {}
 
     # Read current scores from CSV
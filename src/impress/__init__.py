@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from impress.impress_manager import ImpressManager
-from impress.pipelines.impress_pipeline import ImpressBasePipeline
+from impress.pipelines.impress_pipeline import ImpressBasePipeline, pipeline_task
 from impress.pipelines.setup import PipelineSetup
+from impress.sharded_manager import ShardedImpressManager
 
 __all__ = [
     "ImpressManager",
     "ImpressBasePipeline",
     "PipelineSetup",
+    "ShardedImpressManager",
+    "pipeline_task",
 ]
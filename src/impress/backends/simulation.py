@@ -0,0 +1,497 @@
+import asyncio
+import json
+import math
+import os
+import random
+import selectors
+import statistics
+from collections.abc import Awaitable, Sequence
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from ..impress_manager import ImpressManager
+from ..utils.scheduler import ResourcePool, task_demand
+
+T = TypeVar("T")
+
+
+class Constant:
+    """Fixed task duration."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds: float = seconds
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+class Uniform:
+    """Task duration drawn uniformly from ``[low, high]``."""
+
+    def __init__(self, low: float, high: float) -> None:
+        self.low: float = low
+        self.high: float = high
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+class LogNormal:
+    """
+    Log-normally distributed task duration.
+
+    The usual shape of HPC task run times: a typical (median) duration with a
+    long right tail.
+    """
+
+    def __init__(self, median: float, sigma: float) -> None:
+        """
+        Initialize the distribution.
+
+        Args:
+            median: Median duration in seconds
+            sigma: Standard deviation of the log duration
+        """
+        self.median: float = median
+        self.sigma: float = sigma
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+    @classmethod
+    def fit(cls, samples: Sequence[float]) -> "LogNormal":
+        """Fit the distribution to observed durations."""
+        logs = [math.log(max(s, 1e-9)) for s in samples]
+        sigma = statistics.pstdev(logs) if len(logs) > 1 else 0.0
+        return cls(math.exp(statistics.fmean(logs)), sigma)
+
+
+class Empirical:
+    """Task duration resampled from observed durations."""
+
+    def __init__(self, samples: Sequence[float]) -> None:
+        if not samples:
+            raise ValueError("Empirical distribution needs at least one sample")
+        self.samples: list[float] = list(samples)
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.choice(self.samples)
+
+
+Distribution = Union[Constant, Uniform, LogNormal, Empirical]
+
+
+def durations_from_trace(path: str, fit: str = "empirical") -> dict[str, Distribution]:
+    """
+    Build per-task-name duration distributions from a recorded trace.
+
+    Reads the ``task`` spans of a trace written by ``ImpressManager`` with
+    ``trace_path`` set, in either the Chrome or the OTLP format.
+
+    Args:
+        path: Trace file
+        fit: ``"empirical"`` to resample the observed durations or
+            ``"lognormal"`` to fit a log-normal distribution per task name
+
+    Returns:
+        Mapping of task name to duration distribution
+
+    Raises:
+        ValueError: If the fit is unknown
+    """
+    if fit not in ("empirical", "lognormal"):
+        raise ValueError(
+            f"Unknown fit {fit!r}, expected one of ('empirical', 'lognormal')"
+        )
+
+    with open(path) as f:
+        document = json.load(f)
+
+    observed: dict[str, list[float]] = {}
+    if "traceEvents" in document:
+        for event in document["traceEvents"]:
+            if event.get("ph") == "X" and event.get("cat") == "task":
+                observed.setdefault(event["name"], []).append(event["dur"] / 1e6)
+    else:
+        for resource in document.get("resourceSpans", []):
+            for scope in resource.get("scopeSpans", []):
+                for span in scope.get("spans", []):
+                    category = next(
+                        (
+                            a["value"].get("stringValue")
+                            for a in span.get("attributes", [])
+                            if a["key"] == "impress.category"
+                        ),
+                        None,
+                    )
+                    if category == "task":
+                        duration = (
+                            int(span["endTimeUnixNano"])
+                            - int(span["startTimeUnixNano"])
+                        ) / 1e9
+                        observed.setdefault(span["name"], []).append(duration)
+
+    if fit == "lognormal":
+        return {name: LogNormal.fit(samples) for name, samples in observed.items()}
+    return {name: Empirical(samples) for name, samples in observed.items()}
+
+
+class _SimulationStates:
+    """Task states understood by the workflow engine."""
+
+    DONE = "DONE"
+    RUNNING = "RUNNING"
+    CANCELED = "CANCELED"
+    FAILED = "FAILED"
+
+    terminal_states = {DONE, CANCELED, FAILED}
+
+
+class SimulationBackend:
+    """
+    Execution backend that simulates tasks on a virtual clock.
+
+    Tasks never run. Each one holds its GPU/CPU slots (from its
+    ``task_description``) for a duration sampled from the distribution of
+    its task name, and waits first-fit for free slots when the simulated
+    machine is full. Completions are scheduled with ``loop.call_later``, so
+    on a ``VirtualClockEventLoop`` (see ``simulate``) an hours-long campaign
+    finishes in seconds, and with a fixed seed it is deterministic.
+
+    ``report()`` predicts the makespan and the GPU/CPU utilization.
+    """
+
+    def __init__(
+        self,
+        durations: Optional[dict[str, Distribution]] = None,
+        resources: Optional[dict[str, int]] = None,
+        default_duration: Optional[Distribution] = None,
+        failure_rates: Optional[dict[str, float]] = None,
+        on_complete: Optional[Callable[[dict[str, Any]], None]] = None,
+        seed: int = 0,
+        name: str = "default",
+    ) -> None:
+        """
+        Initialize the SimulationBackend.
+
+        Args:
+            durations: Duration distribution per task name (see
+                ``durations_from_trace``)
+            resources: Simulated machine, e.g. ``{"gpus": 8, "cpus": 64}``
+                (missing kinds are unlimited)
+            default_duration: Distribution of task names missing from
+                ``durations`` (default: 1 second)
+            failure_rates: Probability per task name that a task fails
+            on_complete: Called with the task dictionary when a task
+                succeeds, e.g. to set ``task["stdout"]`` or write the output
+                files that the pipeline's analysis steps read
+            seed: Random seed of the duration and failure samples
+            name: Backend name in the workflow engine's registry
+        """
+        self.name: str = name
+        self.durations: dict[str, Distribution] = dict(durations or {})
+        self.default_duration: Distribution = default_duration or Constant(1.0)
+        self.failure_rates: dict[str, float] = dict(failure_rates or {})
+        self.on_complete = on_complete
+        self.pool = ResourcePool(**(resources or {}))
+        self.rng = random.Random(seed)
+
+        self.tasks: dict[str, dict[str, Any]] = {}
+        self._waiting: list[dict[str, Any]] = []
+        self._running: dict[str, tuple[asyncio.TimerHandle, dict[str, int], float]] = {}
+        self._callback_func: Callable = lambda task, state: None
+        self._work_dir: str = os.getcwd()
+        self.is_attached: bool = False
+        self.attached_to: list[str] = []
+
+        self._started: Optional[float] = None
+        self._finished: float = 0.0
+        self.busy: dict[str, float] = {"gpus": 0.0, "cpus": 0.0}
+        self.peak: dict[str, int] = {"gpus": 0, "cpus": 0}
+        self.wait_time: float = 0.0
+        self.task_times: dict[str, list[float]] = {}
+        self.completed: int = 0
+        self.failed: int = 0
+        self.cancelled: int = 0
+
+    def state(self) -> str:
+        return "RUNNING" if self._running else "IDLE"
+
+    def task_state_cb(self, task: dict, state: str) -> None:
+        pass
+
+    def get_task_states_map(self) -> _SimulationStates:
+        return _SimulationStates()
+
+    def register_callback(self, func: Callable) -> None:
+        self._callback_func = func
+
+    def build_task(self, uid: str, task_desc: dict, task_specific_kwargs: dict) -> None:
+        pass
+
+    def link_explicit_data_deps(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def link_implicit_data_deps(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def submit_tasks(self, tasks: list[dict[str, Any]]) -> None:
+        """
+        Queue tasks on the simulated machine.
+
+        Args:
+            tasks: Task dictionaries from the workflow engine
+        """
+        now = asyncio.get_running_loop().time()
+        if self._started is None:
+            self._started = now
+
+        for task in tasks:
+            demand = self.pool.clamp(
+                task_demand(task.get("task_backend_specific_kwargs") or {})
+            )
+            task["_sim_demand"] = demand
+            task["_sim_queued"] = now
+            self.tasks[task["uid"]] = task
+            self._waiting.append(task)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start every waiting task that fits, in submission order."""
+        if not self._waiting:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        waiting: list[dict[str, Any]] = []
+        for task in self._waiting:
+            demand = task["_sim_demand"]
+            if not self.pool.fits(demand):
+                waiting.append(task)
+                continue
+
+            self.pool.acquire(self, demand)
+            for kind, used in self.pool.in_use.items():
+                self.peak[kind] = max(self.peak[kind], used)
+            self.wait_time += now - task["_sim_queued"]
+
+            distribution = self.durations.get(task["name"], self.default_duration)
+            duration = max(0.0, distribution.sample(self.rng))
+            failed = self.rng.random() < self.failure_rates.get(task["name"], 0.0)
+            handle = loop.call_later(duration, self._finish, task, failed)
+            self._running[task["uid"]] = (handle, demand, now)
+            self._callback_func(task, _SimulationStates.RUNNING)
+        self._waiting = waiting
+
+    def _release(self, uid: str) -> float:
+        """Free the slots of a running task and account for its run time."""
+        _, demand, started = self._running.pop(uid)
+        self.pool.release(self, demand)
+        now = asyncio.get_running_loop().time()
+        for kind in self.busy:
+            self.busy[kind] += demand[kind] * (now - started)
+        self._finished = max(self._finished, now)
+        return now - started
+
+    def _finish(self, task: dict[str, Any], failed: bool) -> None:
+        """Complete a task whose simulated duration elapsed."""
+        elapsed = self._release(task["uid"])
+        self.task_times.setdefault(task["name"], []).append(elapsed)
+
+        if failed:
+            self.failed += 1
+            task.update(
+                {
+                    "stdout": "",
+                    "stderr": "Simulated failure",
+                    "exit_code": 1,
+                    "exception": RuntimeError(f"Simulated failure of {task['name']}"),
+                }
+            )
+            state = _SimulationStates.FAILED
+        else:
+            self.completed += 1
+            task.update(
+                {"stdout": "", "stderr": "", "exit_code": 0, "return_value": None}
+            )
+            if self.on_complete is not None:
+                self.on_complete(task)
+            state = _SimulationStates.DONE
+
+        self._callback_func(task, state)
+        self._dispatch()
+
+    async def cancel_task(self, uid: str) -> bool:
+        """
+        Cancel a waiting or running task.
+
+        Args:
+            uid: Task uid
+
+        Returns:
+            True if the task was still waiting or running
+        """
+        task = self.tasks.get(uid)
+        if task is None:
+            return False
+
+        if uid in self._running:
+            self._running[uid][0].cancel()
+            self._release(uid)
+        elif task in self._waiting:
+            self._waiting.remove(task)
+        else:
+            return False
+
+        self.cancelled += 1
+        self._callback_func(task, _SimulationStates.CANCELED)
+        self._dispatch()
+        return True
+
+    async def shutdown(self) -> None:
+        for uid in list(self._running):
+            self._running[uid][0].cancel()
+            self._release(uid)
+        self._waiting.clear()
+
+    def report(self) -> dict[str, Any]:
+        """
+        Predicted campaign metrics.
+
+        Returns:
+            Makespan in simulated seconds (first submission to last
+            completion), task counts, GPU/CPU busy slot-seconds, peak slots in
+            use and utilization (busy over capacity times makespan, None for
+            unlimited kinds), total queue wait and per-task-name count and
+            total simulated time
+        """
+        makespan = self._finished - (self._started or 0.0)
+        utilization: dict[str, Optional[float]] = {}
+        for kind, busy in self.busy.items():
+            capacity = self.pool.capacity[kind]
+            utilization[kind] = (
+                busy / (capacity * makespan) if capacity and makespan > 0 else None
+            )
+
+        return {
+            "makespan_s": makespan,
+            "tasks": self.completed + self.failed + self.cancelled,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "gpu_seconds": self.busy["gpus"],
+            "cpu_seconds": self.busy["cpus"],
+            "peak_gpus": self.peak["gpus"],
+            "peak_cpus": self.peak["cpus"],
+            "gpu_utilization": utilization["gpus"],
+            "cpu_utilization": utilization["cpus"],
+            "queue_wait_s": self.wait_time,
+            "per_task": {
+                name: {"count": len(times), "total_s": sum(times)}
+                for name, times in sorted(self.task_times.items())
+            },
+        }
+
+
+class _VirtualSelector:
+    """
+    Selector that advances the loop's virtual clock instead of sleeping.
+
+    Ready I/O (including wake-ups from other threads) is still polled, so only
+    idle waits are skipped.
+    """
+
+    def __init__(self, selector: selectors.BaseSelector) -> None:
+        self._selector = selector
+        self.loop: Optional[VirtualClockEventLoop] = None
+
+    def select(self, timeout: Optional[float] = None) -> list:
+        events = self._selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # Nothing scheduled: only I/O or another thread can wake us
+            return self._selector.select(None)
+        self.loop.advance(timeout)
+        return []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._selector, name)
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose clock jumps to the next timer whenever it would idle.
+
+    ``asyncio.sleep``, ``call_later`` and timeouts all run on virtual time,
+    which starts at zero. Work done in other threads still takes real time
+    while virtual time may jump ahead, so run simulations with local tasks
+    and adaptive functions inline (``simulate`` does).
+    """
+
+    def __init__(self) -> None:
+        selector = _VirtualSelector(selectors.DefaultSelector())
+        super().__init__(selector)
+        selector.loop = self
+        self._virtual_time: float = 0.0
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward."""
+        self._virtual_time += seconds
+
+
+def run_virtual(main: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion on a fresh ``VirtualClockEventLoop``.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    loop = VirtualClockEventLoop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def simulate(
+    pipeline_setups: list,
+    backend: Optional[SimulationBackend] = None,
+    **manager_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Run a campaign against a ``SimulationBackend`` on virtual time.
+
+    Local tasks and adaptive functions run inline on the loop (so the
+    simulation is deterministic) and the event-loop lag monitor is off,
+    unless overridden in ``manager_kwargs``.
+
+    Args:
+        pipeline_setups: Pipelines to start, as for ``ImpressManager.start``
+        backend: Simulated machine (default: unlimited, 1 s per task)
+        **manager_kwargs: Extra ``ImpressManager`` arguments
+
+    Returns:
+        The backend's ``report()``
+    """
+    backend = backend or SimulationBackend()
+    manager_kwargs.setdefault("local_task_workers", 0)
+    manager_kwargs.setdefault("adaptive_offload", False)
+    manager_kwargs.setdefault("loop_lag_interval", None)
+
+    async def campaign() -> None:
+        manager = ImpressManager(execution_backend=backend, **manager_kwargs)
+        await manager.start(pipeline_setups=pipeline_setups)
+        await manager.flow.shutdown()
+
+    run_virtual(campaign())
+    return backend.report()
@@ -1,12 +1,29 @@
 import asyncio
+import os
+import threading
 from collections.abc import Awaitable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Any, Callable, Optional, Union
 
 from radical.asyncflow import WorkflowEngine
 
 from .pipelines.impress_pipeline import ImpressBasePipeline
 from .pipelines.setup import PipelineSetup
-from .utils.logger import ImpressLogger
+from .utils.admission import AdmissionController
+from .utils.checkpoint import CheckpointStore
+from .utils.lineage import LineageGraph, LineageServer
+from .utils.logger import ImpressLogger, JsonLinesSink, LogLevel
+from .utils.loop_monitor import LoopLagMonitor
+from .utils.scheduler import TaskScheduler, task_demand
+from .utils.stats import RunStats
+from .utils.task_cache import TaskCache
+from .utils.threads import ThreadLoopCall
+from .utils.tracing import TRACE_FORMATS, Tracer
+
+# Signalled pipelines handled per slice of a wake-up before the manager yields,
+# so the adaptive steps it started run while it works through a burst
+_SIGNALS_PER_SLICE = 256
 
 
 class ImpressManager:
@@ -15,21 +32,253 @@ class ImpressManager:
 
     Coordinates pipeline lifecycle, adaptive function execution, and child pipeline
     creation in an asynchronous environment.
+
+    The manager is event driven: pipelines signal it (through ``_signal``) when
+    they request an adaptive step, submit a child request, get killed or finish,
+    and each wake-up only examines the pipelines that signalled. A burst of
+    signals is handled in slices, letting the adaptive steps started for one
+    slice run before the next.
     """
 
-    def __init__(self, execution_backend: Any, use_colors: bool = True) -> None:
+    def __init__(
+        self,
+        execution_backend: Any,
+        use_colors: bool = True,
+        resources: Optional[dict[str, int]] = None,
+        max_in_flight: Optional[int] = None,
+        task_scheduling: bool = False,
+        scheduling_policy: str = "fair",
+        checkpoint_path: Optional[str] = None,
+        task_cache: Optional[TaskCache] = None,
+        local_task_workers: Optional[int] = None,
+        loop_lag_interval: Optional[float] = 0.05,
+        adaptive_offload: bool = False,
+        adaptive_concurrency: Optional[int] = None,
+        adaptive_timeout: Optional[float] = None,
+        adaptive_batch_window: float = 1.0,
+        adaptive_batch_size: Optional[int] = None,
+        trace_path: Optional[str] = None,
+        trace_format: str = "chrome",
+        collect_stats: bool = True,
+        stats_path: Optional[str] = None,
+        log_level: Union[LogLevel, str] = LogLevel.INFO,
+        log_sink: Optional[JsonLinesSink] = None,
+        log_console: bool = True,
+        validate_child_setups: bool = True,
+        lineage_endpoint: Optional[str] = None,
+        kill_grace_period: Optional[float] = 60.0,
+    ) -> None:
         """
         Initialize the ImpressManager.
 
         Args:
             execution_backend: Backend for workflow execution
             use_colors: Whether to use colors in logging output
+            resources: GPU and CPU slots of the backend allocation, e.g.
+            ``{"gpus": 4, "cpus": 64}``. Pipelines are only started while their
+            resource demand fits; omitted kinds are unlimited.
+            max_in_flight: Maximum number of concurrently running pipelines
+            task_scheduling: If True, the declared ``resources`` gate the release
+            of individual executable tasks instead of whole pipelines, so
+            pipelines only hold slots while their tasks run
+            scheduling_policy: ``"fair"`` orders queued pipelines and tasks by
+            priority, per-root-campaign fair share and generation depth;
+            ``"fifo"`` uses submission order
+            checkpoint_path: SQLite file that records every pipeline's setup,
+            lineage and completed steps so the campaign can be continued with
+            ``resume`` after a crash
+            task_cache: Result cache used by tasks registered with
+            ``auto_register_task(cache=True)``
+            local_task_workers: Size of the thread pool local tasks run on
+            (None picks the ThreadPoolExecutor default, 0 runs them inline on
+            the event loop)
+            loop_lag_interval: Sampling period in seconds of the event loop
+            lag monitor (None disables it)
+            adaptive_offload: Run adaptive functions on a dedicated thread
+            pool, so blocking adaptive logic (e.g. ``subprocess.run``) does not
+            freeze the manager. Each call then runs on a private event loop and
+            must not await the manager's futures (its pipeline's tasks, flow
+            futures); doing so raises a RuntimeError. The default runs them
+            on the event loop.
+            adaptive_concurrency: Maximum number of adaptive functions running
+            at once (defaults to the thread pool size)
+            adaptive_timeout: Seconds after which an adaptive call is cancelled
+            and its pipeline released. Only awaiting code can be interrupted:
+            an inline call blocked in synchronous code (``subprocess.run``)
+            holds the event loop past the timeout, so such functions need
+            ``adaptive_offload`` or ``asyncio.to_thread``. An offloaded call
+            stuck in blocking code keeps its worker thread (and concurrency
+            slot) until it returns.
+            adaptive_batch_window: Seconds the manager collects pipelines
+            requesting an adaptive step with the same ``adaptive_fn_batch``
+            before calling it once for all of them
+            adaptive_batch_size: Call ``adaptive_fn_batch`` as soon as this
+            many pipelines are waiting, without waiting for the window to end
+            trace_path: Record spans for pipelines, tasks, adaptive steps,
+            child spawns and manager wake-ups and write them here on exit
+            trace_format: ``"chrome"`` (Trace Event Format, for
+            chrome://tracing or Perfetto) or ``"otlp"`` (OpenTelemetry
+            OTLP/JSON)
+            collect_stats: Keep per-pipeline and per-task-name timing
+            statistics (see ``stats``) and log them as a table on exit
+            stats_path: Also write the statistics to this CSV file on exit
+            log_level: Minimum level of the manager's and pipelines' log
+            messages (e.g. ``"DEBUG"`` to include per-wake-up activity)
+            log_sink: Also write every log record of the manager and its
+            pipelines as structured JSON lines (e.g. one file per pipeline)
+            log_console: Whether to log to stdout/stderr at all
+            validate_child_setups: Validate the child requests of running
+            pipelines like user-submitted setups; False trusts them and skips
+            validation when spawning many children
+            lineage_endpoint: Serve lineage snapshots (see
+            ``lineage_snapshot``) as JSON over HTTP on ``"host:port"`` or
+            ``"unix:/path/to.sock"`` while the manager runs
+            kill_grace_period: Seconds a killed pipeline gets to have its
+            in-flight tasks cancelled and its ``finalize()`` run before it is
+            retired regardless (None waits indefinitely)
+
+        Raises:
+            ValueError: If ``trace_format`` is unknown
         """
         self.execution_backend: Any = execution_backend
         self.pipeline_tasks: dict[ImpressBasePipeline, asyncio.Task] = {}
         self.adaptive_tasks: dict[ImpressBasePipeline, asyncio.Task] = {}
         self.new_pipeline_buffer: list[PipelineSetup] = []
-        self.logger: ImpressLogger = ImpressLogger(use_colors=use_colors)
+        self.validate_child_setups: bool = validate_child_setups
+        self.log_level: LogLevel = LogLevel(log_level)
+        self.log_sink: Optional[JsonLinesSink] = log_sink
+        self.log_console: bool = log_console
+        self.logger: ImpressLogger = ImpressLogger(
+            use_colors=use_colors,
+            level=self.log_level,
+            sink=log_sink,
+            console=log_console,
+        )
+
+        resources = resources or {}
+        self.task_scheduler: Optional[TaskScheduler] = None
+        if task_scheduling:
+            self.task_scheduler = TaskScheduler(
+                gpus=resources.get("gpus"),
+                cpus=resources.get("cpus"),
+                policy=scheduling_policy,
+            )
+            resources = {}
+
+        self.admission: AdmissionController = AdmissionController(
+            gpus=resources.get("gpus"),
+            cpus=resources.get("cpus"),
+            max_in_flight=max_in_flight,
+            policy=scheduling_policy,
+        )
+
+        self.checkpoint: Optional[CheckpointStore] = (
+            CheckpointStore(checkpoint_path) if checkpoint_path else None
+        )
+        self.task_cache: Optional[TaskCache] = task_cache
+
+        self.local_task_workers: Optional[int] = local_task_workers
+        self.local_task_executor: Optional[ThreadPoolExecutor] = None
+        self.adaptive_concurrency: int = adaptive_concurrency or min(
+            32, (os.cpu_count() or 1) + 4
+        )
+        self.adaptive_timeout: Optional[float] = adaptive_timeout
+        self.adaptive_offload: bool = adaptive_offload
+        self.adaptive_executor: Optional[ThreadPoolExecutor] = None
+        self._start_executors()
+        self._adaptive_slots: Optional[asyncio.Semaphore] = None
+        self.adaptive_batch_window: float = adaptive_batch_window
+        self.adaptive_batch_size: Optional[int] = adaptive_batch_size
+        # Open batch per adaptive_fn_batch: waiting pipelines and their outcome
+        self._adaptive_batches: dict[
+            Callable, tuple[list[ImpressBasePipeline], asyncio.Future]
+        ] = {}
+        self._adaptive_batch_calls: set[asyncio.Task] = set()
+
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(
+                f"Unknown trace format {trace_format!r}, "
+                f"expected one of {TRACE_FORMATS}"
+            )
+        self.trace_path: Optional[str] = trace_path
+        self.trace_format: str = trace_format
+        self.tracer: Optional[Tracer] = Tracer() if trace_path else None
+        self.run_stats: Optional[RunStats] = RunStats() if collect_stats else None
+        self.stats_path: Optional[str] = stats_path
+
+        self.kill_grace_period: Optional[float] = kill_grace_period
+        # Estimated GPU-seconds freed by cancelling tasks of killed pipelines
+        self.reclaimed_gpu_seconds: float = 0.0
+
+        self.lineage: LineageGraph = LineageGraph()
+        self.lineage_server: Optional[LineageServer] = (
+            LineageServer(self.lineage.snapshot, lineage_endpoint)
+            if lineage_endpoint
+            else None
+        )
+
+        self.loop_lag: Optional[LoopLagMonitor] = (
+            LoopLagMonitor(loop_lag_interval) if loop_lag_interval else None
+        )
+        # Adaptive steps to checkpoint together with their child requests, and
+        # the children requested by steps still running
+        self._finished_adaptive_steps: list[ImpressBasePipeline] = []
+        self._adaptive_step_children: dict[
+            ImpressBasePipeline, list[PipelineSetup]
+        ] = {}
+
+        # Pipelines that signalled since the last wake-up (ordered set)
+        self._dirty: dict[ImpressBasePipeline, None] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+    def _signal(self, pipeline: ImpressBasePipeline) -> None:
+        """
+        Mark a pipeline as needing attention and wake the manager loop.
+
+        Args:
+            pipeline: Pipeline whose adaptive, child, kill or completion
+            state changed
+        """
+        # Local tasks running on worker threads may signal too
+        if self._loop_thread is not None and threading.get_ident() != self._loop_thread:
+            self._loop.call_soon_threadsafe(self._signal, pipeline)
+            return
+
+        self._dirty[pipeline] = None
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _start_executors(self) -> None:
+        """Create the local task and adaptive thread pools that are enabled."""
+        if self.local_task_workers != 0 and self.local_task_executor is None:
+            self.local_task_executor = ThreadPoolExecutor(
+                max_workers=self.local_task_workers, thread_name_prefix="impress-local"
+            )
+        if self.adaptive_offload and self.adaptive_executor is None:
+            self.adaptive_executor = ThreadPoolExecutor(
+                max_workers=self.adaptive_concurrency,
+                thread_name_prefix="impress-adaptive",
+            )
+
+    def _shutdown_executors(self) -> None:
+        """Stop the thread pools without waiting for calls still running."""
+        for executor in (self.local_task_executor, self.adaptive_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.local_task_executor = None
+        self.adaptive_executor = None
+
+    def _bind_loop(self) -> None:
+        """Attach the manager to the running event loop and start the lag monitor."""
+        self._start_executors()
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._adaptive_slots = asyncio.Semaphore(self.adaptive_concurrency)
+        if self.loop_lag is not None:
+            self.loop_lag.start()
 
     def _normalize_pipeline_setup(
         self, setup: Union[dict[str, Any], PipelineSetup]
@@ -68,45 +317,676 @@ class ImpressManager:
             # Normalize to PipelineSetup object
             setup = self._normalize_pipeline_setup(setup_input)
 
-            # Create pipeline instance with config and kwargs merged
-            pipeline_kwargs = {**setup.config, **setup.kwargs}
-            pipeline: ImpressBasePipeline = setup.type(
-                name=setup.name, flow=self.flow, **pipeline_kwargs
+            pipeline = self._build_pipeline(setup)
+            self._assign_lineage(pipeline, setup)
+
+            if self.checkpoint is not None:
+                self._checkpoint_pipeline(pipeline, setup)
+
+            self.admission.enqueue(pipeline)
+
+        self._admit_pipelines()
+
+    def _build_pipeline(self, setup: PipelineSetup) -> ImpressBasePipeline:
+        """
+        Construct a pipeline from its setup and attach it to this manager.
+
+        Args:
+            setup: Pipeline setup
+
+        Returns:
+            The new pipeline instance
+        """
+        # Create pipeline instance with config and kwargs merged
+        pipeline_kwargs = {**setup.config, **setup.kwargs}
+        pipeline: ImpressBasePipeline = setup.type(
+            name=setup.name, flow=self.flow, **pipeline_kwargs
+        )
+
+        pipeline._adaptive_fn = setup.adaptive_fn
+        pipeline._adaptive_fn_batch = setup.adaptive_fn_batch
+        pipeline._manager = self
+        # Loggers are created on first use with these settings; only one the
+        # constructor already used needs updating
+        logger: Optional[ImpressLogger] = getattr(pipeline, "_logger", None)
+        if isinstance(logger, ImpressLogger):
+            logger.level = self.log_level
+            logger.sink = self.log_sink
+            logger.console = self.log_console
+        pipeline._submitted_at = Tracer.now()
+        if self.tracer is not None:
+            pipeline._spawn_requested = setup._requested_at
+            pipeline._trace_parent_id = getattr(setup._parent, "_trace_span_id", None)
+        return pipeline
+
+    def _checkpoint_pipeline(
+        self, pipeline: ImpressBasePipeline, setup: PipelineSetup
+    ) -> None:
+        """
+        Record a newly submitted pipeline and its lineage.
+
+        Args:
+            pipeline: Newly constructed pipeline
+            setup: Setup it was built from
+        """
+        parent: Optional[ImpressBasePipeline] = setup._parent
+        root_id: Optional[int] = getattr(parent, "_checkpoint_root_id", None)
+        pipeline._checkpoint_id = self.checkpoint.add_pipeline(
+            setup,
+            parent_id=getattr(parent, "_checkpoint_id", None),
+            root_id=root_id,
+            generation=pipeline._generation,
+            priority=pipeline._priority,
+            share=pipeline._share,
+        )
+        pipeline._checkpoint_root_id = root_id or pipeline._checkpoint_id
+
+    def _record_step(
+        self,
+        pipeline: ImpressBasePipeline,
+        index: int,
+        kind: str,
+        name: str,
+        result: Any,
+    ) -> None:
+        """
+        Checkpoint a completed pipeline step.
+
+        Args:
+            pipeline: Pipeline the step belongs to
+            index: Step index in the pipeline's call order
+            kind: ``task`` or ``adaptive``
+            name: Task name
+            result: Step result
+        """
+        pipeline_id: Optional[int] = getattr(pipeline, "_checkpoint_id", None)
+        if self.checkpoint is None or pipeline_id is None:
+            return
+        self.checkpoint.record_step(
+            pipeline_id, index, kind, name, result, pipeline.checkpoint_snapshot()
+        )
+
+    def _set_checkpoint_status(
+        self, pipeline: ImpressBasePipeline, status: str
+    ) -> None:
+        """
+        Record a pipeline status change in the checkpoint store.
+
+        Args:
+            pipeline: Pipeline whose status changed
+            status: New status
+        """
+        pipeline_id: Optional[int] = getattr(pipeline, "_checkpoint_id", None)
+        if self.checkpoint is not None and pipeline_id is not None:
+            self.checkpoint.set_status(pipeline_id, status)
+
+    def _assign_lineage(
+        self, pipeline: ImpressBasePipeline, setup: PipelineSetup
+    ) -> None:
+        """
+        Attach scheduling lineage (root campaign, depth, priority) to a pipeline.
+
+        Args:
+            pipeline: Newly constructed pipeline
+            setup: Setup it was built from
+        """
+        parent: Optional[ImpressBasePipeline] = setup._parent
+        if parent is None:
+            pipeline._lineage_root = pipeline
+            pipeline._generation = 0
+            pipeline._priority = setup.priority or 0
+            pipeline._share = setup.share
+        else:
+            pipeline._lineage_root = getattr(parent, "_lineage_root", None) or parent
+            pipeline._generation = getattr(parent, "_generation", 0) + 1
+            pipeline._priority = (
+                setup.priority
+                if setup.priority is not None
+                else getattr(parent, "_priority", 0)
             )
+            pipeline._share = getattr(parent, "_share", 1.0)
+
+        pipeline._lineage_key = self.lineage.add(
+            pipeline.name,
+            parent=getattr(parent, "_lineage_key", None),
+            generation=pipeline._generation,
+            spawn_reason=setup.spawn_reason,
+            start_step=getattr(pipeline, "start_step", None),
+        )
 
-            pipeline._adaptive_fn = setup.adaptive_fn
+    def _admit_pipelines(self) -> None:
+        """Start every queued pipeline the admission controller lets through."""
+        for pipeline in self.admission.admit():
+            self._launch_pipeline(pipeline)
 
-            self.logger.pipeline_started(pipeline.name)
+        if self.admission.pending:
+            self.logger.pipelines_queued(len(self.admission.pending))
 
-            task: asyncio.Task = asyncio.create_task(pipeline.run())
-            self.pipeline_tasks[pipeline] = task
+    def _launch_pipeline(self, pipeline: ImpressBasePipeline) -> None:
+        """
+        Start running an admitted pipeline.
+
+        Args:
+            pipeline: Pipeline to run
+        """
+        self.logger.pipeline_started(pipeline.name)
+
+        pipeline._started_at = Tracer.now()
+        self.lineage.started(getattr(pipeline, "_lineage_key", None))
+        if self.tracer is not None:
+            pipeline._trace_span_id = self.tracer.new_span_id()
+            requested: Optional[int] = getattr(pipeline, "_spawn_requested", None)
+            if requested is not None:
+                self.tracer.record(
+                    "child_spawn",
+                    "spawn",
+                    pipeline.name,
+                    requested,
+                    pipeline._started_at,
+                    parent_id=pipeline._trace_parent_id,
+                )
+
+        task: asyncio.Task = asyncio.create_task(self._run_pipeline(pipeline))
+        task.add_done_callback(lambda _, p=pipeline: self._signal(p))
+        self.pipeline_tasks[pipeline] = task
+        self._set_checkpoint_status(pipeline, "running")
+
+        # The constructor may already have raised flags before _manager was set
+        self._signal(pipeline)
 
     async def _run_adaptive_fn(self, pipeline: ImpressBasePipeline) -> None:
         """
         Run adaptive function for a pipeline in the background.
 
         The adaptive function updates the pipeline's
-        submit_child_pipeline_request property.
+        submit_child_pipeline_request property. Pipelines with an
+        ``adaptive_fn_batch`` join a batch instead (see
+        ``_join_adaptive_batch``).
 
         Args:
             pipeline: Pipeline to run adaptive function for
         """
+        # Only timed when a span, a statistic or a log line will use it
+        logged: bool = self.logger.is_enabled(LogLevel.INFO)
+        timed: bool = logged or self.tracer is not None or self.run_stats is not None
+        started: int = Tracer.now() if timed else 0
+        status: str = "failed"
         try:
             self.logger.adaptive_started(pipeline.name)
             adaptive_fn: Optional[Callable[[ImpressBasePipeline], Awaitable[None]]] = (
                 getattr(pipeline, "_adaptive_fn", None)
             )
-            if adaptive_fn:
-                await adaptive_fn(pipeline)
-                self.logger.adaptive_completed(pipeline.name)
+            batch_fn: Optional[Callable[..., Awaitable[None]]] = getattr(
+                pipeline, "_adaptive_fn_batch", None
+            )
+            if batch_fn:
+                await self._join_adaptive_batch(batch_fn, pipeline)
+            elif adaptive_fn:
+                await self._call_adaptive_fn(adaptive_fn, pipeline)
+            if logged and (batch_fn or adaptive_fn):
+                self.logger.adaptive_completed(
+                    pipeline.name, duration=(Tracer.now() - started) / 1e9
+                )
+            status = "ok"
+        except asyncio.TimeoutError:
+            status = "timeout"
+            self.logger.adaptive_timed_out(pipeline.name, self.adaptive_timeout)
         except Exception as e:
             self.logger.adaptive_failed(pipeline.name, str(e))
         finally:
+            if self.tracer is not None:
+                self.tracer.record(
+                    "adaptive",
+                    "adaptive",
+                    pipeline.name,
+                    started,
+                    parent_id=getattr(pipeline, "_trace_span_id", None),
+                    status=status,
+                )
+            if self.run_stats is not None:
+                self.run_stats.record_adaptive(
+                    (Tracer.now() - started) / 1e9, failed=status != "ok"
+                )
             pipeline.invoke_adaptive_step = False
             pipeline._adaptive_barrier.set()
 
+    async def _join_adaptive_batch(
+        self,
+        batch_fn: Callable[[list[ImpressBasePipeline]], Awaitable[None]],
+        pipeline: ImpressBasePipeline,
+    ) -> None:
+        """
+        Wait for a batched adaptive function to run for this pipeline.
+
+        The first pipeline to join opens a batch that is closed after
+        ``adaptive_batch_window`` seconds (or once ``adaptive_batch_size``
+        pipelines joined); ``batch_fn`` is then called once with every
+        pipeline of the batch.
+
+        Args:
+            batch_fn: User adaptive function taking a list of pipelines
+            pipeline: Pipeline that requested an adaptive step
+
+        Raises:
+            Exception: Whatever the batch call raised, including
+            ``asyncio.TimeoutError``
+        """
+        batch = self._adaptive_batches.get(batch_fn)
+        if batch is None:
+            batch = ([], asyncio.get_running_loop().create_future())
+            self._adaptive_batches[batch_fn] = batch
+            asyncio.get_running_loop().call_later(
+                self.adaptive_batch_window, self._flush_adaptive_batch, batch_fn, batch
+            )
+
+        pipelines, outcome = batch
+        pipelines.append(pipeline)
+        if self.adaptive_batch_size and len(pipelines) >= self.adaptive_batch_size:
+            self._flush_adaptive_batch(batch_fn, batch)
+        await asyncio.shield(outcome)
+
+    def _flush_adaptive_batch(
+        self,
+        batch_fn: Callable[[list[ImpressBasePipeline]], Awaitable[None]],
+        batch: tuple[list[ImpressBasePipeline], asyncio.Future],
+    ) -> None:
+        """
+        Close a batch and call its adaptive function for all its pipelines.
+
+        Args:
+            batch_fn: User adaptive function taking a list of pipelines
+            batch: Waiting pipelines and the future they await
+        """
+        # The window timer of a batch that already filled up finds it gone
+        if self._adaptive_batches.get(batch_fn) is not batch:
+            return
+        del self._adaptive_batches[batch_fn]
+
+        pipelines, outcome = batch
+        self.logger.adaptive_batch_started(
+            getattr(batch_fn, "__name__", repr(batch_fn)), len(pipelines)
+        )
+        call: asyncio.Task = asyncio.create_task(
+            self._call_adaptive_fn(batch_fn, list(pipelines))
+        )
+        self._adaptive_batch_calls.add(call)
+        call.add_done_callback(self._adaptive_batch_calls.discard)
+        call.add_done_callback(lambda task: _copy_outcome(task, outcome))
+
+    async def _call_adaptive_fn(
+        self,
+        adaptive_fn: Callable[..., Awaitable[None]],
+        pipeline: Union[ImpressBasePipeline, list[ImpressBasePipeline]],
+    ) -> None:
+        """
+        Await an adaptive function under the concurrency limit and timeout.
+
+        Args:
+            adaptive_fn: User adaptive function
+            pipeline: Pipeline it adapts (the list of pipelines for an
+            ``adaptive_fn_batch``)
+
+        Raises:
+            asyncio.TimeoutError: If the call exceeds ``adaptive_timeout``
+        """
+        slots: asyncio.Semaphore = self._adaptive_slots or asyncio.Semaphore(
+            self.adaptive_concurrency
+        )
+        await slots.acquire()
+
+        if self.adaptive_executor is None:
+            try:
+                await asyncio.wait_for(adaptive_fn(pipeline), self.adaptive_timeout)
+            finally:
+                slots.release()
+            return
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        call: ThreadLoopCall = ThreadLoopCall(adaptive_fn, pipeline, foreign_loop=loop)
+        future: asyncio.Future = loop.run_in_executor(self.adaptive_executor, call)
+        # The slot is only freed once the worker thread is really done
+        future.add_done_callback(lambda f: _release_slot(f, slots))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.adaptive_timeout)
+        finally:
+            if not future.done():
+                call.cancel()
+
+    def _start_adaptive_task(self, pipeline: ImpressBasePipeline) -> None:
+        """
+        Launch the adaptive function of a pipeline as a background task.
+
+        Args:
+            pipeline: Pipeline that requested an adaptive step
+        """
+        self.lineage.step(
+            getattr(pipeline, "_lineage_key", None),
+            "adaptive",
+            getattr(pipeline, "_adaptive_step_index", 0),
+        )
+        adaptive_task: asyncio.Task = asyncio.create_task(
+            self._run_adaptive_fn(pipeline)
+        )
+        adaptive_task.add_done_callback(lambda _, p=pipeline: self._signal(p))
+        self.adaptive_tasks[pipeline] = adaptive_task
+
+    def _process_pipeline(self, pipeline: ImpressBasePipeline) -> bool:
+        """
+        Handle whatever a signalling pipeline is asking for.
+
+        Starts a pending adaptive step, buffers child requests, cancels killed
+        pipelines and retires finished ones (once their adaptive step is done).
+
+        Args:
+            pipeline: Pipeline that signalled the manager
+
+        Returns:
+            True if anything happened, False otherwise
+        """
+        pipeline_future: Optional[asyncio.Task] = self.pipeline_tasks.get(pipeline)
+        if pipeline_future is None:
+            return False
+
+        any_activity: bool = False
+
+        adaptive_task: Optional[asyncio.Task] = self.adaptive_tasks.get(pipeline)
+        if adaptive_task is not None and adaptive_task.done():
+            self.adaptive_tasks.pop(pipeline)
+            adaptive_task = None
+            if self.checkpoint is not None:
+                self._finished_adaptive_steps.append(pipeline)
+                self.new_pipeline_buffer.extend(
+                    self._adaptive_step_children.pop(pipeline, ())
+                )
+
+        # Check if pipeline needs adaptive step and isn't already running one
+        if getattr(pipeline, "invoke_adaptive_step", False) and adaptive_task is None:
+            self._start_adaptive_task(pipeline)
+            adaptive_task = self.adaptive_tasks[pipeline]
+            any_activity = True
+
+        # Drain every child request the pipeline queued since the last pass
+        for config in pipeline.get_child_pipeline_requests():
+            self.logger.child_pipeline_submitted(config["name"], pipeline.name)
+            # Convert dict to PipelineSetup for consistency
+            child_setup = PipelineSetup.from_dict(
+                config, validate=self.validate_child_setups
+            )
+            child_setup._parent = pipeline
+            if self.tracer is not None:
+                child_setup._requested_at = Tracer.now()
+            if self.checkpoint is not None and adaptive_task is not None:
+                # Checkpointed with the adaptive step once it finishes, so a
+                # resume neither loses the child nor spawns it twice
+                self._adaptive_step_children.setdefault(pipeline, []).append(
+                    child_setup
+                )
+                continue
+            self.new_pipeline_buffer.append(child_setup)
+            any_activity = True
+
+        # Check if parent should be killed
+        killed: bool = getattr(pipeline, "kill_parent", False)
+        if killed and not pipeline_future.done():
+            killed_at: Optional[float] = getattr(pipeline, "_killed_at", None)
+            if killed_at is None:
+                # Retired once the cancellation is through (the pipeline task's
+                # done callback signals) or the grace period timer fires
+                self._kill_pipeline(pipeline, pipeline_future)
+                any_activity = True
+                return any_activity
+            if (
+                self.kill_grace_period is None
+                or self._loop.time() - killed_at < self.kill_grace_period
+            ):
+                # Still cancelling its tasks or running finalize()
+                return any_activity
+
+        # A pipeline only counts as completed once its adaptive task is done too;
+        # the adaptive task's done callback signals us again when it finishes.
+        # A killed pipeline is retired once its cancellation is through (or
+        # after the grace period).
+        if (
+            pipeline_future.done() or getattr(pipeline, "_killed_at", None)
+        ) and adaptive_task is None:
+            self.pipeline_tasks.pop(pipeline, None)
+            self.admission.release(pipeline)
+            if self.checkpoint is not None:
+                self._set_checkpoint_status(
+                    pipeline, _final_status(pipeline_future, killed)
+                )
+            self._pipeline_retired(pipeline, _final_status(pipeline_future, killed))
+            started: Optional[int] = getattr(pipeline, "_started_at", None)
+            self.logger.pipeline_completed(
+                pipeline.name,
+                duration=(Tracer.now() - started) / 1e9 if started else None,
+            )
+            any_activity = True
+
+        return any_activity
+
+    def _kill_pipeline(
+        self, pipeline: ImpressBasePipeline, pipeline_future: asyncio.Task
+    ) -> None:
+        """
+        Cancel a killed pipeline together with its in-flight tasks.
+
+        The pipeline's ``run()`` is cancelled (which runs ``finalize()``, see
+        ``_run_pipeline``) and every task it submitted that has not finished is
+        cancelled on the backend or dropped from the scheduler queue. The GPU
+        time those tasks would still have used is estimated from the median
+        run time of their task name.
+
+        Args:
+            pipeline: Pipeline whose ``kill_parent`` flag is set
+            pipeline_future: Task running the pipeline
+        """
+        self.logger.pipeline_killed(pipeline.name)
+        pipeline._killed_at = self._loop.time()
+
+        cancel_tasks: Optional[Callable[[], list]] = getattr(
+            pipeline, "_cancel_inflight_tasks", None
+        )
+        cancelled: list = cancel_tasks() if cancel_tasks is not None else []
+        pipeline_future.cancel()
+
+        if cancelled:
+            gpu_seconds: float = self._remaining_gpu_seconds(cancelled)
+            self.reclaimed_gpu_seconds += gpu_seconds
+            self.logger.tasks_cancelled(pipeline.name, len(cancelled), gpu_seconds)
+
+        if self.kill_grace_period is not None:
+            self._loop.call_later(self.kill_grace_period, self._signal, pipeline)
+
+    def _remaining_gpu_seconds(self, tasks: list) -> float:
+        """
+        Estimate the GPU-seconds cancelled tasks would still have used.
+
+        Args:
+            tasks: ``(name, task_description, timing)`` of each cancelled task
+
+        Returns:
+            Sum over the tasks of GPUs times the expected remaining run time
+            (tasks whose name never finished before count as 0)
+        """
+        if self.run_stats is None:
+            return 0.0
+        now: int = Tracer.now()
+        total: float = 0.0
+        for name, description, timing in tasks:
+            gpus: int = task_demand(description)["gpus"]
+            expected: Optional[float] = self.run_stats.expected_duration(name)
+            if not gpus or expected is None:
+                continue
+            elapsed: float = 0.0
+            if timing is not None:
+                # Without a task scheduler tasks are released when submitted
+                default = None if self.task_scheduler else timing["submitted"]
+                released: Optional[int] = timing.get("released", default)
+                if released is not None:
+                    elapsed = (now - released) / 1e9
+            total += gpus * max(0.0, expected - elapsed)
+        return total
+
+    async def _run_pipeline(self, pipeline: ImpressBasePipeline) -> None:
+        """
+        Await the pipeline's ``on_prepare()`` hook, then run it.
+
+        If the pipeline is killed, its ``finalize()`` runs before the
+        cancellation is passed on (only when it takes no arguments).
+
+        Args:
+            pipeline: Pipeline to run
+        """
+        if isinstance(pipeline, ImpressBasePipeline):
+            await pipeline.on_prepare()
+        try:
+            await pipeline.run()
+        except asyncio.CancelledError:
+            if getattr(pipeline, "kill_parent", False):
+                await self._finalize_killed(pipeline)
+            raise
+
+    async def _finalize_killed(self, pipeline: ImpressBasePipeline) -> None:
+        """
+        Run the ``on_kill`` cleanup of a killed pipeline.
+
+        Args:
+            pipeline: Killed pipeline
+        """
+        try:
+            await pipeline.on_kill()
+        except Exception as e:
+            self.logger.finalize_failed(pipeline.name, str(e))
+
+    def _pipeline_retired(self, pipeline: ImpressBasePipeline, status: str) -> None:
+        """
+        Record the span, statistics and lineage status of a retired pipeline.
+
+        Args:
+            pipeline: Retired pipeline
+            status: Final status
+        """
+        self.lineage.finished(getattr(pipeline, "_lineage_key", None), status)
+        started: Optional[int] = getattr(pipeline, "_started_at", None)
+        if started is None:
+            return
+        ended: int = Tracer.now()
+
+        if self.tracer is not None:
+            self.tracer.record(
+                pipeline.name,
+                "pipeline",
+                pipeline.name,
+                started,
+                ended,
+                span_id=pipeline._trace_span_id,
+                parent_id=getattr(pipeline, "_trace_parent_id", None),
+                status=status,
+                generation=getattr(pipeline, "_generation", 0),
+            )
+        if self.run_stats is not None:
+            submitted: int = getattr(pipeline, "_submitted_at", started)
+            self.run_stats.record_pipeline(
+                pipeline.name,
+                (ended - started) / 1e9,
+                status,
+                admission_wait=(started - submitted) / 1e9,
+            )
+
+    def _task_finished(
+        self,
+        pipeline: ImpressBasePipeline,
+        name: str,
+        category: str,
+        submitted: int,
+        released: int,
+        status: str,
+        **attributes: Any,
+    ) -> None:
+        """
+        Record the span and statistics of a finished task.
+
+        Args:
+            pipeline: Pipeline that ran the task
+            name: Task name
+            category: ``task`` (executable) or ``local``
+            submitted: Timestamp of the task call
+            released: Timestamp of the release to the flow (after queueing)
+            status: ``ok``, ``failed`` or ``cancelled``
+            **attributes: Extra span attributes
+        """
+        ended: int = Tracer.now()
+        self.lineage.step(
+            getattr(pipeline, "_lineage_key", None),
+            name,
+            getattr(pipeline, "_step_index", 0),
+        )
+        if self.tracer is not None:
+            parent: Optional[int] = getattr(pipeline, "_trace_span_id", None)
+            if released > submitted:
+                self.tracer.record(
+                    name, "queue", pipeline.name, submitted, released, parent_id=parent
+                )
+            self.tracer.record(
+                name,
+                category,
+                pipeline.name,
+                released,
+                ended,
+                parent_id=parent,
+                status=status,
+                **attributes,
+            )
+        self.logger.task_finished(pipeline.name, name, (ended - released) / 1e9, status)
+        if self.run_stats is not None:
+            self.run_stats.record_task(
+                pipeline.name,
+                name,
+                (ended - released) / 1e9,
+                (released - submitted) / 1e9,
+                failed=status != "ok",
+            )
+
+    def lineage_snapshot(self, root: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """
+        Snapshot of the pipeline lineage graph.
+
+        Args:
+            root: Only include this pipeline and its descendants
+
+        Returns:
+            ``counts`` per status, ``roots`` and ``pipelines``: each pipeline's
+            parent, children, generation, spawn reason, start step, current
+            step, status and timestamps (None if ``root`` is unknown)
+        """
+        return self.lineage.snapshot(root)
+
+    async def _start_lineage_server(self) -> None:
+        """Start serving lineage snapshots if an endpoint was configured."""
+        if self.lineage_server is not None:
+            address: str = await self.lineage_server.start()
+            self.logger.lineage_endpoint(address)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Timing statistics of the run so far.
+
+        Returns:
+            Per-task-name count, failures, total/p50/p95/max duration and
+            queue time, the same for adaptive calls, a constant-size summary
+            per pipeline and the distribution of pipeline durations (empty if
+            ``collect_stats`` is off)
+        """
+        if self.run_stats is None:
+            return {}
+        return self.run_stats.summary()
+
     async def start(
-        self, pipeline_setups: list[Union[dict[str, Any], PipelineSetup]]
+        self,
+        pipeline_setups: list[Union[dict[str, Any], PipelineSetup]],
+        overwrite: bool = False,
+        resume: bool = False,
     ) -> None:
         """
         Start the pipeline manager and execute all pipelines.
@@ -120,7 +1000,25 @@ class ImpressManager:
         Args:
             pipeline_setups: List of initial pipeline
             configurations (dicts or PipelineSetup objects)
+            overwrite: Start a new campaign even if the checkpoint store holds
+            unfinished pipelines, discarding them
+            resume: Continue the unfinished campaign of the checkpoint store
+            instead, if there is one (``pipeline_setups`` are then ignored)
+
+        Raises:
+            RuntimeError: If the checkpoint store holds unfinished pipelines
+            and neither ``overwrite`` nor ``resume`` is given
         """
+        if self.checkpoint is not None and self.checkpoint.has_unfinished():
+            if resume:
+                await self.resume()
+                return
+            if not overwrite:
+                raise RuntimeError(
+                    f"Checkpoint store {self.checkpoint.path} holds an unfinished "
+                    "campaign; resume it or pass overwrite=True to discard it"
+                )
+
         self.logger.separator("IMPRESS MANAGER STARTING")
 
         self.flow: WorkflowEngine = await WorkflowEngine.create(
@@ -129,86 +1027,129 @@ class ImpressManager:
 
         self.logger.manager_starting(len(pipeline_setups))
 
+        if self.checkpoint is not None:
+            self.checkpoint.reset()
+
+        self._bind_loop()
+        await self._start_lineage_server()
         self.submit_new_pipelines(pipeline_setups)
 
-        while True:
+        await self._run_until_done()
+
+    async def resume(self, path: Optional[str] = None) -> None:
+        """
+        Continue a checkpointed campaign after a crash.
+
+        Every pipeline that had not finished is rebuilt from its recorded setup
+        and lineage and rerun; steps that had already completed are skipped and
+        return their recorded results, and the pipeline attributes saved after
+        them are restored. Checkpointing continues into the same store.
+
+        Args:
+            path: Checkpoint file (defaults to the manager's ``checkpoint_path``)
+
+        Raises:
+            ValueError: If no checkpoint file is given
+        """
+        if path is not None:
+            self.checkpoint = CheckpointStore(path)
+        if self.checkpoint is None:
+            raise ValueError("resume() needs a checkpoint path")
+
+        self.logger.separator("IMPRESS MANAGER RESUMING")
+
+        self.flow: WorkflowEngine = await WorkflowEngine.create(
+            backend=self.execution_backend
+        )
+
+        records: list[dict[str, Any]] = self.checkpoint.unfinished_pipelines()
+        self.logger.manager_resuming(
+            len(records), sum(len(record["steps"]) for record in records)
+        )
+
+        self._bind_loop()
+        await self._start_lineage_server()
+
+        roots: dict[int, ImpressBasePipeline] = {}
+        lineage_keys: dict[int, str] = {}
+        for record in records:
+            pipeline = self._build_pipeline(PipelineSetup(**record["setup"]))
+            pipeline._checkpoint_id = record["id"]
+            pipeline._checkpoint_root_id = record["root_id"]
+            pipeline._replay = record["steps"]
+            # Lineages whose root already finished keep sharing a key
+            if record["root_id"] == record["id"]:
+                roots[record["id"]] = pipeline
+            pipeline._lineage_root = roots.get(
+                record["root_id"], ("checkpoint-root", record["root_id"])
+            )
+            pipeline._generation = record["generation"]
+            pipeline._priority = record["priority"]
+            pipeline._share = record["share"]
+            pipeline._lineage_key = lineage_keys[record["id"]] = self.lineage.add(
+                pipeline.name,
+                parent=lineage_keys.get(record["parent_id"]),
+                generation=pipeline._generation,
+                spawn_reason=record["setup"].get("spawn_reason"),
+                start_step=getattr(pipeline, "start_step", None),
+            )
+            self.admission.enqueue(pipeline)
+
+        self._admit_pipelines()
+
+        await self._run_until_done()
+
+    def _has_work(self) -> bool:
+        """Whether any pipeline, adaptive step or request is still outstanding."""
+        return bool(
+            self.pipeline_tasks
+            or self.adaptive_tasks
+            or self.new_pipeline_buffer
+            or self.admission.pending
+        )
+
+    async def _run_until_done(self) -> None:
+        """Serve pipeline signals until every pipeline has finished."""
+        while self._has_work():
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            woke: int = Tracer.now()
+
+            dirty, self._dirty = self._dirty, {}
+
             any_activity: bool = False
-            completed_pipelines: list[ImpressBasePipeline] = []
-
-            for pipeline, pipeline_future in list(self.pipeline_tasks.items()):
-                # Check if pipeline needs adaptive step and isn't already running one
-                if (
-                    getattr(pipeline, "invoke_adaptive_step", False)
-                    and pipeline not in self.adaptive_tasks
-                ):
-                    adaptive_task: asyncio.Task = asyncio.create_task(
-                        self._run_adaptive_fn(pipeline)
-                    )
-                    self.adaptive_tasks[pipeline] = adaptive_task
+            for count, pipeline in enumerate(dirty, 1):
+                if self._process_pipeline(pipeline):
                     any_activity = True
+                if count % _SIGNALS_PER_SLICE == 0:
+                    await asyncio.sleep(0)
 
-                # Check if pipeline has new config ready
-                config: Optional[dict[str, Any]] = pipeline.get_child_pipeline_request()
-
-                if config:
-                    self.logger.child_pipeline_submitted(config["name"], pipeline.name)
-                    # Convert dict to PipelineSetup for consistency
-                    child_setup = PipelineSetup.from_dict(config)
-                    self.new_pipeline_buffer.append(child_setup)
+            # Finished adaptive steps and the children they requested are
+            # checkpointed in one transaction, so a resume never loses a child
+            # nor spawns it twice
+            with self.checkpoint.transaction() if self.checkpoint else nullcontext():
+                # Submit new pipelines (this also admits queued ones into freed slots)
+                if self.new_pipeline_buffer:
+                    self.submit_new_pipelines(self.new_pipeline_buffer)
+                    self.new_pipeline_buffer.clear()
                     any_activity = True
+                elif any_activity and self.admission.pending:
+                    self._admit_pipelines()
 
-                # Check if parent should be killed
-                if getattr(pipeline, "kill_parent", False):
-                    self.logger.pipeline_killed(pipeline.name)
-                    pipeline_future.cancel()
-                    completed_pipelines.append(pipeline)
-                    continue
-
-                # Check if pipeline is done - but only mark as completed
-                # if adaptive task is also done
-                if pipeline_future.done():
-                    # If there's an adaptive task running, don't mark as completed yet
-                    if pipeline in self.adaptive_tasks:
-                        adaptive_task = self.adaptive_tasks[pipeline]
-                        if not adaptive_task.done():
-                            continue
-
-                    completed_pipelines.append(pipeline)
-
-            # Clean up completed pipelines - but only if their
-            # adaptive tasks are also done
-            actually_completed: list[ImpressBasePipeline] = []
-            for pipeline in completed_pipelines:
-                # Double-check: only clean up if adaptive task is
-                # done or doesn't exist
-                if pipeline in self.adaptive_tasks:
-                    adaptive_task = self.adaptive_tasks[pipeline]
-                    if not adaptive_task.done():
-                        continue
-                    self.adaptive_tasks.pop(pipeline)
-
-                self.pipeline_tasks.pop(pipeline, None)
-                self.logger.pipeline_completed(pipeline.name)
-                actually_completed.append(pipeline)
-
-            completed_pipelines = actually_completed
-
-            # Clean up completed adaptive tasks
-            completed_adaptive: list[ImpressBasePipeline] = []
-            for pipeline, adaptive_task in list(self.adaptive_tasks.items()):
-                if adaptive_task.done():
-                    completed_adaptive.append(pipeline)
-
-            for pipeline in completed_adaptive:
-                self.adaptive_tasks.pop(pipeline, None)
-
-            # Submit new pipelines
-            if self.new_pipeline_buffer:
-                self.submit_new_pipelines(self.new_pipeline_buffer)
-                self.new_pipeline_buffer.clear()
-                any_activity = True
+                for pipeline in self._finished_adaptive_steps:
+                    index: Optional[int] = getattr(
+                        pipeline, "_adaptive_step_index", None
+                    )
+                    if index is not None:
+                        self._record_step(pipeline, index, "adaptive", "adaptive", None)
+                self._finished_adaptive_steps.clear()
 
-            # Log activity summary periodically
+            if self.tracer is not None:
+                self.tracer.record(
+                    "wake", "manager", "manager", woke, signals=len(dirty)
+                )
+
+            # Log activity summary
             if any_activity:
                 self.logger.activity_summary(
                     len(self.pipeline_tasks),
@@ -216,15 +1157,62 @@ class ImpressManager:
                     len(self.new_pipeline_buffer),
                 )
 
-            # Exit condition
-            if (
-                not self.pipeline_tasks
-                and not self.new_pipeline_buffer
-                and not self.adaptive_tasks
-            ):
-                self.logger.manager_exiting()
-                self.logger.separator("IMPRESS MANAGER FINISHED")
-                break
+        if self.lineage_server is not None:
+            await self.lineage_server.stop()
+
+        if self.loop_lag is not None:
+            await self.loop_lag.stop()
+            lag: dict[str, float] = self.loop_lag.metrics()
+            self.logger.loop_lag_summary(lag["mean_lag_ms"], lag["max_lag_ms"])
+
+        if self.tracer is not None:
+            self.tracer.export(self.trace_path, self.trace_format)
+
+        if self.run_stats is not None:
+            self.logger.run_statistics(self.run_stats.format_table())
+            if self.stats_path:
+                self.run_stats.to_csv(self.stats_path)
+
+        if self.task_cache is not None:
+            metrics: dict[str, int] = self.task_cache.metrics()
+            self.logger.task_cache_summary(metrics["hits"], metrics["misses"])
+
+        if self.reclaimed_gpu_seconds:
+            self.logger.reclaimed_summary(self.reclaimed_gpu_seconds)
+
+        self._shutdown_executors()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
+        self.logger.manager_exiting()
+        self.logger.separator("IMPRESS MANAGER FINISHED")
+        self.logger.flush()
+        if self.log_sink is not None:
+            self.log_sink.flush()
+
+
+def _final_status(pipeline_future: asyncio.Task, killed: bool) -> str:
+    """Final status of a retired pipeline."""
+    if killed or pipeline_future.cancelled():
+        return "killed"
+    if pipeline_future.exception() is not None:
+        return "failed"
+    return "completed"
+
+
+def _release_slot(future: asyncio.Future, slots: asyncio.Semaphore) -> None:
+    """Free the concurrency slot of a finished offloaded adaptive call."""
+    slots.release()
+    # The caller may have stopped waiting (timeout); consume the outcome
+    if not future.cancelled():
+        future.exception()
+
 
-            if not any_activity:
-                await asyncio.sleep(0.5)
+def _copy_outcome(task: asyncio.Task, outcome: asyncio.Future) -> None:
+    """Pass the result of a batched adaptive call on to its waiting pipelines."""
+    if task.cancelled():
+        outcome.cancel()
+    elif task.exception() is not None:
+        outcome.set_exception(task.exception())
+    else:
+        outcome.set_result(None)
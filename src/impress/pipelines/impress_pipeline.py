@@ -1,64 +1,593 @@
 import asyncio
+import functools
+import inspect
+import pickle
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Any
 
-from ..utils.logger import ImpressLogger
+from ..utils.logger import ImpressLogger, LogLevel
+from ..utils.scheduler import task_demand
+from ..utils.task_cache import CachedTask, resolve_paths
+from ..utils.threads import run_in_thread_loop
+from ..utils.tracing import Tracer
 
 
 class ImpressBasePipeline(ABC):
+    # Fixed attributes live in slots so idle pipelines stay small (subclasses
+    # still get a __dict__ for their own attributes). Per-pipeline tables,
+    # the logger and the adaptive barrier are only created when first used.
+    __slots__ = (
+        "name",
+        "flow",
+        "state",
+        "config",
+        "_manager",
+        "_kill_parent",
+        "_invoke_adaptive_step",
+        "incoming_child_pipeline_requests",
+        "_barrier",
+        "_logger",
+        "_task_descriptions",
+        "_cached_tasks",
+        "_inflight",
+        "_step_index",
+        "_replay",
+        # Set by the manager
+        "_adaptive_fn",
+        "_adaptive_fn_batch",
+        "_adaptive_step_index",
+        "_lineage_root",
+        "_lineage_key",
+        "_generation",
+        "_priority",
+        "_share",
+        "_checkpoint_id",
+        "_checkpoint_root_id",
+        "_trace_span_id",
+        "_trace_parent_id",
+        "_started_at",
+        "_submitted_at",
+        "_spawn_requested",
+        "_killed_at",
+        "__weakref__",
+    )
+
+    # Task name -> _PipelineTask declared on the class or its bases
+    _class_tasks: dict[str, "_PipelineTask"] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._class_tasks = {
+            name: value
+            for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, _PipelineTask)
+        }
+
     def __init__(self, name: str, flow=None, **config):
         self.name = name
         self.flow = flow
         self.state = {}
         self.config = config
+        self._manager = None  # set by ImpressManager on submission
         self.kill_parent = False
         self.invoke_adaptive_step = False
-        self.incoming_child_pipeline_request = {}
-        self._adaptive_barrier = asyncio.Event()
+        self.incoming_child_pipeline_requests = None  # deque, on first request
+        self._step_index = 0
 
-        # Call the registration method - subclasses must implement this
+        # Tasks declared with ``pipeline_task`` are bound on first access;
+        # this only registers the ones defined per instance
         self.register_pipeline_tasks()
 
-        self.logger = ImpressLogger(self.name)
+    @property
+    def logger(self):
+        """The pipeline's logger, created on first use with the manager's settings."""
+        logger = getattr(self, "_logger", None)
+        if logger is None:
+            manager = getattr(self, "_manager", None)
+            logger = self._logger = ImpressLogger(
+                self.name,
+                level=getattr(manager, "log_level", LogLevel.INFO),
+                sink=getattr(manager, "log_sink", None),
+                console=getattr(manager, "log_console", True),
+            )
+        return logger
+
+    @logger.setter
+    def logger(self, value):
+        self._logger = value
+
+    @property
+    def _adaptive_barrier(self):
+        """Event the pipeline waits on during an adaptive step (created lazily)."""
+        barrier = getattr(self, "_barrier", None)
+        if barrier is None:
+            barrier = self._barrier = asyncio.Event()
+        return barrier
+
+    @_adaptive_barrier.setter
+    def _adaptive_barrier(self, value):
+        self._barrier = value
+
+    def _own_dict(self, name):
+        """A per-pipeline table such as ``_inflight``, created on first write."""
+        table = getattr(self, name, None)
+        if table is None:
+            table = {}
+            setattr(self, name, table)
+        return table
+
+    @property
+    def invoke_adaptive_step(self):
+        """Whether the pipeline is waiting for the manager to run its adaptive fn."""
+        return getattr(self, "_invoke_adaptive_step", False)
+
+    @invoke_adaptive_step.setter
+    def invoke_adaptive_step(self, value):
+        self._invoke_adaptive_step = value
+        if value:
+            self._notify_manager()
+
+    @property
+    def kill_parent(self):
+        """Whether the manager should cancel this pipeline."""
+        return getattr(self, "_kill_parent", False)
+
+    @kill_parent.setter
+    def kill_parent(self, value):
+        self._kill_parent = value
+        if value:
+            self._notify_manager()
+
+    def _notify_manager(self):
+        """Wake the owning manager so it re-examines this pipeline."""
+        manager = getattr(self, "_manager", None)
+        if manager is not None:
+            manager._signal(self)
 
     def submit_child_pipeline_request(self, pipeline_config):
         """
         Submit a request to spawn a child pipeline.
 
+        Requests are queued, so several calls within one adaptive step each
+        spawn their own child.
+
         Args:
             pipeline_config (dict): Configuration for the new pipeline including
                                   'name', 'type', 'config', and 'adaptive_fn'
         """
-        self.incoming_child_pipeline_request = pipeline_config
+        if self.incoming_child_pipeline_requests is None:
+            self.incoming_child_pipeline_requests = deque()
+        self.incoming_child_pipeline_requests.append(pipeline_config)
+        self._notify_manager()
+
+    def submit_child_pipeline_requests(self, pipeline_configs):
+        """
+        Submit several child pipeline requests at once.
+
+        The manager drains them together and starts all children in the same
+        scheduling pass.
+
+        Args:
+            pipeline_configs (list[dict]): Configurations as accepted by
+                                         submit_child_pipeline_request
+        """
+        pipeline_configs = list(pipeline_configs)
+        if pipeline_configs:
+            if self.incoming_child_pipeline_requests is None:
+                self.incoming_child_pipeline_requests = deque()
+            self.incoming_child_pipeline_requests.extend(pipeline_configs)
+            self._notify_manager()
+
+    @property
+    def incoming_child_pipeline_request(self):
+        """
+        Deprecated: the oldest pending child request, or None.
+
+        Kept for adaptive functions written before requests were queued in
+        ``incoming_child_pipeline_requests``. Assigning a request replaces
+        the pending ones, as the single request slot used to; assigning None
+        clears them.
+        """
+        if self.incoming_child_pipeline_requests:
+            return self.incoming_child_pipeline_requests[0]
+        return None
+
+    @incoming_child_pipeline_request.setter
+    def incoming_child_pipeline_request(self, pipeline_config):
+        if self.incoming_child_pipeline_requests:
+            self.incoming_child_pipeline_requests.clear()
+        if pipeline_config:
+            self.submit_child_pipeline_request(pipeline_config)
 
     def get_child_pipeline_request(self):
         """
-        Get and clear any pending spawn request for child pipelines.
+        Get and remove the oldest pending spawn request for child pipelines.
 
         Returns:
             dict or None: The spawn request configuration if one exists, None otherwise.
-                         After calling this method, the spawn request is cleared.
+                         After calling this method, the spawn request is removed.
         """
-        if self.incoming_child_pipeline_request:
-            request = self.incoming_child_pipeline_request
-
-            # reset the value to avoid submission request duplication
-            self.incoming_child_pipeline_request = None
-            return request
+        if self.incoming_child_pipeline_requests:
+            return self.incoming_child_pipeline_requests.popleft()
 
         return None
 
-    def auto_register_task(self, local_task=False, **task_kwargs):
+    def get_child_pipeline_requests(self):
+        """
+        Get and clear all pending spawn requests for child pipelines.
+
+        Returns:
+            list[dict]: Pending spawn requests in submission order (may be empty).
+        """
+        requests = []
+        request = self.get_child_pipeline_request()
+        while request:
+            requests.append(request)
+            request = self.get_child_pipeline_request()
+
+        return requests
+
+    def auto_register_task(
+        self,
+        local_task=False,
+        offload=True,
+        cache=False,
+        cache_inputs=None,
+        cache_outputs=None,
+        **task_kwargs,
+    ):
+        """
+        Register a method as a pipeline task.
+
+        Args:
+            local_task (bool): Run the coroutine in-process instead of
+                               submitting its command to the flow
+            offload (bool): Run a local task on the manager's worker threads
+                            so blocking file I/O does not stall the event loop;
+                            set False for trivially cheap tasks
+            cache (bool): Reuse recorded results of identical executable task
+                          calls from the manager's task cache
+            cache_inputs: Input files/directories that go into the cache key,
+                          as a list or a callable receiving the task arguments
+            cache_outputs: Output files/directories kept in the cache and
+                           restored on a hit, same forms as ``cache_inputs``
+            **task_kwargs: Passed on to ``flow.executable_task``
+        """
+
         def decorator(func):
             if not local_task:
-                task = self.flow.executable_task(**task_kwargs)(func)
+                description = _default_task_description(func)
+                self._own_dict("_task_descriptions")[func.__name__] = description
+                flow_task = self.flow.executable_task(**task_kwargs)(func)
+                if cache:
+                    self._own_dict("_cached_tasks")[func.__name__] = CachedTask(
+                        func=func,
+                        command_task=self.flow.executable_task(**task_kwargs)(
+                            _rendered_command_task(func, description)
+                        ),
+                        inputs=cache_inputs,
+                        outputs=cache_outputs,
+                    )
+                task = functools.wraps(func)(
+                    functools.partial(
+                        self._release_task, func.__name__, flow_task, description
+                    )
+                )
             else:
-                task = func
+                task = functools.wraps(func)(
+                    functools.partial(self._run_local_task, func, offload)
+                )
             setattr(self, func.__name__, task)
             return task
 
         return decorator
 
+    def _release_task(self, name, flow_task, default_description, *args, **kwargs):
+        """
+        Submit an executable task, through the manager's scheduler if enabled.
+
+        Without a task scheduler the flow future is returned untouched. With
+        one, the returned future waits for free slots first. A step that
+        already completed before a resume returns its recorded result without
+        being resubmitted, and a cached task whose result is in the manager's
+        task cache is not submitted at all.
+        """
+        index = self._next_step_index()
+        if self._replay_step(index, "task", name):
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self._replay.pop(index)[2])
+            return future
+
+        manager = getattr(self, "_manager", None)
+        timing = {"submitted": Tracer.now()} if manager is not None else None
+
+        cached = (getattr(self, "_cached_tasks", None) or {}).get(name)
+        task_cache = getattr(manager, "task_cache", None)
+        if cached is not None and task_cache is not None:
+            future = asyncio.ensure_future(
+                self._run_cached_task(
+                    task_cache, cached, default_description, args, kwargs, timing
+                )
+            )
+        else:
+            future = self._submit_task(
+                flow_task, default_description, args, kwargs, timing
+            )
+
+        if getattr(manager, "checkpoint", None) is not None:
+            future.add_done_callback(functools.partial(self._record_task, index, name))
+        if timing is not None:
+            future.add_done_callback(functools.partial(self._report_task, name, timing))
+
+        # Submitted task future -> (name, description, timing)
+        inflight = self._own_dict("_inflight")
+        description = {**default_description, **kwargs.get("task_description", {})}
+        inflight[future] = (name, description, timing)
+        future.add_done_callback(inflight.pop)
+        return future
+
+    def _cancel_inflight_tasks(self):
+        """
+        Cancel every submitted task of this pipeline that is still running.
+
+        Queued tasks give up their place; tasks already on the backend are
+        cancelled there (their futures resolve once the backend confirms).
+
+        Returns:
+            list[tuple]: ``(name, task_description, timing)`` of each task
+        """
+        cancelled = []
+        for future, task in list((getattr(self, "_inflight", None) or {}).items()):
+            if not future.done() and future.cancel():
+                cancelled.append(task)
+        return cancelled
+
+    def _submit_task(self, flow_task, default_description, args, kwargs, timing=None):
+        """Submit a flow task, gated by the manager's task scheduler if any."""
+        scheduler = getattr(getattr(self, "_manager", None), "task_scheduler", None)
+        if scheduler is None:
+            return flow_task(*args, **kwargs)
+
+        def release():
+            if timing is not None:
+                timing["released"] = Tracer.now()
+            return flow_task(*args, **kwargs)
+
+        description = {**default_description, **kwargs.get("task_description", {})}
+        return asyncio.ensure_future(scheduler.run(self, description, release))
+
+    def _report_task(self, name, timing, future):
+        """Report a finished executable task to the manager (done callback)."""
+        submitted = timing["submitted"]
+        self._manager._task_finished(
+            self,
+            name,
+            "task",
+            submitted,
+            timing.get("released", submitted),
+            _future_status(future),
+            cache_hit=timing.get("cache_hit", False),
+        )
+
+    def _tracer(self):
+        """The manager's tracer, or None when tracing is off."""
+        return getattr(getattr(self, "_manager", None), "tracer", None)
+
+    async def _run_cached_task(
+        self, task_cache, cached, default_description, args, kwargs, timing=None
+    ):
+        """
+        Run an executable task through the task cache.
+
+        The task body is rendered once; on a miss the rendered command is
+        submitted as is and its result stored. Fingerprinting, restoring and
+        storing touch the disk, so they run on worker threads.
+        """
+        call_description = kwargs.get("task_description", {})
+        body_kwargs = {k: v for k, v in kwargs.items() if k != "task_description"}
+
+        command = await cached.func(*args, **body_kwargs)
+        key = await asyncio.to_thread(
+            task_cache.key,
+            command,
+            resolve_paths(cached.inputs, *args, **body_kwargs),
+            {**default_description, **call_description},
+        )
+
+        hit, result = await asyncio.to_thread(task_cache.lookup, key)
+        if hit:
+            if timing is not None:
+                timing["cache_hit"] = True
+            self.logger.pipeline_log(
+                f"Task cache hit for {cached.func.__name__}", LogLevel.DEBUG
+            )
+            return result
+
+        result = await self._submit_task(
+            cached.command_task,
+            default_description,
+            (command,),
+            {"task_description": call_description},
+            timing,
+        )
+        await asyncio.to_thread(
+            task_cache.store,
+            key,
+            result,
+            resolve_paths(cached.outputs, *args, **body_kwargs),
+        )
+        return result
+
+    def _record_task(self, index, name, future):
+        """Checkpoint a finished executable task (done callback)."""
+        if not future.cancelled() and future.exception() is None:
+            self._manager._record_step(self, index, "task", name, future.result())
+
+    async def _run_local_task(self, func, offload, *args, **kwargs):
+        """
+        Run a local task, replaying or checkpointing it as a step.
+
+        With ``offload`` and a manager worker pool, the coroutine runs to
+        completion on a worker thread's own event loop.
+        """
+        index = self._next_step_index()
+        if self._replay_step(index, "task", func.__name__):
+            return self._replay.pop(index)[2]
+
+        manager = getattr(self, "_manager", None)
+        executor = getattr(manager, "local_task_executor", None)
+        offloaded = offload and executor is not None
+        started = Tracer.now()
+        status = "failed"
+        try:
+            if offloaded:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    executor,
+                    functools.partial(run_in_thread_loop, func, *args, **kwargs),
+                )
+            else:
+                result = await func(*args, **kwargs)
+            status = "ok"
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            if manager is not None:
+                manager._task_finished(
+                    self,
+                    func.__name__,
+                    "local",
+                    started,
+                    started,
+                    status,
+                    offloaded=offloaded,
+                )
+
+        if getattr(manager, "checkpoint", None) is not None:
+            manager._record_step(self, index, "task", func.__name__, result)
+        return result
+
+    def _next_step_index(self):
+        """Number the next step in call order (stable across resumes)."""
+        self._step_index = getattr(self, "_step_index", 0) + 1
+        return self._step_index
+
+    def _replay_step(self, index, kind, name):
+        """
+        Check whether a step completed before a resume.
+
+        If it did, the attributes recorded right after the step are restored
+        and True is returned; the caller then skips the step. A step that does
+        not match the recording ends the replay for good.
+        """
+        replay = getattr(self, "_replay", None)
+        if not replay or index not in replay:
+            return False
+
+        recorded_kind, recorded_name, _, snapshot = replay[index]
+        if (recorded_kind, recorded_name) != (kind, name):
+            self.logger.pipeline_log(
+                f"Checkpoint replay diverged at step {index} "
+                f"({recorded_name} recorded, {name} called); running live"
+            )
+            replay.clear()
+            return False
+
+        self.restore_checkpoint_snapshot(snapshot)
+        return True
+
+    def checkpoint_snapshot(self):
+        """
+        Pipeline attributes saved with every checkpointed step.
+
+        Covers ``state`` and every other plain-data attribute set on the
+        pipeline (counters such as ``taskcount``, ``start_step``, paths, ...).
+        Runtime objects, callables and values that cannot be pickled are left
+        out. Override to narrow or extend what is saved.
+
+        Returns:
+            dict: Attribute name to value
+        """
+        snapshot = {}
+        for key, value in self._attributes().items():
+            if key in _RUNTIME_ATTRIBUTES or callable(value):
+                continue
+            if isinstance(value, (ImpressBasePipeline, asyncio.Event, ImpressLogger)):
+                continue
+            try:
+                pickle.dumps(value)
+            except Exception:
+                continue
+            snapshot[key] = value
+        return snapshot
+
+    def _attributes(self):
+        """Every attribute set on the pipeline, in slots or in its ``__dict__``."""
+        attributes = {}
+        for klass in type(self).__mro__:
+            slots = vars(klass).get("__slots__", ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                if slot not in ("__dict__", "__weakref__") and hasattr(self, slot):
+                    attributes[slot] = getattr(self, slot)
+        attributes.update(getattr(self, "__dict__", {}))
+        return attributes
+
+    def restore_checkpoint_snapshot(self, snapshot):
+        """
+        Restore attributes saved by ``checkpoint_snapshot``.
+
+        Args:
+            snapshot (dict): Attribute name to value
+        """
+        for key, value in snapshot.items():
+            setattr(self, key, value)
+        if snapshot.get("_kill_parent"):
+            self._notify_manager()
+
+    def get_resource_demand(self):
+        """
+        Peak slots a single task of this pipeline asks for.
+
+        Derived from the default ``task_description`` of every registered
+        executable task (``gpus_per_rank``, ``cores_per_rank`` and ``ranks``).
+        The manager's admission control uses it; override for pipelines that
+        run several tasks at once.
+
+        Returns:
+            dict: ``{"gpus": int, "cpus": int}``
+        """
+        descriptions = [
+            task.description
+            for task in type(self)._class_tasks.values()
+            if not task.local_task
+        ]
+        descriptions.extend((getattr(self, "_task_descriptions", None) or {}).values())
+        gpus = cpus = 0
+        for description in descriptions:
+            demand = task_demand(description)
+            gpus = max(gpus, demand["gpus"])
+            cpus = max(cpus, demand["cpus"])
+        return {"gpus": gpus, "cpus": cpus}
+
+    def gpu_slots(self):
+        """
+        GPU slots of the allocation the pipeline's tasks share.
+
+        Taken from the ``resources`` declared to the manager (task scheduler
+        or admission control).
+
+        Returns:
+            int or None: None if no manager or GPU count is known
+        """
+        manager = getattr(self, "_manager", None)
+        if manager is None:
+            return None
+        gate = getattr(manager, "task_scheduler", None) or manager.admission
+        return gate.pool.capacity["gpus"]
+
     async def run_adaptive_step(self, wait: bool = True):
         """Trigger adaptive step and optionally wait for completion.
 
@@ -66,28 +595,61 @@ class ImpressBasePipeline(ABC):
             wait: If True, waits for adaptive step completion.
             If False, triggers and returns immediately.
         """
+        index = self._next_step_index()
+        if self._replay_step(index, "adaptive", "adaptive"):
+            self._replay.pop(index)
+            return
+
+        self._adaptive_step_index = index
         self._set_adaptive_flag(True)
         if wait:
+            tracer = self._tracer()
+            started = Tracer.now() if tracer is not None else 0
             await self._await_adaptive_unlock()
+            if tracer is not None:
+                tracer.record(
+                    "adaptive_wait",
+                    "adaptive_wait",
+                    self.name,
+                    started,
+                    parent_id=getattr(self, "_trace_span_id", None),
+                )
 
     def _set_adaptive_flag(self, value: bool = True):
         """Set the adaptive flag and manage the barrier state"""
-        self.invoke_adaptive_step = value
+        # Clear the barrier before raising the flag: raising it wakes the manager.
         if value:
             self._adaptive_barrier.clear()
+        self.invoke_adaptive_step = value
 
     async def _await_adaptive_unlock(self) -> Any:
         """Pause until manager completes adaptive step and returns result."""
         await self._adaptive_barrier.wait()
 
+    async def on_prepare(self):  # noqa: B027
+        """
+        Optional: Set up the pipeline before it runs.
+
+        Awaited by the manager right before ``run()``. File system scans,
+        directory creation and other I/O belong here rather than in the
+        constructor, which runs for every (child) pipeline on the manager's
+        loop as soon as it is requested. The ``on_`` prefix keeps the hook
+        apart from task names such as ``prepare``.
+        """
+        pass
+
     @abstractmethod
     async def run(self):
         """Main execution method - must be implemented by subclasses"""
         pass
 
-    @abstractmethod
-    def register_pipeline_tasks(self):
-        """Register pipeline tasks - must be implemented by subclasses"""
+    def register_pipeline_tasks(self):  # noqa: B027
+        """
+        Optional: Register tasks per instance with ``auto_register_task``.
+
+        Tasks declared on the class with ``pipeline_task`` need no
+        registration here and are much cheaper to spawn.
+        """
         pass
 
     # Optional methods that subclasses can override
@@ -100,6 +662,219 @@ class ImpressBasePipeline(ABC):
         """Optional: Cleanup or finalization logic"""
         pass
 
+    async def on_kill(self):
+        """
+        Optional: Clean up after the pipeline was killed.
+
+        Awaited by the manager once the pipeline's in-flight tasks and
+        ``run()`` are cancelled. The default calls ``finalize()`` if it takes
+        no arguments; override this hook when it does.
+        """
+        if _required_arguments(self.finalize):
+            return
+        result = self.finalize()
+        if inspect.isawaitable(result):
+            await result
+
     def get_current_config_for_next_pipeline(self):
         """Optional: Return config for next pipeline"""
         return {"name": "default_pipeline", "type": self.__class__}
+
+
+def pipeline_task(
+    local_task=False,
+    offload=True,
+    cache=False,
+    cache_inputs=None,
+    cache_outputs=None,
+    **task_kwargs,
+):
+    """
+    Declare a pipeline method as a task, once per pipeline class.
+
+    Takes the same arguments as ``ImpressBasePipeline.auto_register_task``,
+    but the method is decorated through the flow once per class and flow
+    and only bound to a pipeline when it is first used, so constructing a
+    pipeline does no registration work::
+
+        class MyPipeline(ImpressBasePipeline):
+            @pipeline_task()
+            async def fold(self, task_description={"gpus_per_rank": 1}):
+                return f"fold {self.input_path}"
+
+    Callables passed as ``cache_inputs``/``cache_outputs`` receive the
+    pipeline as their first argument, followed by the task arguments.
+    """
+
+    def decorator(func):
+        return _PipelineTask(
+            func,
+            local_task,
+            offload,
+            cache,
+            cache_inputs,
+            cache_outputs,
+            task_kwargs,
+        )
+
+    return decorator
+
+
+class _PipelineTask:
+    """
+    A task declared on a pipeline class with ``pipeline_task``.
+
+    Acts as a descriptor: the first access on a pipeline binds the task to
+    it and stores the result on the instance. Flow-decorated tasks are
+    shared by every pipeline of the class using the same flow.
+    """
+
+    def __init__(
+        self, func, local_task, offload, cache, cache_inputs, cache_outputs, task_kwargs
+    ):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = func.__name__
+        self.local_task = local_task
+        self.offload = offload
+        self.cache = cache
+        self.cache_inputs = cache_inputs
+        self.cache_outputs = cache_outputs
+        self.task_kwargs = task_kwargs
+        self.description = {} if local_task else _default_task_description(func)
+        self._flow_tasks = weakref.WeakKeyDictionary()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, pipeline, owner=None):
+        if pipeline is None:
+            return self
+        task = self.bind(pipeline)
+        if hasattr(pipeline, "__dict__"):
+            setattr(pipeline, self.name, task)
+        return task
+
+    def bind(self, pipeline):
+        """
+        Build the task callable of one pipeline.
+
+        Args:
+            pipeline (ImpressBasePipeline): Pipeline to bind to
+
+        Returns:
+            Callable returning the task's future (or coroutine for local tasks)
+        """
+        if self.local_task:
+            method = self.func.__get__(pipeline, type(pipeline))
+            task = functools.partial(pipeline._run_local_task, method, self.offload)
+            return functools.wraps(self.func)(task)
+
+        flow_task, command_task = self.flow_tasks(pipeline.flow)
+        if command_task is not None:
+            pipeline._own_dict("_cached_tasks")[self.name] = CachedTask(
+                func=self.func,
+                command_task=command_task,
+                inputs=self.cache_inputs,
+                outputs=self.cache_outputs,
+            )
+        task = functools.partial(
+            pipeline._release_task, self.name, flow_task, self.description, pipeline
+        )
+        return functools.wraps(self.func)(task)
+
+    def flow_tasks(self, flow):
+        """
+        The flow-decorated task (and cached command task) for a flow.
+
+        Decorated once per flow; the pipeline is passed as the first argument.
+
+        Returns:
+            tuple: ``(flow_task, command_task or None)``
+        """
+        tasks = self._flow_tasks.get(flow)
+        if tasks is None:
+            flow_task = flow.executable_task(**self.task_kwargs)(self.func)
+            command_task = None
+            if self.cache:
+                command_task = flow.executable_task(**self.task_kwargs)(
+                    _rendered_command_task(self.func, self.description)
+                )
+            tasks = self._flow_tasks[flow] = (flow_task, command_task)
+        return tasks
+
+
+# Attributes rebuilt by the constructor or the manager, never checkpointed
+_RUNTIME_ATTRIBUTES = frozenset(
+    {
+        "flow",
+        "logger",
+        "_manager",
+        "_adaptive_fn",
+        "_adaptive_fn_batch",
+        "_adaptive_barrier",
+        "_barrier",
+        "_logger",
+        "_adaptive_step_index",
+        "_task_descriptions",
+        "_cached_tasks",
+        "_inflight",
+        "_step_index",
+        "_replay",
+        "_invoke_adaptive_step",
+        "incoming_child_pipeline_requests",
+        "_lineage_root",
+        "_lineage_key",
+        "_checkpoint_id",
+        "_checkpoint_root_id",
+        "_trace_span_id",
+        "_trace_parent_id",
+        "_started_at",
+        "_submitted_at",
+        "_spawn_requested",
+        "_killed_at",
+        "_generation",
+        "_priority",
+        "_share",
+    }
+)
+
+
+def _required_arguments(func):
+    """Whether a callable has parameters without defaults."""
+    return any(
+        parameter.default is inspect.Parameter.empty
+        and parameter.kind
+        in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        for parameter in inspect.signature(func).parameters.values()
+    )
+
+
+def _future_status(future):
+    """Outcome of a finished future as a span status."""
+    if future.cancelled():
+        return "cancelled"
+    return "failed" if future.exception() is not None else "ok"
+
+
+def _rendered_command_task(func, description):
+    """
+    Build an executable task that submits an already rendered command.
+
+    Keeps the name and default ``task_description`` of the original task.
+    """
+
+    async def submit_command(command, task_description=description):
+        return command
+
+    submit_command.__name__ = func.__name__
+    submit_command.__qualname__ = func.__qualname__
+    return submit_command
+
+
+def _default_task_description(func):
+    """Return the default ``task_description`` declared in a task's signature."""
+    parameter = inspect.signature(func).parameters.get("task_description")
+    if parameter is None or not isinstance(parameter.default, dict):
+        return {}
+    return dict(parameter.default)
@@ -1,8 +1,12 @@
 import asyncio
 import copy
+import heapq
+import itertools
+import math
 import os
 
-from .impress_pipeline import ImpressBasePipeline
+from ..utils.logger import LogLevel
+from .impress_pipeline import ImpressBasePipeline, pipeline_task
 
 TASK_PRE_EXEC = [
     "module load anaconda",
@@ -12,6 +16,26 @@ TASK_PRE_EXEC = [
 
 MPNN_PATH = f"/anvil/scratch/{os.environ['USER']}/impress/ProteinMPNN"
 
+PEPTIDE_SEQUENCE = "EGYQDYEPEA"
+
+
+def read_mpnn_fasta(path):
+    """
+    Stream the designed sequences of a ProteinMPNN FASTA file.
+
+    The first record (the input sequence) is skipped; every following
+    sequence line is yielded as ``[sequence, score]`` with the score of the
+    last header.
+    """
+    with open(path) as fd:
+        score = None
+        for line in itertools.islice(fd, 2, None):  # Skip first two lines
+            line = line.strip()
+            if line.startswith(">"):
+                score = float(line.split(",")[2].replace(" score=", ""))
+            else:
+                yield [line, score]
+
 
 class ProteinBindingPipeline(ImpressBasePipeline):
     def __init__(self, name, flow, configs=None, **kwargs):
@@ -27,7 +51,13 @@ class ProteinBindingPipeline(ImpressBasePipeline):
         self.num_seqs = kwargs.get("num_seqs", 10)
         self.sub_order = kwargs.get("sub_order", 0)
         self.max_passes = kwargs.get("max_passes", 4)
+        self.max_sub_order = kwargs.get("max_sub_order", 3)
         self.mpnn_path = kwargs.get("mpnn_path", MPNN_PATH)
+        self.peptide_sequence = kwargs.get("peptide_sequence", PEPTIDE_SEQUENCE)
+        self.fold_batching: bool = kwargs.get("fold_batching", False)
+        self.fold_batch_size = kwargs.get("fold_batch_size")
+        # Processes (and cores) of the s5 scoring task
+        self.score_workers: int = kwargs.get("score_workers", 4)
 
         # Sequence and score state
         self.current_scores = {}
@@ -50,10 +80,12 @@ class ProteinBindingPipeline(ImpressBasePipeline):
             self.output_path, "af/prediction/best_models"
         )
 
-        # might have to do outside of initialization, so new pipelines
-        # do not run this can be declared directly as argument
-        for file_name in os.listdir(self.input_path):
-            self.fasta_list_2.append(file_name)
+    async def on_prepare(self):
+        """List the input structures without blocking the manager's loop"""
+        file_names = await asyncio.get_running_loop().run_in_executor(
+            None, os.listdir, self.input_path
+        )
+        self.fasta_list_2.extend(file_names)
 
     def set_up_new_pipeline_dirs(self, new_pipeline_name):
         base_output = os.path.join(
@@ -83,92 +115,214 @@ class ProteinBindingPipeline(ImpressBasePipeline):
         for path in paths_to_create:
             os.makedirs(path, exist_ok=True)
 
-    def register_pipeline_tasks(self):
-        """Register all pipeline tasks"""
-
-        @self.auto_register_task()  # MPNN
-        async def s1(task_description={"gpus_per_rank": 1}):  # noqa: B006
-            mpnn_script = os.path.join(self.base_path, "mpnn_wrapper.py")
-            output_dir = os.path.join(self.output_path_mpnn, f"job_{self.passes}")
-
-            chain = "A" if self.passes == 1 else "B"
-            input_path = self.input_path if self.passes == 1 else self.output_path_af
-
-            return (
-                f"python3 {mpnn_script} "
-                f"-pdb={input_path} "
-                f"-out={output_dir} "
-                f"-mpnn={self.mpnn_path} "
-                f"-seqs={self.num_seqs} "
-                "-is_monomer=0 "
-                f"-chains={chain}"
-            )
+    @pipeline_task()  # MPNN
+    async def s1(self, task_description={"gpus_per_rank": 1}):  # noqa: B006
+        mpnn_script = os.path.join(self.base_path, "mpnn_wrapper.py")
+        output_dir = os.path.join(self.output_path_mpnn, f"job_{self.passes}")
+
+        chain = "A" if self.passes == 1 else "B"
+        input_path = self.input_path if self.passes == 1 else self.output_path_af
+
+        return (
+            f"python3 {mpnn_script} "
+            f"-pdb={input_path} "
+            f"-out={output_dir} "
+            f"-mpnn={self.mpnn_path} "
+            f"-seqs={self.num_seqs} "
+            "-is_monomer=0 "
+            f"-chains={chain}"
+        )
 
-        @self.auto_register_task(local_task=True)
-        async def s2():
-            job_seqs_dir = f"{self.output_path_mpnn}/job_{self.passes}/seqs"
-
-            for file_name in os.listdir(job_seqs_dir):
-                seqs = []
-                with open(os.path.join(job_seqs_dir, file_name)) as fd:
-                    lines = fd.readlines()[2:]  # Skip first two lines
-
-                score = None
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith(">"):
-                        score = float(line.split(",")[2].replace(" score=", ""))
-                    else:
-                        seqs.append([line, score])
-
-                seqs.sort(key=lambda x: x[1])  # Sort by score
-                self.iter_seqs[file_name.split(".")[0]] = seqs
-
-        # fasta - don't use helper script - cannot run x tasks for x structures
-        @self.auto_register_task(local_task=True)
-        async def s3():
-            output_dir = os.path.join(self.output_path, "af", "fasta")
-
-            fasta_file_to_return = []
-            for fasta_file in self.fasta_list_2:
-                base_name = fasta_file.split(".")[0]
-                fasta_file_to_return.append(base_name)
-                design_seq = self.iter_seqs[base_name][self.seq_rank][0]
-                pep_seq = "EGYQDYEPEA"
-
-                fasta_path = os.path.join(output_dir, f"{base_name}.fa")
-                with open(fasta_path, "w") as f:
-                    f.write(f">pdz\n{design_seq}\n>pep\n{pep_seq}\n")
-
-            return fasta_file_to_return
-
-        # alphafold, must be run separately for each structure one at a time!
-        @self.auto_register_task()
-        async def s4(target_fasta, task_description={"gpus_per_rank": 1}):  # noqa: B006
-            cmd = (
-                f"/bin/bash {self.base_path}/af2_multimer_reduced.sh "
-                f"{self.output_path}/af/fasta/ "
-                f"{target_fasta}.fa "
-                f"{self.output_path}/af/prediction/dimer_models/ "
+    @pipeline_task(local_task=True)
+    async def s2(self):
+        job_seqs_dir = f"{self.output_path_mpnn}/job_{self.passes}/seqs"
+
+        # Keep only the best-scored sequences this pipeline and its
+        # descendants can use, sorted by score, in a bounded heap
+        keep = self.seqs_to_keep()
+        for file_name in os.listdir(job_seqs_dir):
+            seqs = read_mpnn_fasta(os.path.join(job_seqs_dir, file_name))
+            self.iter_seqs[file_name.split(".")[0]] = heapq.nsmallest(
+                keep, seqs, key=lambda x: x[1]
             )
 
-            return cmd
+    # fasta - don't use helper script - cannot run x tasks for x structures
+    @pipeline_task(local_task=True)
+    async def s3(self):
+        output_dir = os.path.join(self.output_path, "af", "fasta")
+
+        fasta_file_to_return = []
+        for fasta_file in self.fasta_list_2:
+            base_name = fasta_file.split(".")[0]
+            fasta_file_to_return.append(base_name)
+            design_seq = self.iter_seqs[base_name][self.seq_rank][0]
+            pep_seq = self.peptide_sequence
+
+            fasta_path = os.path.join(output_dir, f"{base_name}.fa")
+            with open(fasta_path, "w") as f:
+                f.write(f">pdz\n{design_seq}\n>pep\n{pep_seq}\n")
+
+        return fasta_file_to_return
+
+    # alphafold, one structure or a batch of structures (list) per invocation
+    @pipeline_task()
+    async def s4(self, target_fasta, task_description={"gpus_per_rank": 1}):  # noqa: B006
+        targets = [target_fasta] if isinstance(target_fasta, str) else target_fasta
+        cmd = (
+            f"/bin/bash {self.base_path}/af2_multimer_reduced.sh "
+            f"{self.output_path}/af/fasta/ "
+            f"{','.join(f'{target}.fa' for target in targets)} "
+            f"{self.output_path}/af/prediction/dimer_models/ "
+        )
+
+        return cmd
+
+    @pipeline_task()  # pLDTT_extract
+    async def s5(self, task_description={}):  # noqa: B006
+        return (
+            f"python3 {self.base_path}/plddt_extract_pipeline.py "
+            f"--path={self.base_path} "
+            f"--iter={self.passes} "
+            f"--out={self.name} "
+            f"--chain_starts=-{len(self.peptide_sequence)} "
+            f"--workers={self.score_workers}"
+        )
+
+    def s5_description(self):
+        """
+        Task description of ``s5``: one core per scoring process, and the
+        pass's stats CSV staged back to the client.
+        """
+        staged_file = f"af_stats_{self.name}_pass_{self.passes}.csv"
+        return {
+            "cores_per_rank": self.score_workers,
+            "pre_exec": TASK_PRE_EXEC,
+            "output_staging": [
+                {
+                    "source": f"task:///{staged_file}",
+                    "target": f"client:///{staged_file}",
+                }
+            ],
+        }
+
+    def seqs_to_keep(self):
+        """
+        Number of ranked sequences per target ``s2`` keeps in ``iter_seqs``.
+
+        This pipeline folds rank ``seq_rank``. A child spawned in the same
+        pass inherits the parsed lists and folds the next rank without
+        reparsing, and so on down to ``max_sub_order``. Later passes parse new
+        MPNN output, so the number of passes does not add ranks.
+        """
+        return self.seq_rank + 1 + max(self.max_sub_order - self.sub_order, 0)
+
+    def target_length(self, target_fasta):
+        """Residues AlphaFold folds for a target: its design plus the peptide"""
+        design_seq = self.iter_seqs[target_fasta][self.seq_rank][0]
+        return len(design_seq) + len(self.peptide_sequence)
+
+    def fold_batches(self, fasta_files):
+        """
+        Group the targets of a pass into ``s4`` invocations.
+
+        Without ``fold_batching`` every target is folded by its own task.
+        With it, targets are sorted by length and cut into consecutive batches
+        of ``fold_batch_size``, or of as many targets as spreads them over the
+        allocation's GPU slots (one target per batch if none were declared, so
+        an unknown allocation never serializes the pass on one GPU). Each
+        batch then pays container start-up, JAX compilation and database
+        loading once, for inputs of similar size.
+        """
+        if not self.fold_batching:
+            return [[target] for target in fasta_files]
+
+        targets = sorted(fasta_files, key=self.target_length)
+        size = self.fold_batch_size
+        if size is None:
+            slots = self.gpu_slots()
+            size = math.ceil(len(targets) / slots) if slots else 1
+        size = max(size, 1)
+        return [targets[i : i + size] for i in range(0, len(targets), size)]
+
+    def best_model_copies(self, target_fasta):
+        """Commands collecting a target's top-ranked model and ranking"""
+        models_path = os.path.join(
+            self.output_path, "af", "prediction", "dimer_models", target_fasta
+        )
+
+        best_model_pdb = os.path.join(
+            self.output_path,
+            "af",
+            "prediction",
+            "best_models",
+            f"{target_fasta}.pdb",
+        )
+        best_ptm_json = os.path.join(
+            self.output_path,
+            "af",
+            "prediction",
+            "best_ptm",
+            f"{target_fasta}.json",
+        )
+        mpnn_pdb = os.path.join(
+            self.output_path,
+            "mpnn",
+            f"job_{self.passes}",
+            f"{target_fasta}.pdb",
+        )
+
+        return [
+            f"cp {models_path}/*ranked_0*.pdb {best_model_pdb}",
+            f"cp {models_path}/*ranking_debug*.json {best_ptm_json}",
+            f"cp {models_path}/*ranked_0*.pdb {mpnn_pdb}",
+        ]
 
-        @self.auto_register_task()  # pLDTT_extract
-        async def s5(task_description={}):  # noqa: B006
-            return (
-                f"python3 {self.base_path}/plddt_extract_pipeline.py "
-                f"--path={self.base_path} "
-                f"--iter={self.passes} "
-                f"--out={self.name}"
+    async def run_alphafold(self, fasta_files):
+        """Fold the targets of a pass, one ``s4`` task per batch"""
+        alphafold_tasks = []
+
+        for batch in self.fold_batches(fasta_files):
+            s4_description = {
+                "pre_exec": TASK_PRE_EXEC,
+                "post_exec": [
+                    command
+                    for target_fasta in batch
+                    for command in self.best_model_copies(target_fasta)
+                ],
+            }
+
+            # launch coroutine without awaiting yet
+            alphafold_tasks.append(
+                self.s4(
+                    target_fasta=batch[0] if len(batch) == 1 else batch,
+                    task_description=s4_description,
+                )
+            )
+
+        self.logger.pipeline_log(
+            f"Submitting {len(alphafold_tasks)} Alphafold tasks asynchronously"
+        )
+        results = await asyncio.gather(*alphafold_tasks, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for error in errors:
+            # A cancelled task means the pipeline is being killed
+            if isinstance(error, asyncio.CancelledError):
+                raise error
+        if errors:
+            self.logger.pipeline_log(
+                f"{len(errors)} of {len(results)} Alphafold tasks failed: "
+                f"{errors[0]!r}",
+                LogLevel.WARNING,
             )
+        self.logger.pipeline_log(f"{len(alphafold_tasks)} Alphafold tasks finished")
 
     async def get_scores_map(self):
         """Return current and previous scores"""
         return {"c_scores": self.current_scores, "p_scores": self.previous_scores}
 
-    def finalize(self, sub_iter_seqs):
-        # finalize the "cleanup" of the current pipeline
+    def finalize(self, sub_iter_seqs=()):
+        # finalize the "cleanup" of the current pipeline; targets migrated to a
+        # child are dropped (none when the manager finalizes a killed pipeline)
         for a in sub_iter_seqs:
             self.fasta_list_2.remove(f"{a}.pdb")
             os.unlink(f"{self.output_path_af}/{a}.pdb")
@@ -204,69 +358,11 @@ class ProteinBindingPipeline(ImpressBasePipeline):
             fasta_files = await self.s3()
             self.logger.pipeline_log("Scoring task finished")
 
-            alphafold_tasks = []
-
-            for target_fasta in fasta_files:
-                models_path = os.path.join(
-                    self.output_path, "af", "prediction", "dimer_models", target_fasta
-                )
-
-                best_model_pdb = os.path.join(
-                    self.output_path,
-                    "af",
-                    "prediction",
-                    "best_models",
-                    f"{target_fasta}.pdb",
-                )
-                best_ptm_json = os.path.join(
-                    self.output_path,
-                    "af",
-                    "prediction",
-                    "best_ptm",
-                    f"{target_fasta}.json",
-                )
-                mpnn_pdb = os.path.join(
-                    self.output_path,
-                    "mpnn",
-                    f"job_{self.passes}",
-                    f"{target_fasta}.pdb",
-                )
-
-                s4_description = {
-                    "pre_exec": TASK_PRE_EXEC,
-                    "post_exec": [
-                        f"cp {models_path}/*ranked_0*.pdb {best_model_pdb}",
-                        f"cp {models_path}/*ranking_debug*.json {best_ptm_json}",
-                        f"cp {models_path}/*ranked_0*.pdb {mpnn_pdb}",
-                    ],
-                }
-
-                # launch coroutine without awaiting yet
-                alphafold_tasks.append(
-                    self.s4(target_fasta=target_fasta, task_description=s4_description)
-                )
-
-            self.logger.pipeline_log(
-                f"Submitting {len(alphafold_tasks)} Alphafold tasks asynchronously"
-            )
-            await asyncio.gather(*alphafold_tasks, return_exceptions=True)
-            self.logger.pipeline_log(f"{len(alphafold_tasks)} Alphafold tasks finished")
+            await self.run_alphafold(fasta_files)
 
             self.logger.pipeline_log("Submitting pLDTT extraction task")
 
-            staged_file = f"af_stats_{self.name}_pass_{self.passes}.csv"
-
-            await self.s5(
-                task_description={
-                    "pre_exec": TASK_PRE_EXEC,
-                    "output_staging": [
-                        {
-                            "source": f"task:///{staged_file}",
-                            "target": f"client:///{staged_file}",
-                        }
-                    ],
-                }
-            )
+            await self.s5(task_description=self.s5_description())
             self.logger.pipeline_log("pLDTT extract finished")
 
             await self.run_adaptive_step(wait=True)
@@ -1,7 +1,7 @@
 from collections.abc import Awaitable
 from typing import Annotated, Any, Callable, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 from .impress_pipeline import ImpressBasePipeline
 
@@ -21,10 +21,40 @@ class PipelineSetup(BaseModel):
         default=None,
         description="Optional adaptive function for the pipeline",
     )
+    adaptive_fn_batch: Optional[
+        Callable[[list[ImpressBasePipeline]], Awaitable[None]]
+    ] = Field(
+        default=None,
+        description="Optional adaptive function called once for every pipeline "
+        "sharing it that requests an adaptive step within the manager's batch "
+        "window (takes precedence over adaptive_fn)",
+    )
     kwargs: dict[str, Any] = Field(
         default_factory=dict,
         description="Additional keyword arguments",
     )
+    priority: Optional[int] = Field(
+        default=None,
+        description="Scheduling priority, higher runs first "
+        "(None inherits the parent's priority, 0 for root pipelines)",
+    )
+    spawn_reason: Optional[str] = Field(
+        default=None,
+        description="Why the parent spawned this pipeline (kept in the lineage graph)",
+    )
+    share: float = Field(
+        default=1.0,
+        gt=0,
+        description="Fair-share weight of the root campaign this pipeline starts",
+    )
+
+    # Pipeline that requested this setup as a child (set by the manager)
+    _parent: Optional[ImpressBasePipeline] = PrivateAttr(default=None)
+    # Trace timestamp of the manager receiving the child request
+    _requested_at: Optional[int] = PrivateAttr(default=None)
+    # Lineage assigned by a sharded coordinator (key, parent, generation,
+    # priority, share, root), used instead of _parent across processes
+    _lineage: Optional[dict[str, Any]] = PrivateAttr(default=None)
 
     model_config = {"arbitrary_types_allowed": True}
 
@@ -45,17 +75,55 @@ class PipelineSetup(BaseModel):
         }
         if self.adaptive_fn is not None:
             result["adaptive_fn"] = self.adaptive_fn
+        if self.adaptive_fn_batch is not None:
+            result["adaptive_fn_batch"] = self.adaptive_fn_batch
+        if self.priority is not None:
+            result["priority"] = self.priority
+        if self.share != 1.0:
+            result["share"] = self.share
+        if self.spawn_reason is not None:
+            result["spawn_reason"] = self.spawn_reason
 
         result.update(self.kwargs)
         return result
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "PipelineSetup":
-        """Create PipelineSetup from dictionary (for backward compatibility)."""
-        known_fields = {"name", "type", "config", "adaptive_fn"}
-        pipeline_data = {k: v for k, v in data.items() if k in known_fields}
+    def from_dict(cls, data: dict[str, Any], validate: bool = True) -> "PipelineSetup":
+        """
+        Create PipelineSetup from dictionary (for backward compatibility).
+
+        Args:
+            data: Setup fields plus extra keyword arguments for the pipeline
+            validate: Validate the fields; pass False only for trusted input
+                such as child requests of running pipelines
+
+        Returns:
+            PipelineSetup object
+        """
+        pipeline_data = {k: v for k, v in data.items() if k in _KNOWN_FIELDS}
+        pipeline_data["kwargs"] = {
+            k: v for k, v in data.items() if k not in _KNOWN_FIELDS
+        }
+        if validate:
+            return cls(**pipeline_data)
+
+        # Copying a valid template skips validation; the mutable defaults
+        # must not be shared between copies
+        pipeline_data.setdefault("config", {})
+        return _UNVALIDATED_TEMPLATE.model_copy(update=pipeline_data)
+
 
-        kwargs = {k: v for k, v in data.items() if k not in known_fields}
-        pipeline_data["kwargs"] = kwargs
+_KNOWN_FIELDS = frozenset(
+    {
+        "name",
+        "type",
+        "config",
+        "adaptive_fn",
+        "adaptive_fn_batch",
+        "priority",
+        "share",
+        "spawn_reason",
+    }
+)
 
-        return cls(**pipeline_data)
+_UNVALIDATED_TEMPLATE = PipelineSetup(name="", type=ImpressBasePipeline)
@@ -0,0 +1,503 @@
+import asyncio
+import inspect
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Optional, Union
+
+from radical.asyncflow import WorkflowEngine
+
+from .impress_manager import ImpressManager
+from .pipelines.impress_pipeline import ImpressBasePipeline
+from .pipelines.setup import PipelineSetup
+from .utils.lineage import LineageGraph, LineageServer
+from .utils.logger import ImpressLogger
+
+# Seconds between liveness checks of the shard processes
+_POLL_INTERVAL = 0.5
+
+
+class ShardedImpressManager:
+    """
+    Runs a campaign on several ImpressManager processes.
+
+    Each shard is a local process with its own event loop, workflow engine
+    and execution backend, so adaptive functions, result parsing and logging
+    of different pipelines run in parallel. The coordinator places root
+    pipelines on the least loaded shard. Child requests are sent back to the
+    coordinator, which records them in the lineage graph and places them the
+    same way (on the parent's shard when loads are equal). Shards report
+    every pipeline start, step and retirement, so ``lineage_snapshot`` covers
+    the whole campaign.
+
+    Pipeline setups travel between processes pickled: pipeline types,
+    adaptive functions and keyword arguments must be importable module-level
+    objects or plain data.
+    """
+
+    def __init__(
+        self,
+        backend_factory: Callable[[], Any],
+        shards: Optional[int] = None,
+        use_colors: bool = True,
+        lineage_endpoint: Optional[str] = None,
+        **manager_kwargs: Any,
+    ) -> None:
+        """
+        Initialize the ShardedImpressManager.
+
+        Args:
+            backend_factory: Picklable callable run in every shard process to
+            create its execution backend (may return an awaitable, e.g. the
+            ``RadicalExecutionBackend`` class with ``functools.partial``)
+            shards: Number of shard processes (defaults to the CPU count)
+            use_colors: Whether to use colors in logging output
+            lineage_endpoint: Serve the campaign-wide lineage graph as JSON on
+            ``"host:port"`` or ``"unix:/path/to.sock"`` while running
+            **manager_kwargs: Passed to every shard's ImpressManager; ``{shard}``
+            in string values (e.g. ``trace_path="trace-{shard}.json"``) is
+            replaced by the shard index. Resources and limits apply per shard.
+
+        Raises:
+            ValueError: If ``checkpoint_path`` is given (sharded campaigns
+            cannot be resumed)
+        """
+        if manager_kwargs.get("checkpoint_path"):
+            raise ValueError("Checkpointing is not supported in sharded mode")
+
+        self.backend_factory: Callable[[], Any] = backend_factory
+        self.shards: int = shards or os.cpu_count() or 1
+        self.manager_kwargs: dict[str, Any] = {"use_colors": use_colors}
+        self.manager_kwargs.update(manager_kwargs)
+        self.logger: ImpressLogger = ImpressLogger(use_colors=use_colors)
+
+        self.lineage: LineageGraph = LineageGraph()
+        self.lineage_server: Optional[LineageServer] = (
+            LineageServer(self.lineage.snapshot, lineage_endpoint)
+            if lineage_endpoint
+            else None
+        )
+
+        # Pipelines placed on each shard that have not retired yet
+        self.live: list[int] = [0] * self.shards
+        # Pipelines placed on each shard in total
+        self.placed: list[int] = [0] * self.shards
+        # Shard index -> run statistics reported when the shard exited
+        self.shard_stats: dict[int, dict[str, Any]] = {}
+
+        self._processes: list[multiprocessing.Process] = []
+        self._inboxes: list[multiprocessing.Queue] = []
+        self._outbox: Optional[multiprocessing.Queue] = None
+        self._stopping: bool = False
+        self._done: Optional[asyncio.Future] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._coordinator: Optional[threading.Thread] = None
+
+    async def start(
+        self, pipeline_setups: list[Union[dict[str, Any], PipelineSetup]]
+    ) -> None:
+        """
+        Start the shard processes and run the campaign to completion.
+
+        Args:
+            pipeline_setups: Initial pipeline configurations (dicts or
+            PipelineSetup objects)
+
+        Raises:
+            RuntimeError: If a shard process dies before the campaign ends
+        """
+        setups: list[PipelineSetup] = [
+            PipelineSetup.from_dict(s) if isinstance(s, dict) else s
+            for s in pipeline_setups
+        ]
+        self.logger.separator("IMPRESS SHARDED MANAGER STARTING")
+        self.logger.shards_starting(self.shards, len(setups))
+
+        self._loop = asyncio.get_running_loop()
+        self._done = self._loop.create_future()
+        if self.lineage_server is not None:
+            self.logger.lineage_endpoint(await self.lineage_server.start())
+
+        context = multiprocessing.get_context("spawn")
+        self._outbox = context.Queue()
+        for shard in range(self.shards):
+            inbox: multiprocessing.Queue = context.Queue()
+            process = context.Process(
+                target=_run_shard,
+                args=(
+                    shard,
+                    self.backend_factory,
+                    _shard_kwargs(self.manager_kwargs, shard),
+                    inbox,
+                    self._outbox,
+                ),
+                name=f"impress-shard-{shard}",
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+        self._coordinator = threading.Thread(
+            target=self._read_outbox, name="impress-coordinator", daemon=True
+        )
+        self._coordinator.start()
+
+        try:
+            placements: dict[int, list[PipelineSetup]] = defaultdict(list)
+            for setup in setups:
+                self._place(setup, None, None, placements)
+            self._send_placements(placements)
+            if not setups:
+                self._stop_shards()
+            await self._done
+        finally:
+            self._stopping = True
+            failed: bool = not self._done.done() or self._done.exception() is not None
+            for process in self._processes:
+                if failed:
+                    process.terminate()
+                await asyncio.to_thread(process.join)
+            # Sees _stopping within one poll; joined so it never posts to the
+            # loop after asyncio.run() has closed it
+            await asyncio.to_thread(self._coordinator.join)
+            if self.lineage_server is not None:
+                await self.lineage_server.stop()
+
+        self.logger.manager_exiting()
+        self.logger.separator("IMPRESS SHARDED MANAGER FINISHED")
+        self.logger.flush()
+
+    def lineage_snapshot(self, root: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """
+        Snapshot of the campaign-wide lineage graph.
+
+        Args:
+            root: Only include this pipeline and its descendants
+
+        Returns:
+            The same structure as ``ImpressManager.lineage_snapshot``
+        """
+        return self.lineage.snapshot(root)
+
+    def _place(
+        self,
+        setup: PipelineSetup,
+        parent_shard: Optional[int],
+        lineage: Optional[dict[str, Any]],
+        placements: dict[int, list[PipelineSetup]],
+    ) -> None:
+        """
+        Record a pipeline in the lineage graph and pick its shard.
+
+        Args:
+            setup: Root setup, or child setup sent by a shard
+            parent_shard: Shard of the requesting parent (None for roots)
+            lineage: Parent lineage sent with a child request
+            placements: Shard index -> setups to send, filled in
+        """
+        kwargs: dict[str, Any] = {**setup.config, **setup.kwargs}
+        if lineage is None:
+            lineage = {
+                "parent": None,
+                "generation": 0,
+                "priority": setup.priority or 0,
+                "share": setup.share,
+            }
+        key: str = self.lineage.add(
+            setup.name,
+            parent=lineage["parent"],
+            generation=lineage["generation"],
+            spawn_reason=setup.spawn_reason,
+            start_step=kwargs.get("start_step"),
+        )
+        lineage["key"] = key
+        lineage.setdefault("root", key)
+        setup._lineage = lineage
+
+        shard: int = min(
+            range(self.shards), key=lambda i: (self.live[i], i != parent_shard)
+        )
+        self.live[shard] += 1
+        self.placed[shard] += 1
+        placements[shard].append(setup)
+
+    def _send_placements(self, placements: dict[int, list[PipelineSetup]]) -> None:
+        """Send every shard its newly placed setups in one message."""
+        for shard, setups in placements.items():
+            self._inboxes[shard].put(("submit", pickle.dumps(setups)))
+
+    def _read_outbox(self) -> None:
+        """Forward shard messages to the event loop (coordinator thread)."""
+        # Shards found dead on the previous poll; their last messages may
+        # still have been in flight then
+        suspects: set[int] = set()
+        while not self._stopping:
+            try:
+                message = self._outbox.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                dead = {
+                    shard
+                    for shard, process in enumerate(self._processes)
+                    if process.exitcode is not None
+                }
+                for shard in dead & suspects:
+                    self._post("failed", shard, self._processes[shard].exitcode)
+                suspects = dead
+                continue
+            self._post(*message)
+
+    def _post(self, *message: Any) -> None:
+        """Hand a message to ``_receive`` on the event loop, unless it is gone."""
+        if self._loop.is_closed():
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._receive, *message)
+        except RuntimeError:
+            # Closed between the check and the call
+            pass
+
+    def _receive(self, kind: str, shard: int, data: Any) -> None:
+        """
+        Handle one message of a shard.
+
+        Args:
+            kind: ``events``, ``exit`` or ``failed``
+            shard: Shard index
+            data: Pickled event batch, run statistics or exit code
+        """
+        if self._done.done():
+            return
+
+        if kind == "events":
+            placements: dict[int, list[PipelineSetup]] = defaultdict(list)
+            for event in pickle.loads(data):
+                self._apply_event(shard, event, placements)
+            self._send_placements(placements)
+            if not any(self.live):
+                self._stop_shards()
+        elif kind == "exit":
+            self.shard_stats[shard] = data
+            if len(self.shard_stats) == self.shards:
+                self._done.set_result(None)
+        elif kind == "failed" and shard not in self.shard_stats:
+            self.logger.shard_failed(shard, data)
+            self._done.set_exception(
+                RuntimeError(f"Shard {shard} exited unexpectedly (code {data})")
+            )
+
+    def _apply_event(
+        self,
+        shard: int,
+        event: tuple,
+        placements: dict[int, list[PipelineSetup]],
+    ) -> None:
+        """Apply one lineage event or child request reported by a shard."""
+        name: str = event[0]
+        if name == "child":
+            _, setup, lineage = event
+            self._place(setup, shard, lineage, placements)
+        elif name == "started":
+            self.lineage.started(event[1])
+        elif name == "step":
+            self.lineage.step(*event[1:])
+        elif name == "finished":
+            self.lineage.finished(*event[1:])
+            self.live[shard] -= 1
+
+    def _stop_shards(self) -> None:
+        """Tell every shard that no more pipelines will come."""
+        for inbox in self._inboxes:
+            inbox.put(None)
+
+
+class _ShardManager(ImpressManager):
+    """
+    ImpressManager running one shard of a sharded campaign.
+
+    Pipelines arrive from the coordinator with their lineage already
+    assigned. Child requests and lineage changes are batched and sent back
+    once per loop iteration. The shard keeps serving until the coordinator
+    stops it.
+    """
+
+    def __init__(
+        self,
+        execution_backend: Any,
+        shard: int,
+        outbox: multiprocessing.Queue,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(execution_backend, **kwargs)
+        self.shard: int = shard
+        self.outbox: multiprocessing.Queue = outbox
+        self.lineage = _LineageForwarder(self._report)
+        self._events: list[tuple] = []
+        self._stopping: bool = False
+
+    async def serve(self, inbox: multiprocessing.Queue) -> None:
+        """
+        Run the pipelines the coordinator sends until it says stop.
+
+        Args:
+            inbox: Queue of ``("submit", pickled setups)`` messages, ended by
+            None
+        """
+        self.flow: WorkflowEngine = await WorkflowEngine.create(
+            backend=self.execution_backend
+        )
+        self._bind_loop()
+
+        loop: asyncio.AbstractEventLoop = self._loop
+
+        def read() -> None:
+            for _, data in iter(inbox.get, None):
+                loop.call_soon_threadsafe(self._receive, data)
+            loop.call_soon_threadsafe(self._stop_serving)
+
+        threading.Thread(
+            target=read, name=f"impress-shard-{self.shard}", daemon=True
+        ).start()
+
+        try:
+            await self._run_until_done()
+        finally:
+            self._flush_events()
+            self.outbox.put(("exit", self.shard, self.stats()))
+            await self.flow.shutdown()
+
+    def _has_work(self) -> bool:
+        """Keep serving until the coordinator stops the shard."""
+        return super()._has_work() or not self._stopping
+
+    def _receive(self, data: bytes) -> None:
+        """Submit setups placed on this shard by the coordinator."""
+        self.submit_new_pipelines(pickle.loads(data))
+        self._wakeup.set()
+
+    def _stop_serving(self) -> None:
+        """Let the manager loop end once its pipelines are done."""
+        self._stopping = True
+        self._wakeup.set()
+
+    def submit_new_pipelines(
+        self, pipeline_setups: list[Union[dict[str, Any], PipelineSetup]]
+    ) -> None:
+        """Run placed setups here and send child requests to the coordinator."""
+        placed: list[PipelineSetup] = []
+        for setup_input in pipeline_setups:
+            setup = self._normalize_pipeline_setup(setup_input)
+            parent: Optional[ImpressBasePipeline] = setup._parent
+            if parent is None:
+                placed.append(setup)
+                continue
+
+            setup._parent = None
+            lineage: dict[str, Any] = {
+                "parent": parent._lineage_key,
+                "generation": parent._generation + 1,
+                "priority": (
+                    setup.priority if setup.priority is not None else parent._priority
+                ),
+                "share": parent._share,
+                "root": parent._lineage_root,
+            }
+            self._report(("child", setup, lineage))
+
+        if placed:
+            super().submit_new_pipelines(placed)
+
+    def _assign_lineage(
+        self, pipeline: ImpressBasePipeline, setup: PipelineSetup
+    ) -> None:
+        """Attach the lineage the coordinator assigned to a placed setup."""
+        lineage: Optional[dict[str, Any]] = setup._lineage
+        if lineage is None:
+            super()._assign_lineage(pipeline, setup)
+            return
+        pipeline._lineage_key = lineage["key"]
+        pipeline._lineage_root = lineage["root"]
+        pipeline._generation = lineage["generation"]
+        pipeline._priority = lineage["priority"]
+        pipeline._share = lineage["share"]
+
+    def _report(self, event: tuple) -> None:
+        """Queue an event for the coordinator, sent at the end of this pass."""
+        if not self._events:
+            self._loop.call_soon(self._flush_events)
+        self._events.append(event)
+
+    def _flush_events(self) -> None:
+        """Send the queued events to the coordinator in one message."""
+        events, self._events = self._events, []
+        if not events:
+            return
+        try:
+            data: bytes = pickle.dumps(events)
+        except Exception:
+            data = pickle.dumps(self._picklable(events))
+        self.outbox.put(("events", self.shard, data))
+
+    def _picklable(self, events: list[tuple]) -> list[tuple]:
+        """Drop (and log) child requests that cannot be pickled."""
+        kept: list[tuple] = []
+        for event in events:
+            try:
+                pickle.dumps(event)
+            except Exception as e:
+                self.logger.child_pipeline_dropped(event[1].name, str(e))
+                continue
+            kept.append(event)
+        return kept
+
+
+class _LineageForwarder:
+    """Stands in for a shard's LineageGraph and reports to the coordinator."""
+
+    def __init__(self, report: Callable[[tuple], None]) -> None:
+        self.report: Callable[[tuple], None] = report
+
+    def started(self, key: Optional[str]) -> None:
+        self.report(("started", key))
+
+    def step(self, key: Optional[str], name: str, index: int) -> None:
+        self.report(("step", key, name, index))
+
+    def finished(self, key: Optional[str], status: str) -> None:
+        self.report(("finished", key, status))
+
+    def snapshot(self, root: Optional[str] = None) -> None:
+        # The campaign-wide graph lives in the coordinator
+        return None
+
+
+def _shard_kwargs(manager_kwargs: dict[str, Any], shard: int) -> dict[str, Any]:
+    """Manager arguments of one shard, with ``{shard}`` filled in."""
+    return {
+        key: (
+            value.format(shard=shard)
+            if isinstance(value, str) and "{shard}" in value
+            else value
+        )
+        for key, value in manager_kwargs.items()
+    }
+
+
+def _run_shard(
+    shard: int,
+    backend_factory: Callable[[], Any],
+    manager_kwargs: dict[str, Any],
+    inbox: multiprocessing.Queue,
+    outbox: multiprocessing.Queue,
+) -> None:
+    """Entry point of a shard process."""
+
+    async def serve() -> None:
+        backend: Any = backend_factory()
+        if inspect.isawaitable(backend):
+            backend = await backend
+        manager = _ShardManager(backend, shard, outbox, **manager_kwargs)
+        await manager.serve(inbox)
+
+    asyncio.run(serve())
@@ -0,0 +1,144 @@
+import time
+from typing import Any, Optional
+
+from .scheduler import FairShareQueue, ResourcePool, lineage_of
+
+
+class AdmissionController:
+    """
+    Decides when submitted pipelines may start running.
+
+    Tracks the GPU and CPU slots declared for the execution backend and the
+    number of pipelines in flight. Pipelines that do not fit wait in a
+    FairShareQueue (priority, then per-lineage fair share, then generation
+    depth, then submission order) and are admitted as running pipelines
+    release their slots.
+    """
+
+    def __init__(
+        self,
+        gpus: Optional[int] = None,
+        cpus: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        policy: str = "fair",
+    ) -> None:
+        """
+        Initialize the AdmissionController.
+
+        Args:
+            gpus: GPU slots of the allocation (None means unlimited)
+            cpus: CPU slots of the allocation (None means unlimited)
+            max_in_flight: Maximum number of concurrently running pipelines
+            (None means unlimited)
+            policy: Queue ordering, ``"fair"`` or ``"fifo"``
+        """
+        self.pool: ResourcePool = ResourcePool(
+            gpus=gpus, cpus=cpus, max_holders=max_in_flight
+        )
+        self.pending: FairShareQueue = FairShareQueue(policy)
+        self.running: dict[Any, dict[str, int]] = {}
+
+        self.admitted_count: int = 0
+        self.max_queue_depth: int = 0
+        self.total_wait_time: float = 0.0
+        self.max_wait_time: float = 0.0
+
+    def pipeline_demand(self, pipeline: Any) -> dict[str, int]:
+        """
+        Work out the slots a pipeline needs, clamped to the declared capacity.
+
+        Args:
+            pipeline: Pipeline to inspect
+
+        Returns:
+            Mapping of resource kind to slot count
+        """
+        get_demand = getattr(pipeline, "get_resource_demand", None)
+        return self.pool.clamp(get_demand() if get_demand else {})
+
+    def enqueue(self, pipeline: Any) -> None:
+        """
+        Queue a pipeline for admission.
+
+        Args:
+            pipeline: Pipeline waiting to start
+        """
+        root, priority, depth, weight = lineage_of(pipeline)
+        self.pending.push(
+            (pipeline, self.pipeline_demand(pipeline), time.monotonic()),
+            root,
+            priority,
+            depth,
+            weight,
+            usage=self.pool.share(root),
+        )
+
+    def admit(self) -> list[Any]:
+        """
+        Admit queued pipelines, in order, while they fit.
+
+        Returns:
+            Pipelines that may start now
+        """
+        admitted: list[Any] = []
+        now = time.monotonic()
+
+        while self.pending and self.pool.fits(self.pending.peek()[1]):
+            pipeline, demand, enqueued_at = self.pending.pop()
+
+            root = lineage_of(pipeline)[0]
+            self.pool.acquire(root, demand)
+            self.pending.set_usage(root, self.pool.share(root))
+            self.running[pipeline] = demand
+
+            wait = now - enqueued_at
+            self.total_wait_time += wait
+            self.max_wait_time = max(self.max_wait_time, wait)
+            self.admitted_count += 1
+            admitted.append(pipeline)
+
+        # Only pipelines left behind count as queued
+        self.max_queue_depth = max(self.max_queue_depth, len(self.pending))
+        return admitted
+
+    def release(self, pipeline: Any) -> bool:
+        """
+        Return the slots held by a finished pipeline.
+
+        Args:
+            pipeline: Pipeline that completed or was killed
+
+        Returns:
+            True if the pipeline was holding slots, False otherwise
+        """
+        demand = self.running.pop(pipeline, None)
+        if demand is None:
+            return False
+
+        root = lineage_of(pipeline)[0]
+        self.pool.release(root, demand)
+        self.pending.set_usage(root, self.pool.share(root))
+        return True
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Snapshot of admission metrics.
+
+        Returns:
+            Queue depth, slot usage and wait time statistics
+        """
+        return {
+            "queue_depth": len(self.pending),
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": len(self.running),
+            "admitted": self.admitted_count,
+            "gpus_in_use": self.pool.in_use["gpus"],
+            "cpus_in_use": self.pool.in_use["cpus"],
+            "total_wait_time": self.total_wait_time,
+            "max_wait_time": self.max_wait_time,
+            "mean_wait_time": (
+                self.total_wait_time / self.admitted_count
+                if self.admitted_count
+                else 0.0
+            ),
+        }
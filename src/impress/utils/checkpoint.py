@@ -0,0 +1,326 @@
+import pickle
+import sqlite3
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipelines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    parent_id INTEGER,
+    root_id INTEGER,
+    generation INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    share REAL NOT NULL,
+    setup BLOB NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    pipeline_id INTEGER NOT NULL,
+    step_index INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    result BLOB,
+    snapshot BLOB,
+    PRIMARY KEY (pipeline_id, step_index)
+);
+"""
+
+# Pipeline statuses that are never resumed (failed pipelines are retried)
+FINISHED_STATUSES = ("completed", "killed")
+
+SETUP_FIELDS = (
+    "name",
+    "type",
+    "config",
+    "adaptive_fn",
+    "adaptive_fn_batch",
+    "kwargs",
+    "priority",
+    "share",
+    "spawn_reason",
+)
+
+
+class CheckpointStore:
+    """
+    SQLite journal of pipeline setups, lineage and completed steps.
+
+    Each pipeline row holds the pickled fields of the PipelineSetup it was
+    built from plus its lineage. Each step row holds the result of a completed
+    task or adaptive step and a snapshot of the pipeline attributes right
+    after it, so a resumed pipeline can replay its ``run()`` without
+    resubmitting finished work. A closed store reconnects on next use.
+
+    Writes are committed in order by a background writer thread, keeping
+    SQLite commits off the event loop. Values are pickled by the caller, so
+    they are captured as they are at the time of the call. Reads wait for
+    pending writes first. Steps still queued when the process dies are
+    simply run again on resume.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (or create) a checkpoint store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path: str = path
+        self._conn: Optional[sqlite3.Connection] = self._connect()
+        self._depth: int = 0
+        # Statements of the open transaction, written together when it ends
+        self._batch: list[tuple[str, tuple[Any, ...]]] = []
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._error: Optional[BaseException] = None
+        # Ids are handed out here so add_pipeline need not wait for its insert
+        self._next_id: int = (
+            self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM pipelines").fetchone()[
+                0
+            ]
+            + 1
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The database connection (reopened if the store was closed)."""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> None:
+        """Queue a write, as part of the open transaction if there is one."""
+        self._batch.append((sql, params))
+        if self._depth == 0:
+            self._submit()
+
+    def _submit(self) -> None:
+        """Hand the queued writes to the writer thread as one transaction."""
+        statements, self._batch = self._batch, []
+        if not statements:
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="impress-checkpoint"
+            )
+        self._writer.submit(self._write, statements)
+
+    def _write(self, statements: list[tuple[str, tuple[Any, ...]]]) -> None:
+        """Commit a batch of statements (writer thread)."""
+        try:
+            with self.conn:
+                for sql, params in statements:
+                    self.conn.execute(sql, params)
+        except Exception as e:
+            self._error = self._error or e
+
+    def flush(self) -> None:
+        """
+        Block until every write submitted so far is committed.
+
+        Raises:
+            sqlite3.Error: If a background write failed
+        """
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Commit every write made inside the block together, or none of them.
+
+        Blocks may nest; only the outermost one commits.
+        """
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._depth == 1:
+                self._batch.clear()
+            raise
+        finally:
+            self._depth -= 1
+        if self._depth == 0:
+            self._submit()
+
+    def reset(self) -> None:
+        """Drop every record, e.g. when a new campaign starts."""
+        with self.transaction():
+            self._execute("DELETE FROM steps")
+            self._execute("DELETE FROM pipelines")
+
+    def add_pipeline(
+        self,
+        setup: Any,
+        parent_id: Optional[int],
+        root_id: Optional[int],
+        generation: int,
+        priority: int,
+        share: float,
+    ) -> int:
+        """
+        Record a newly submitted pipeline.
+
+        Args:
+            setup: PipelineSetup the pipeline was built from
+            parent_id: Checkpoint id of the parent pipeline (None for roots)
+            root_id: Checkpoint id of the root campaign (None for roots)
+            generation: Generation depth
+            priority: Effective scheduling priority
+            share: Fair-share weight of the root campaign
+
+        Returns:
+            Checkpoint id of the pipeline
+        """
+        fields = {field: getattr(setup, field) for field in SETUP_FIELDS}
+        pipeline_id = self._next_id
+        self._next_id += 1
+        self._execute(
+            "INSERT INTO pipelines (id, name, parent_id, root_id, generation, "
+            "priority, share, setup, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                pipeline_id,
+                setup.name,
+                parent_id,
+                root_id or pipeline_id,
+                generation,
+                priority,
+                share,
+                pickle.dumps(fields),
+                "pending",
+            ),
+        )
+        return pipeline_id
+
+    def set_status(self, pipeline_id: int, status: str) -> None:
+        """
+        Update the status of a pipeline.
+
+        Args:
+            pipeline_id: Checkpoint id of the pipeline
+            status: One of ``pending``, ``running``, ``completed``, ``killed``,
+            ``failed``
+        """
+        self._execute(
+            "UPDATE pipelines SET status = ? WHERE id = ?", (status, pipeline_id)
+        )
+
+    def record_step(
+        self,
+        pipeline_id: int,
+        step_index: int,
+        kind: str,
+        name: str,
+        result: Any,
+        snapshot: dict[str, Any],
+    ) -> None:
+        """
+        Record a completed step.
+
+        Args:
+            pipeline_id: Checkpoint id of the pipeline
+            step_index: Position of the step in the pipeline's call order
+            kind: ``task`` or ``adaptive``
+            name: Task name
+            result: Return value of the step (must be picklable to be replayed)
+            snapshot: Pipeline attributes right after the step
+        """
+        try:
+            result_blob: Optional[bytes] = pickle.dumps(result)
+        except Exception:
+            result_blob = None
+
+        self._execute(
+            "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                pipeline_id,
+                step_index,
+                kind,
+                name,
+                result_blob,
+                pickle.dumps(snapshot),
+            ),
+        )
+
+    def unfinished_pipelines(self) -> list[dict[str, Any]]:
+        """
+        Load every pipeline that has not finished, with its completed steps.
+
+        Returns:
+            Records with ``id``, ``name``, ``parent_id``, ``root_id``,
+            ``generation``, ``priority``, ``share``, ``setup`` (dict of
+            PipelineSetup fields) and ``steps`` (step index mapped to
+            ``(kind, name, result, snapshot)``). Steps whose result could not
+            be pickled are left out and will run again.
+        """
+        self.flush()
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        rows = self.conn.execute(
+            "SELECT id, name, parent_id, root_id, generation, priority, share, "
+            f"setup FROM pipelines WHERE status NOT IN ({placeholders}) ORDER BY id",
+            FINISHED_STATUSES,
+        ).fetchall()
+
+        records: list[dict[str, Any]] = []
+        for row in rows:
+            steps: dict[int, tuple[str, str, Any, dict[str, Any]]] = {}
+            for index, kind, name, result, snapshot in self.conn.execute(
+                "SELECT step_index, kind, name, result, snapshot FROM steps "
+                "WHERE pipeline_id = ? AND result IS NOT NULL ORDER BY step_index",
+                (row[0],),
+            ):
+                steps[index] = (
+                    kind,
+                    name,
+                    pickle.loads(result),
+                    pickle.loads(snapshot),
+                )
+
+            records.append(
+                {
+                    "id": row[0],
+                    "name": row[1],
+                    "parent_id": row[2],
+                    "root_id": row[3],
+                    "generation": row[4],
+                    "priority": row[5],
+                    "share": row[6],
+                    "setup": pickle.loads(row[7]),
+                    "steps": steps,
+                }
+            )
+        return records
+
+    def has_unfinished(self) -> bool:
+        """Whether any recorded pipeline still has to be resumed."""
+        self.flush()
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        row = self.conn.execute(
+            f"SELECT 1 FROM pipelines WHERE status NOT IN ({placeholders}) LIMIT 1",
+            FINISHED_STATUSES,
+        ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        """Commit pending writes, stop the writer and close the connection."""
+        try:
+            self.flush()
+        finally:
+            if self._writer is not None:
+                self._writer.shutdown()
+                self._writer = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
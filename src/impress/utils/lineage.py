@@ -0,0 +1,292 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import unquote, urlsplit
+
+# Pipeline statuses in lifecycle order
+STATUSES = ("queued", "running", "completed", "failed", "killed")
+
+
+class LineageNode:
+    """One pipeline of the lineage graph, kept as plain data."""
+
+    __slots__ = (
+        "key",
+        "name",
+        "parent",
+        "children",
+        "generation",
+        "spawn_reason",
+        "start_step",
+        "step",
+        "step_index",
+        "tasks",
+        "adaptive_steps",
+        "status",
+        "submitted_at",
+        "started_at",
+        "finished_at",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        parent: Optional[str],
+        generation: int,
+        spawn_reason: Optional[str],
+        start_step: Any,
+    ) -> None:
+        self.key: str = key
+        self.name: str = name
+        self.parent: Optional[str] = parent
+        self.children: list[str] = []
+        self.generation: int = generation
+        self.spawn_reason: Optional[str] = spawn_reason
+        self.start_step: Any = start_step
+        self.step: Optional[str] = None
+        self.step_index: int = 0
+        self.tasks: int = 0
+        self.adaptive_steps: int = 0
+        self.status: str = "queued"
+        self.submitted_at: float = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready copy of the node."""
+        node = {slot: getattr(self, slot) for slot in self.__slots__}
+        node["children"] = list(self.children)
+        if not isinstance(self.start_step, (str, int, float, bool, type(None))):
+            node["start_step"] = repr(self.start_step)
+        return node
+
+
+class LineageGraph:
+    """
+    In-memory DAG of every pipeline the manager submitted.
+
+    Nodes are keyed by pipeline name (a repeated name gets a ``#n`` suffix)
+    and record the parent, children, spawn reason, start step and the step
+    the pipeline is currently at, so a fan-out campaign can be inspected
+    while it runs.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, LineageNode] = {}
+        self.roots: list[str] = []
+
+    def add(
+        self,
+        name: str,
+        parent: Optional[str] = None,
+        generation: int = 0,
+        spawn_reason: Optional[str] = None,
+        start_step: Any = None,
+    ) -> str:
+        """
+        Record a newly submitted pipeline.
+
+        Args:
+            name: Pipeline name
+            parent: Key of the parent node (None for roots)
+            generation: Generation depth
+            spawn_reason: Why the parent spawned it
+            start_step: Step the pipeline starts at, if it skips earlier ones
+
+        Returns:
+            Key of the new node
+        """
+        key = name
+        suffix = 1
+        while key in self.nodes:
+            suffix += 1
+            key = f"{name}#{suffix}"
+
+        parent = parent if parent in self.nodes else None
+        self.nodes[key] = LineageNode(
+            key, name, parent, generation, spawn_reason, start_step
+        )
+        if parent is None:
+            self.roots.append(key)
+        else:
+            self.nodes[parent].children.append(key)
+        return key
+
+    def started(self, key: Optional[str]) -> None:
+        """Mark a pipeline as running."""
+        node = self.nodes.get(key)
+        if node is not None:
+            node.status = "running"
+            node.started_at = time.time()
+
+    def step(self, key: Optional[str], name: str, index: int) -> None:
+        """
+        Record the step a pipeline just reached.
+
+        Args:
+            key: Node key
+            name: Task name, or ``adaptive``
+            index: Step index in the pipeline's call order
+        """
+        node = self.nodes.get(key)
+        if node is None:
+            return
+        node.step = name
+        node.step_index = max(node.step_index, index)
+        if name == "adaptive":
+            node.adaptive_steps += 1
+        else:
+            node.tasks += 1
+
+    def finished(self, key: Optional[str], status: str) -> None:
+        """Mark a pipeline as retired with its final status."""
+        node = self.nodes.get(key)
+        if node is not None:
+            node.status = status
+            node.finished_at = time.time()
+
+    def ancestors(self, key: str) -> list[str]:
+        """Keys from the parent of a node up to its root."""
+        chain = []
+        parent = self.nodes[key].parent
+        while parent is not None:
+            chain.append(parent)
+            parent = self.nodes[parent].parent
+        return chain
+
+    def descendants(self, key: str) -> list[str]:
+        """Keys of every node below a node, breadth first."""
+        found = []
+        frontier = list(self.nodes[key].children)
+        while frontier:
+            found.extend(frontier)
+            frontier = [c for k in frontier for c in self.nodes[k].children]
+        return found
+
+    def snapshot(self, root: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """
+        JSON-ready view of the graph or of one subtree.
+
+        Args:
+            root: Only include this node and its descendants
+
+        Returns:
+            ``time``, ``counts`` per status, ``roots`` and ``pipelines`` (key
+            to node), or None if ``root`` is unknown
+        """
+        if root is None:
+            keys = list(self.nodes)
+            roots = list(self.roots)
+        elif root in self.nodes:
+            keys = [root, *self.descendants(root)]
+            roots = [root]
+        else:
+            return None
+
+        counts = dict.fromkeys(STATUSES, 0)
+        pipelines = {}
+        for key in keys:
+            node = self.nodes[key]
+            counts[node.status] = counts.get(node.status, 0) + 1
+            pipelines[key] = node.to_dict()
+        return {
+            "time": time.time(),
+            "counts": counts,
+            "roots": roots,
+            "pipelines": pipelines,
+        }
+
+
+class LineageServer:
+    """
+    Read-only HTTP endpoint serving lineage snapshots as JSON.
+
+    Listens on ``host:port`` or on a unix socket (``unix:/path``) and runs on
+    the manager's event loop. ``GET /lineage`` returns the whole graph and
+    ``GET /lineage/<name>`` the subtree below one pipeline; the JSON is
+    encoded on a worker thread.
+    """
+
+    def __init__(
+        self, snapshot: Callable[[Optional[str]], Optional[dict]], address: str
+    ) -> None:
+        """
+        Initialize the LineageServer.
+
+        Args:
+            snapshot: Called with a node key (or None) to build a response
+            address: ``host:port`` (port 0 picks a free one) or ``unix:/path``
+        """
+        self.snapshot = snapshot
+        self.address: str = address
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        """
+        Start listening.
+
+        Returns:
+            The bound address (with the real port for TCP)
+        """
+        if self.address.startswith("unix:"):
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=self.address[len("unix:") :]
+            )
+            return self.address
+
+        host, _, port = self.address.rpartition(":")
+        self._server = await asyncio.start_server(
+            self._handle, host or "127.0.0.1", int(port)
+        )
+        bound_host, bound_port = self._server.sockets[0].getsockname()[:2]
+        self.address = f"{bound_host}:{bound_port}"
+        return self.address
+
+    async def stop(self) -> None:
+        """Stop listening and close the socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer one HTTP request and close the connection."""
+        try:
+            request = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass  # headers are not used
+
+            status, body = self._route(request)
+            payload = (await asyncio.to_thread(json.dumps, body)).encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, request: list[str]) -> tuple[str, Any]:
+        """Status line and JSON body for a request line."""
+        if len(request) < 2 or request[0] != "GET":
+            return "405 Method Not Allowed", {"error": "only GET is supported"}
+
+        path = urlsplit(request[1]).path.rstrip("/")
+        if path in ("", "/lineage"):
+            return "200 OK", self.snapshot(None)
+        if path.startswith("/lineage/"):
+            key = unquote(path[len("/lineage/") :])
+            body = self.snapshot(key)
+            if body is None:
+                return "404 Not Found", {"error": f"unknown pipeline {key!r}"}
+            return "200 OK", body
+        return "404 Not Found", {"error": f"unknown path {path!r}"}
@@ -1,5 +1,12 @@
+import atexit
+import json
+import os
+import queue
+import re
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
 
 
@@ -32,45 +39,372 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
+    # Members are singletons, so identity hashing is exact and keeps the
+    # per-record LEVEL_ORDER lookups out of Enum.__hash__
+    __hash__ = object.__hash__
+
+
+LEVEL_ORDER = {
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+    LogLevel.CRITICAL: 50,
+}
+
+
+class LogWriter:
+    """
+    Background thread that formats and writes log records in batches.
+
+    Loggers enqueue records without formatting them; the writer formats each
+    batch, writes it and flushes every stream once per batch (at most every
+    ``flush_interval`` seconds), keeping timestamps, string building and
+    small writes off the event loop. ``flush`` and ``close`` end the current
+    batch early instead of waiting out the interval.
+    """
+
+    def __init__(self, flush_interval=0.1, max_batch=1024):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def submit(self, logger, to_stderr, record):
+        """
+        Enqueue a record.
+
+        Args:
+            logger: Logger that formats the record
+            to_stderr: Whether to write to stderr instead of the logger's stream
+            record: Preformatted line, or ``_format_message`` arguments
+        """
+        if self._thread is None:
+            self._start()
+        self._queue.put((logger, to_stderr, record))
+
+    def flush(self, timeout=5.0):
+        """Block until every record enqueued so far is written."""
+        if self._thread is None:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        self._wake.set()
+        written.wait(timeout)
+
+    def close(self):
+        """Write the remaining records and stop the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._wake.set()
+        self._thread.join(5.0)
+        self._thread = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="impress-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        backlog = False
+        while True:
+            batch = [self._queue.get()]
+            if isinstance(batch[0], tuple) and not backlog:
+                # Let the batch fill up without waking for every record;
+                # flush() and close() cut the wait short
+                self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            while len(batch) < self.max_batch and isinstance(batch[-1], tuple):
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            backlog = len(batch) == self.max_batch
+
+            self._write(batch)
+            if batch[-1] is None:
+                return
+
+    @staticmethod
+    def _write(batch):
+        outputs = {}
+        for item in batch:
+            if item is None:
+                continue
+            if isinstance(item, threading.Event):
+                for output in outputs.values():
+                    _flush(output)
+                outputs.clear()
+                item.set()
+                continue
+
+            logger, to_stderr, record = item
+            for output in logger._write_record(record, to_stderr):
+                outputs[id(output)] = output
+
+        for output in outputs.values():
+            _flush(output)
+
+
+def _clock(created):
+    """``HH:MM:SS.mmm`` of a Unix time, reusing the last second's text."""
+    global _last_second
+    second = int(created)
+    cached = _last_second
+    if cached[0] != second:
+        cached = _last_second = (
+            second,
+            time.strftime("%H:%M:%S", time.localtime(second)),
+        )
+    return f"{cached[1]}.{int((created - second) * 1000):03d}"
+
+
+_last_second = (None, "")
+
+
+def _flush(stream):
+    try:
+        stream.flush()
+    except (OSError, ValueError):
+        pass
+
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+_UNSAFE_FILENAME = re.compile(r"[^\w.-]")
+
+
+class JsonLinesSink:
+    """
+    Structured JSON-lines log output, optionally one file per pipeline.
+
+    Every record is one JSON object with ``ts`` (Unix time), ``level``,
+    ``component``, ``pipeline``, ``event``, ``step``, ``duration`` and
+    ``message`` keys (absent values are null). Files are rotated when they
+    would exceed ``max_bytes``: ``x.jsonl`` becomes ``x.jsonl.1``, and so on up to
+    ``backup_count``. Records are buffered and written per file on
+    ``flush``, which the background ``LogWriter`` calls once per batch.
+    """
+
+    def __init__(
+        self,
+        path,
+        per_pipeline=False,
+        max_bytes=64 * 2**20,
+        backup_count=3,
+        level=LogLevel.DEBUG,
+        max_open_files=256,
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            path: Log file, or the directory of per-pipeline files (with
+                ``manager.jsonl`` for records without a pipeline)
+            per_pipeline: Write one file per pipeline
+            max_bytes: Rotate a file before it would grow past this size
+                (0: never)
+            backup_count: Rotated files kept per log file
+            level: Minimum level of recorded messages, independent of the
+                console level
+            max_open_files: Least recently written files beyond this count are
+                closed (and reopened on demand)
+        """
+        self.path = path
+        self.per_pipeline = per_pipeline
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.level = LogLevel(level)
+        self.max_open_files = max_open_files
+        self._files = OrderedDict()  # path -> [file, size]
+        self._pending = {}  # path -> lines written since the last flush
+        self._lock = threading.Lock()
+
+        if per_pipeline:
+            os.makedirs(path, exist_ok=True)
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def accepts(self, level):
+        """Whether messages of ``level`` are recorded."""
+        return LEVEL_ORDER[level] >= LEVEL_ORDER[self.level]
+
+    def _target(self, pipeline):
+        if not self.per_pipeline:
+            return self.path
+        name = _UNSAFE_FILENAME.sub("_", pipeline) if pipeline else "manager"
+        return os.path.join(self.path, f"{name}.jsonl")
+
+    def write(self, created, level, component, message, pipeline=None, **fields):
+        """
+        Buffer a record until the next ``flush``.
+
+        Returns:
+            The sink itself (to be flushed by the caller)
+        """
+        if component.lower().startswith("pipeline-"):
+            component = "pipeline"
+        entry = {
+            "ts": created,
+            "level": level.value,
+            "component": component.lower(),
+            "pipeline": pipeline,
+            "event": fields.pop("event", None),
+            "step": fields.pop("step", None),
+            "duration": fields.pop("duration", None),
+            "message": _ANSI_ESCAPE.sub("", message),
+            **fields,
+        }
+        line = json.dumps(entry, default=str) + "\n"
+
+        with self._lock:
+            self._pending.setdefault(self._target(pipeline), []).append(line)
+        return self
+
+    def flush(self):
+        """Write the pending records, grouped per file."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for path, lines in pending.items():
+                handle = self._open(path)
+                chunk = []
+                for line in lines:
+                    if (
+                        self.max_bytes
+                        and handle[1]
+                        and handle[1] + len(line) > self.max_bytes
+                    ):
+                        handle[0].write("".join(chunk))
+                        chunk = []
+                        self._rotate(path)
+                        handle = self._open(path)
+                    chunk.append(line)
+                    handle[1] += len(line)
+                handle[0].write("".join(chunk))
+                handle[0].flush()
+
+    def _open(self, path):
+        handle = self._files.get(path)
+        if handle is not None:
+            self._files.move_to_end(path)
+            return handle
+
+        while len(self._files) >= self.max_open_files:
+            _, (old, _) = self._files.popitem(last=False)
+            old.close()
+        f = open(path, "a", encoding="utf-8")
+        handle = self._files[path] = [f, f.tell()]
+        return handle
+
+    def _rotate(self, path):
+        f, _ = self._files.pop(path)
+        f.close()
+        if self.backup_count:
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{path}.{index}"):
+                    os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            for f, _ in self._files.values():
+                f.close()
+            self._files.clear()
+
+
+_default_writer = LogWriter()
+atexit.register(_default_writer.close)
+
 
 class ImpressLogger:
-    def __init__(self, name="ImpressManager", use_colors=True, output_stream=None):
+    """
+    Colored, leveled logger of the manager and its pipelines.
+
+    Messages below ``level`` are dropped before any formatting. By default
+    records go through a shared background ``LogWriter``; pass
+    ``asynchronous=False`` to write and flush every line in the caller.
+    With a ``rate_limit``, identical messages repeated more than that many
+    times within ``rate_window`` seconds are suppressed. The number of
+    suppressed repeats is appended to the next one that gets through, or
+    reported by ``flush()``. Rate limiting is off by default.
+
+    With a ``sink`` every record is also written as structured JSON;
+    ``console=False`` then keeps the run off stdout.
+    """
+
+    # Shared by every logger; assign on an instance to override
+    level_colors = {
+        LogLevel.DEBUG: Colors.BRIGHT_BLACK,
+        LogLevel.INFO: Colors.BRIGHT_CYAN,
+        LogLevel.WARNING: Colors.BRIGHT_YELLOW,
+        LogLevel.ERROR: Colors.BRIGHT_RED,
+        LogLevel.CRITICAL: Colors.RED + Colors.BOLD,
+    }
+
+    component_colors = {
+        "pipeline": Colors.BRIGHT_GREEN,
+        "adaptive": Colors.BRIGHT_MAGENTA,
+        "manager": Colors.BRIGHT_BLUE,
+        "workflow": Colors.CYAN,
+        "task": Colors.YELLOW,
+        "error": Colors.RED,
+        "success": Colors.GREEN,
+        "stage": Colors.BRIGHT_CYAN,
+        "step": Colors.CYAN,
+        "resource": Colors.MAGENTA,
+        "data": Colors.BRIGHT_YELLOW,
+        "validation": Colors.BRIGHT_MAGENTA,
+        "checkpoint": Colors.BRIGHT_GREEN,
+        "metric": Colors.BRIGHT_WHITE,
+    }
+
+    def __init__(
+        self,
+        name="ImpressManager",
+        use_colors=True,
+        output_stream=None,
+        level=LogLevel.INFO,
+        asynchronous=True,
+        writer=None,
+        rate_limit=None,
+        rate_window=10.0,
+        sink=None,
+        console=True,
+    ):
         self.name = name
         self.use_colors = use_colors
         self.output_stream = output_stream or sys.stdout
-
-        self.level_colors = {
-            LogLevel.DEBUG: Colors.BRIGHT_BLACK,
-            LogLevel.INFO: Colors.BRIGHT_CYAN,
-            LogLevel.WARNING: Colors.BRIGHT_YELLOW,
-            LogLevel.ERROR: Colors.BRIGHT_RED,
-            LogLevel.CRITICAL: Colors.RED + Colors.BOLD,
-        }
-
-        self.component_colors = {
-            "pipeline": Colors.BRIGHT_GREEN,
-            "adaptive": Colors.BRIGHT_MAGENTA,
-            "manager": Colors.BRIGHT_BLUE,
-            "workflow": Colors.CYAN,
-            "task": Colors.YELLOW,
-            "error": Colors.RED,
-            "success": Colors.GREEN,
-            "stage": Colors.BRIGHT_CYAN,
-            "step": Colors.CYAN,
-            "resource": Colors.MAGENTA,
-            "data": Colors.BRIGHT_YELLOW,
-            "validation": Colors.BRIGHT_MAGENTA,
-            "checkpoint": Colors.BRIGHT_GREEN,
-            "metric": Colors.BRIGHT_WHITE,
-        }
+        self.level = LogLevel(level)
+        self.writer = (writer or _default_writer) if asynchronous else None
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.sink = sink
+        self.console = console
+        # message key -> [window start, count in window, suppressed]
+        self._recent = {}
 
     def _colorize(self, text, color):
         return f"{color}{text}{Colors.RESET}" if self.use_colors else text
 
-    def _format_message(self, level, component, message, pipeline_name=None):
-        timestamp = self._colorize(
-            datetime.now().strftime("%H:%M:%S.%f")[:-3], Colors.DIM
-        )
+    def is_enabled(self, level):
+        """Whether messages of ``level`` reach the console or the sink."""
+        if self.console and LEVEL_ORDER[level] >= LEVEL_ORDER[self.level]:
+            return True
+        return self.sink is not None and self.sink.accepts(level)
+
+    def _format_message(
+        self, level, component, message, pipeline_name=None, created=None
+    ):
+        created = time.time() if created is None else created
+        timestamp = self._colorize(_clock(created), Colors.DIM)
         level_color = self.level_colors.get(level, Colors.WHITE)
         colored_level = self._colorize(f"[{level.value}]", level_color)
 
@@ -91,86 +425,326 @@ class ImpressLogger:
             f"{timestamp} {colored_level} {colored_component}{pipeline_part} {message}"
         )
 
+    def _throttled(self, key):
+        """
+        Count a message against the rate limit.
+
+        Returns:
+            None to drop the message, otherwise the number of repeats
+            suppressed since it last got through
+        """
+        if not self.rate_limit:
+            return 0
+
+        now = time.monotonic()
+        entry = self._recent.get(key)
+        if entry is None or now - entry[0] > self.rate_window:
+            suppressed = entry[2] if entry is not None else 0
+            if len(self._recent) >= 4096:
+                self._recent.clear()
+            self._recent[key] = [now, 1, 0]
+            return suppressed
+        entry[1] += 1
+        if entry[1] > self.rate_limit:
+            entry[2] += 1
+            return None
+        return 0
+
+    def _log(
+        self,
+        level,
+        component,
+        message,
+        pipeline_name=None,
+        to_stderr=False,
+        **fields,
+    ):
+        if not self.is_enabled(level):
+            return
+        suppressed = self._throttled((level, component, message, pipeline_name))
+        if suppressed is None:
+            return
+        if suppressed:
+            message = f"{message} ({suppressed} repeats suppressed)"
+        self._emit(level, component, message, pipeline_name, to_stderr, fields)
+
+    def _emit(self, level, component, message, pipeline_name, to_stderr, fields):
+        record = (level, component, message, pipeline_name, time.time(), fields)
+        if self.writer is not None:
+            self.writer.submit(self, to_stderr, record)
+        else:
+            for output in self._write_record(record, to_stderr):
+                _flush(output)
+
+    def _write_record(self, record, to_stderr=False):
+        """
+        Write a record to the console and the sink.
+
+        Args:
+            record: Preformatted console line, or a record built by ``_log``
+            to_stderr: Whether console output goes to stderr
+
+        Returns:
+            Outputs written to, to be flushed by the caller
+        """
+        outputs = []
+        if isinstance(record, str):
+            line, level = record, None
+        else:
+            level, component, message, pipeline_name, created, fields = record
+            line = None
+            if self.console and LEVEL_ORDER[level] >= LEVEL_ORDER[self.level]:
+                line = self._format_message(
+                    level, component, message, pipeline_name, created
+                )
+
+        if line is not None and self.console:
+            stream = sys.stderr if to_stderr else self.output_stream
+            try:
+                stream.write(line + "\n")
+                outputs.append(stream)
+            except (OSError, ValueError):
+                # Stream closed underneath us (e.g. at interpreter exit)
+                pass
+
+        if level is not None and self.sink is not None and self.sink.accepts(level):
+            pipeline = fields.pop("pipeline", None) or pipeline_name
+            if pipeline is None and component.lower().startswith("pipeline-"):
+                pipeline = self.name
+            outputs.append(
+                self.sink.write(created, level, component, message, pipeline, **fields)
+            )
+        return outputs
+
     def _write_log(self, message, to_stderr=False):
-        stream = sys.stderr if to_stderr else self.output_stream
-        stream.write(message + "\n")
-        stream.flush()
+        if self.writer is not None:
+            self.writer.submit(self, to_stderr, message)
+        else:
+            for output in self._write_record(message, to_stderr):
+                _flush(output)
 
-    def debug(self, message, component="manager", pipeline_name=None):
-        formatted = self._format_message(
-            LogLevel.DEBUG, component, message, pipeline_name
-        )
-        self._write_log(formatted)
+    def _report_suppressed(self):
+        """Log the repeats the rate limit is still holding back."""
+        for key, entry in self._recent.items():
+            if entry[2]:
+                level, component, message, pipeline_name = key
+                message = f"{message} ({entry[2]} repeats suppressed)"
+                entry[2] = 0
+                to_stderr = level in (LogLevel.ERROR, LogLevel.CRITICAL)
+                self._emit(level, component, message, pipeline_name, to_stderr, {})
 
-    def info(self, message, component="manager", pipeline_name=None):
-        formatted = self._format_message(
-            LogLevel.INFO, component, message, pipeline_name
-        )
-        self._write_log(formatted)
+    def flush(self):
+        """
+        Block until every message logged so far is written.
 
-    def warning(self, message, component="manager", pipeline_name=None):
-        formatted = self._format_message(
-            LogLevel.WARNING, component, message, pipeline_name
-        )
-        self._write_log(formatted)
+        Repeats suppressed by the rate limit are reported first.
+        """
+        self._report_suppressed()
+        if self.writer is not None:
+            self.writer.flush()
 
-    def error(self, message, component="manager", pipeline_name=None):
-        formatted = self._format_message(
-            LogLevel.ERROR, component, message, pipeline_name
-        )
-        self._write_log(formatted, to_stderr=True)
+    def debug(self, message, component="manager", pipeline_name=None, **fields):
+        self._log(LogLevel.DEBUG, component, message, pipeline_name, **fields)
 
-    def critical(self, message, component="manager", pipeline_name=None):
-        formatted = self._format_message(
-            LogLevel.CRITICAL, component, message, pipeline_name
-        )
-        self._write_log(formatted, to_stderr=True)
+    def info(self, message, component="manager", pipeline_name=None, **fields):
+        self._log(LogLevel.INFO, component, message, pipeline_name, **fields)
+
+    def warning(self, message, component="manager", pipeline_name=None, **fields):
+        self._log(LogLevel.WARNING, component, message, pipeline_name, **fields)
+
+    def error(self, message, component="manager", pipeline_name=None, **fields):
+        self._log(LogLevel.ERROR, component, message, pipeline_name, True, **fields)
+
+    def critical(self, message, component="manager", pipeline_name=None, **fields):
+        self._log(LogLevel.CRITICAL, component, message, pipeline_name, True, **fields)
 
     def pipeline_started(self, pipeline_name):
+        if not self.is_enabled(LogLevel.INFO):
+            return
         colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
         message = f"Pipeline started: {colored_name}"
-        self.info(message, "manager")
-
-    def pipeline_completed(self, pipeline_name):
+        self.info(message, "manager", event="pipeline_started", pipeline=pipeline_name)
+
+    def pipelines_queued(self, queue_depth):
+        if not self.is_enabled(LogLevel.DEBUG):
+            return
+        colored_depth = self._colorize(str(queue_depth), Colors.BRIGHT_YELLOW)
+        message = f"{colored_depth} pipelines waiting for resources"
+        self.debug(message, "resource", event="pipelines_queued")
+
+    def pipeline_completed(self, pipeline_name, duration=None):
+        if not self.is_enabled(LogLevel.INFO):
+            return
         colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
         message = f"Pipeline completed: {colored_name}"
-        self.info(message, "manager")
+        self.info(
+            message,
+            "manager",
+            event="pipeline_completed",
+            pipeline=pipeline_name,
+            duration=duration,
+        )
 
     def pipeline_killed(self, pipeline_name):
         colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
         message = f"Pipeline killed: {colored_name}"
-        self.warning(message, "pipeline")
+        self.warning(
+            message, "pipeline", event="pipeline_killed", pipeline=pipeline_name
+        )
+
+    def tasks_cancelled(self, pipeline_name, task_count, gpu_seconds):
+        colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
+        message = (
+            f"Cancelled {task_count} in-flight tasks of {colored_name} "
+            f"(~{gpu_seconds:.0f} GPU-seconds reclaimed)"
+        )
+        self.warning(
+            message,
+            "pipeline",
+            event="tasks_cancelled",
+            pipeline=pipeline_name,
+            tasks=task_count,
+            gpu_seconds=gpu_seconds,
+        )
+
+    def finalize_failed(self, pipeline_name, error):
+        colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
+        message = f"finalize() of killed pipeline {colored_name} failed: {error}"
+        self.error(message, "pipeline", event="finalize_failed", pipeline=pipeline_name)
+
+    def reclaimed_summary(self, gpu_seconds):
+        colored_seconds = self._colorize(f"{gpu_seconds:.0f}", Colors.BRIGHT_GREEN)
+        message = f"Killed pipelines released ~{colored_seconds} GPU-seconds"
+        self.info(
+            message, "manager", event="reclaimed_summary", gpu_seconds=gpu_seconds
+        )
 
     def adaptive_started(self, pipeline_name):
+        if not self.is_enabled(LogLevel.INFO):
+            return
         colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
         message = f"Adaptive function started for: {colored_name}"
-        self.info(message, "adaptive")
+        self.info(message, "adaptive", event="adaptive_started", pipeline=pipeline_name)
 
-    def adaptive_completed(self, pipeline_name):
+    def adaptive_completed(self, pipeline_name, duration=None):
+        if not self.is_enabled(LogLevel.INFO):
+            return
         colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
         message = f"Adaptive function completed for: {colored_name}"
-        self.info(message, "adaptive")
+        self.info(
+            message,
+            "adaptive",
+            event="adaptive_completed",
+            pipeline=pipeline_name,
+            duration=duration,
+        )
+
+    def adaptive_batch_started(self, function_name, pipeline_count):
+        colored_name = self._colorize(function_name, Colors.BRIGHT_WHITE)
+        colored_count = self._colorize(str(pipeline_count), Colors.BRIGHT_WHITE)
+        message = (
+            f"Batched adaptive function {colored_name} started "
+            f"for {colored_count} pipelines"
+        )
+        self.info(message, "adaptive", event="adaptive_batch_started")
 
     def adaptive_failed(self, pipeline_name, error):
         colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
         message = f"Adaptive function failed for {colored_name}: {error}"
-        self.error(message, "adaptive")
+        self.error(message, "adaptive", event="adaptive_failed", pipeline=pipeline_name)
+
+    def adaptive_timed_out(self, pipeline_name, timeout):
+        colored_name = self._colorize(pipeline_name, Colors.BRIGHT_WHITE)
+        message = f"Adaptive function for {colored_name} timed out after {timeout}s"
+        self.error(
+            message,
+            "adaptive",
+            event="adaptive_timed_out",
+            pipeline=pipeline_name,
+            duration=timeout,
+        )
 
     def child_pipeline_submitted(self, child_name, parent_name):
+        if not self.is_enabled(LogLevel.INFO):
+            return
         colored_child = self._colorize(child_name, Colors.BRIGHT_WHITE)
         colored_parent = self._colorize(parent_name, Colors.BRIGHT_WHITE)
         message = f"Submitting child pipeline: {colored_child} from {colored_parent}"
-        self.info(message, "manager")
+        self.info(
+            message,
+            "manager",
+            event="child_submitted",
+            pipeline=child_name,
+            parent=parent_name,
+        )
 
     def manager_starting(self, pipeline_count):
         colored_count = self._colorize(str(pipeline_count), Colors.BRIGHT_WHITE)
         message = f"Starting with {colored_count} initial pipelines"
-        self.info(message, "manager")
+        self.info(message, "manager", event="manager_starting")
+
+    def manager_resuming(self, pipeline_count, step_count):
+        colored_count = self._colorize(str(pipeline_count), Colors.BRIGHT_WHITE)
+        colored_steps = self._colorize(str(step_count), Colors.BRIGHT_WHITE)
+        message = (
+            f"Resuming {colored_count} unfinished pipelines "
+            f"({colored_steps} completed steps to skip)"
+        )
+        self.info(message, "manager", event="manager_resuming")
+
+    def lineage_endpoint(self, address):
+        colored_address = self._colorize(address, Colors.BRIGHT_CYAN)
+        message = f"Serving pipeline lineage on {colored_address}"
+        self.info(message, "manager", event="lineage_endpoint")
+
+    def run_statistics(self, table):
+        self.info(f"Run statistics:\n{table}", "manager", event="run_statistics")
+
+    def loop_lag_summary(self, mean_lag_ms, max_lag_ms):
+        if not self.is_enabled(LogLevel.DEBUG):
+            return
+        colored_mean = self._colorize(f"{mean_lag_ms:.1f}", Colors.BRIGHT_WHITE)
+        colored_max = self._colorize(f"{max_lag_ms:.1f}", Colors.BRIGHT_YELLOW)
+        message = f"Event loop lag: mean {colored_mean} ms, max {colored_max} ms"
+        self.debug(message, "manager", event="loop_lag")
+
+    def task_cache_summary(self, hits, misses):
+        colored_hits = self._colorize(str(hits), Colors.BRIGHT_GREEN)
+        colored_misses = self._colorize(str(misses), Colors.BRIGHT_YELLOW)
+        message = f"Task cache: {colored_hits} hits, {colored_misses} misses"
+        self.info(message, "manager", event="task_cache")
+
+    def shards_starting(self, shard_count, pipeline_count):
+        colored_shards = self._colorize(str(shard_count), Colors.BRIGHT_WHITE)
+        colored_count = self._colorize(str(pipeline_count), Colors.BRIGHT_WHITE)
+        message = (
+            f"Starting {colored_count} initial pipelines "
+            f"on {colored_shards} shard managers"
+        )
+        self.info(message, "manager", event="shards_starting")
+
+    def shard_failed(self, shard, exitcode):
+        colored_shard = self._colorize(f"shard {shard}", Colors.BRIGHT_WHITE)
+        message = f"Manager {colored_shard} exited unexpectedly (code {exitcode})"
+        self.error(message, "manager", event="shard_failed")
+
+    def child_pipeline_dropped(self, child_name, error):
+        colored_child = self._colorize(child_name, Colors.BRIGHT_WHITE)
+        message = (
+            f"Child pipeline {colored_child} cannot be sent to the coordinator: {error}"
+        )
+        self.error(
+            message, "manager", event="child_pipeline_dropped", pipeline=child_name
+        )
 
     def manager_exiting(self):
-        self.info("All pipelines finished. Exiting.", "manager")
+        self.info(
+            "All pipelines finished. Exiting.", "manager", event="manager_exiting"
+        )
 
     def activity_summary(self, active_pipelines, active_adaptive, buffered_pipelines):
+        if not self.is_enabled(LogLevel.DEBUG):
+            return
         colored_pipelines = self._colorize(str(active_pipelines), Colors.BRIGHT_GREEN)
         colored_adaptive = self._colorize(str(active_adaptive), Colors.BRIGHT_MAGENTA)
         colored_buffered = self._colorize(str(buffered_pipelines), Colors.BRIGHT_YELLOW)
@@ -179,13 +753,44 @@ class ImpressLogger:
             f"{colored_adaptive} adaptive tasks, "
             f"{colored_buffered} buffered"
         )
-        self.debug(summary, "manager")
+        self.debug(summary, "manager", event="activity")
+
+    def task_finished(self, pipeline_name, task_name, duration, status):
+        if not self.is_enabled(LogLevel.DEBUG):
+            return
+        message = (
+            f"Task {task_name} of {pipeline_name} finished ({status}) "
+            f"in {duration:.3f}s"
+        )
+        self.debug(
+            message,
+            "task",
+            event="task_finished",
+            pipeline=pipeline_name,
+            step=task_name,
+            duration=duration,
+            status=status,
+        )
 
-    def pipeline_log(self, message, level=LogLevel.INFO):
+    def pipeline_log(self, message, level=LogLevel.INFO, **fields):
+        """
+        Log a pipeline message.
+
+        Args:
+            message: Message text
+            level: Log level
+            **fields: Structured fields for the JSON-lines sink, e.g.
+                ``event``, ``step`` and ``duration``
+        """
         pipeline_component = f"PIPELINE-{self.name.upper()}"
-        formatted = self._format_message(level, pipeline_component, message)
         stderr_levels = [LogLevel.ERROR, LogLevel.CRITICAL]
-        self._write_log(formatted, to_stderr=level in stderr_levels)
+        self._log(
+            level,
+            pipeline_component,
+            message,
+            to_stderr=level in stderr_levels,
+            **fields,
+        )
 
     def separator(self, title=None):
         if title:
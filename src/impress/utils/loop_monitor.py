@@ -0,0 +1,80 @@
+import asyncio
+from typing import Optional
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs scheduled callbacks.
+
+    A background task sleeps for ``interval`` seconds in a loop; whatever it
+    oversleeps by is time the loop spent blocked in synchronous code (CSV
+    parsing, file scans, blocking subprocesses, ...).
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Sampling period in seconds
+        """
+        self.interval: float = interval
+        self.samples: int = 0
+        self.total_lag: float = 0.0
+        self.max_lag: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._scheduled: Optional[float] = None
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        # A sample that is already overdue still counts
+        if self._scheduled is not None:
+            overdue = asyncio.get_running_loop().time() - self._scheduled
+            if overdue > 0:
+                self.record(overdue)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - self._scheduled))
+
+    def record(self, lag: float) -> None:
+        """
+        Add one lag sample.
+
+        Args:
+            lag: Delay in seconds
+        """
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Lag statistics.
+
+        Returns:
+            Dictionary with ``samples``, ``mean_lag_ms``, ``max_lag_ms`` and
+            ``total_lag_s``
+        """
+        return {
+            "samples": self.samples,
+            "mean_lag_ms": self.total_lag / self.samples * 1e3 if self.samples else 0.0,
+            "max_lag_ms": self.max_lag * 1e3,
+            "total_lag_s": self.total_lag,
+        }
@@ -0,0 +1,445 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, Optional
+
+RESOURCE_KINDS = ("gpus", "cpus")
+
+SCHEDULING_POLICIES = ("fair", "fifo")
+
+
+def task_demand(description: dict[str, Any]) -> dict[str, int]:
+    """
+    Slots a task asks for, derived from its ``task_description``.
+
+    Args:
+        description: Task description (``gpus_per_rank``, ``cores_per_rank``,
+        ``ranks``)
+
+    Returns:
+        Mapping of resource kind to slot count
+    """
+    ranks = description.get("ranks", 1)
+    return {
+        "gpus": description.get("gpus_per_rank", 0) * ranks,
+        "cpus": description.get("cores_per_rank", 1) * ranks,
+    }
+
+
+def lineage_of(pipeline: Any) -> tuple[Any, int, int, float]:
+    """
+    Scheduling attributes the manager attaches to a pipeline.
+
+    Args:
+        pipeline: Pipeline to inspect
+
+    Returns:
+        Tuple of (root pipeline, priority, generation depth, fair-share weight)
+    """
+    return (
+        getattr(pipeline, "_lineage_root", None) or pipeline,
+        getattr(pipeline, "_priority", 0),
+        getattr(pipeline, "_generation", 0),
+        getattr(pipeline, "_share", 1.0),
+    )
+
+
+class ResourcePool:
+    """
+    GPU/CPU slot accounting with per-lineage usage.
+
+    Usage of a lineage is its dominant share: the largest fraction of any
+    capped resource kind (or of the holder cap) it currently holds.
+    """
+
+    def __init__(
+        self,
+        gpus: Optional[int] = None,
+        cpus: Optional[int] = None,
+        max_holders: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the ResourcePool.
+
+        Args:
+            gpus: GPU slots (None means unlimited)
+            cpus: CPU slots (None means unlimited)
+            max_holders: Maximum number of concurrent holders (None means unlimited)
+        """
+        self.capacity: dict[str, Optional[int]] = {"gpus": gpus, "cpus": cpus}
+        self.in_use: dict[str, int] = {kind: 0 for kind in RESOURCE_KINDS}
+        self.max_holders: Optional[int] = max_holders
+        self.holders: int = 0
+        self._held: dict[Any, dict[str, int]] = {}
+
+    def clamp(self, demand: dict[str, int]) -> dict[str, int]:
+        """
+        Limit a demand to the pool capacity.
+
+        A demand larger than the pool would otherwise block its queue forever.
+
+        Args:
+            demand: Requested slots
+
+        Returns:
+            Demand that can be satisfied by an empty pool
+        """
+        clamped: dict[str, int] = {}
+        for kind in RESOURCE_KINDS:
+            need = int(demand.get(kind, 0))
+            capacity = self.capacity[kind]
+            clamped[kind] = min(need, capacity) if capacity is not None else need
+        return clamped
+
+    def fits(self, demand: dict[str, int]) -> bool:
+        """Whether a demand fits into the currently free slots."""
+        if self.max_holders is not None and self.holders >= self.max_holders:
+            return False
+
+        for kind in RESOURCE_KINDS:
+            capacity = self.capacity[kind]
+            if capacity is not None and self.in_use[kind] + demand[kind] > capacity:
+                return False
+        return True
+
+    def acquire(self, root: Any, demand: dict[str, int]) -> None:
+        """Take slots on behalf of a lineage."""
+        held = self._held.setdefault(root, {"holders": 0, "gpus": 0, "cpus": 0})
+        held["holders"] += 1
+        self.holders += 1
+        for kind in RESOURCE_KINDS:
+            self.in_use[kind] += demand[kind]
+            held[kind] += demand[kind]
+
+    def release(self, root: Any, demand: dict[str, int]) -> None:
+        """Return slots held by a lineage."""
+        held = self._held[root]
+        held["holders"] -= 1
+        self.holders -= 1
+        for kind in RESOURCE_KINDS:
+            self.in_use[kind] -= demand[kind]
+            held[kind] -= demand[kind]
+        if not held["holders"]:
+            del self._held[root]
+
+    def share(self, root: Any) -> float:
+        """Dominant share of the pool currently held by a lineage."""
+        held = self._held.get(root)
+        if held is None:
+            return 0.0
+
+        shares = [held["holders"] / self.max_holders] if self.max_holders else []
+        for kind in RESOURCE_KINDS:
+            capacity = self.capacity[kind]
+            if capacity:
+                shares.append(held[kind] / capacity)
+        return max(shares, default=0.0)
+
+
+class _Lineage:
+    __slots__ = ("items", "usage", "version", "weight")
+
+    def __init__(self, weight: float) -> None:
+        self.items: list[tuple[int, int, int, Any]] = []
+        self.usage: float = 0.0
+        self.version: int = 0
+        self.weight: float = weight
+
+
+class FairShareQueue:
+    """
+    Priority queue with weighted fair share between lineages.
+
+    With the ``"fair"`` policy, items are ordered by priority (higher first),
+    then by the usage of their root lineage divided by its weight (lower
+    first), then by generation depth (shallower first), then by submission
+    order. With the ``"fifo"`` policy only submission order counts.
+
+    Each lineage keeps its own heap. A global heap holds one entry per
+    lineage keyed by its head item, and stale entries are skipped lazily, so
+    push, pop and usage updates are all O(log n).
+    """
+
+    def __init__(self, policy: str = "fair") -> None:
+        """
+        Initialize the FairShareQueue.
+
+        Args:
+            policy: ``"fair"`` or ``"fifo"``
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(
+                f"Unknown scheduling policy {policy!r}, "
+                f"expected one of {SCHEDULING_POLICIES}"
+            )
+        self.policy: str = policy
+        self._lineages: dict[Any, _Lineage] = {}
+        self._heap: list[tuple[tuple, int, Any]] = []
+        self._seq = itertools.count()
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for lineage in self._lineages.values():
+            for entry in lineage.items:
+                yield entry[3]
+
+    def push(
+        self,
+        item: Any,
+        root: Any,
+        priority: int = 0,
+        depth: int = 0,
+        weight: float = 1.0,
+        usage: Optional[float] = None,
+    ) -> None:
+        """
+        Add an item on behalf of a lineage.
+
+        Args:
+            item: Queued object
+            root: Lineage the item is accounted to
+            priority: Higher values are released first
+            depth: Generation depth, shallower is released first
+            weight: Fair-share weight of the lineage
+            usage: Current usage of the lineage (keeps the known value if None)
+        """
+        lineage = self._lineages.get(root)
+        if lineage is None:
+            lineage = self._lineages[root] = _Lineage(weight)
+        if usage is not None:
+            lineage.usage = usage
+
+        if self.policy == "fifo":
+            priority = depth = 0
+        heapq.heappush(lineage.items, (-priority, depth, next(self._seq), item))
+        self._size += 1
+        self._rekey(root, lineage)
+
+    def set_usage(self, root: Any, usage: float) -> None:
+        """
+        Update how much of the shared resources a lineage currently holds.
+
+        Args:
+            root: Lineage to update
+            usage: Current usage (e.g. dominant share)
+        """
+        lineage = self._lineages.get(root)
+        if lineage is None or lineage.usage == usage:
+            return
+        lineage.usage = usage
+        self._rekey(root, lineage)
+
+    def _rekey(self, root: Any, lineage: _Lineage) -> None:
+        lineage.version += 1
+        if not lineage.items:
+            del self._lineages[root]
+            return
+
+        neg_priority, depth, seq, _ = lineage.items[0]
+        if self.policy == "fifo":
+            key: tuple = (seq,)
+        else:
+            key = (neg_priority, lineage.usage / lineage.weight, depth, seq)
+        heapq.heappush(self._heap, (key, lineage.version, root))
+
+    def _top(self) -> Optional[_Lineage]:
+        while self._heap:
+            _, version, root = self._heap[0]
+            lineage = self._lineages.get(root)
+            if lineage is not None and lineage.version == version:
+                return lineage
+            heapq.heappop(self._heap)
+        return None
+
+    def peek(self) -> Any:
+        """Return the next item without removing it (None if empty)."""
+        lineage = self._top()
+        return lineage.items[0][3] if lineage is not None else None
+
+    def pop(self) -> Any:
+        """
+        Remove and return the next item.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        lineage = self._top()
+        if lineage is None:
+            raise IndexError("pop from an empty FairShareQueue")
+
+        _, _, root = heapq.heappop(self._heap)
+        item = heapq.heappop(lineage.items)[3]
+        self._size -= 1
+        self._rekey(root, lineage)
+        return item
+
+
+class TaskScheduler:
+    """
+    Releases executable tasks to the backend in priority and fair-share order.
+
+    Tasks wait in a FairShareQueue until their GPU/CPU demand fits the free
+    slots. A lineage's usage is its dominant share of the slots held by its
+    running tasks, so a deep fan-out of one root campaign cannot monopolize the
+    allocation while other campaigns have work queued.
+    """
+
+    def __init__(
+        self,
+        gpus: Optional[int] = None,
+        cpus: Optional[int] = None,
+        policy: str = "fair",
+    ) -> None:
+        """
+        Initialize the TaskScheduler.
+
+        Args:
+            gpus: GPU slots of the allocation (None means unlimited)
+            cpus: CPU slots of the allocation (None means unlimited)
+            policy: ``"fair"`` or ``"fifo"``
+        """
+        self.pool: ResourcePool = ResourcePool(gpus=gpus, cpus=cpus)
+        self.queue: FairShareQueue = FairShareQueue(policy)
+
+        self.released_count: int = 0
+        self.total_queue_time: float = 0.0
+        self.max_queue_time: float = 0.0
+
+    def submit(
+        self,
+        pipeline: Any,
+        description: dict[str, Any],
+        on_release: Callable[[], bool],
+        now: Optional[float] = None,
+    ) -> dict[str, int]:
+        """
+        Queue a task for release.
+
+        Args:
+            pipeline: Pipeline owning the task
+            description: Task description holding its resource needs
+            on_release: Called once the task may run; returns False if the
+            task no longer wants its slots (they are then returned right away)
+            now: Submission time (defaults to ``time.monotonic()``)
+
+        Returns:
+            The slots the task will hold once released
+        """
+        root, priority, depth, weight = lineage_of(pipeline)
+        demand = self.pool.clamp(task_demand(description))
+        submitted_at = time.monotonic() if now is None else now
+
+        self.queue.push(
+            (root, demand, on_release, submitted_at),
+            root,
+            priority,
+            depth,
+            weight,
+            usage=self.pool.share(root),
+        )
+        self.dispatch(now)
+        return demand
+
+    def release(
+        self, pipeline: Any, demand: dict[str, int], now: Optional[float] = None
+    ) -> None:
+        """
+        Return the slots of a finished task and release waiting tasks.
+
+        Args:
+            pipeline: Pipeline owning the task
+            demand: Slots returned by ``submit``
+            now: Release time (defaults to ``time.monotonic()``)
+        """
+        root = lineage_of(pipeline)[0]
+        self.pool.release(root, demand)
+        self.queue.set_usage(root, self.pool.share(root))
+        self.dispatch(now)
+
+    def dispatch(self, now: Optional[float] = None) -> None:
+        """Release queued tasks, in order, while they fit."""
+        while self.queue:
+            root, demand, on_release, submitted_at = self.queue.peek()
+            if not self.pool.fits(demand):
+                break
+
+            self.queue.pop()
+            self.pool.acquire(root, demand)
+            self.queue.set_usage(root, self.pool.share(root))
+
+            if not on_release():
+                self.pool.release(root, demand)
+                self.queue.set_usage(root, self.pool.share(root))
+                continue
+
+            waited = (time.monotonic() if now is None else now) - submitted_at
+            self.released_count += 1
+            self.total_queue_time += waited
+            self.max_queue_time = max(self.max_queue_time, waited)
+
+    async def run(
+        self,
+        pipeline: Any,
+        description: dict[str, Any],
+        submit: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Wait for a slot, run the task and give the slot back.
+
+        Args:
+            pipeline: Pipeline owning the task
+            description: Task description holding its resource needs
+            submit: Callable that submits the task and returns an awaitable
+
+        Returns:
+            The task result
+        """
+        granted: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        def grant() -> bool:
+            if granted.done():  # the waiter was cancelled
+                return False
+            granted.set_result(None)
+            return True
+
+        demand = self.submit(pipeline, description, grant)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self.release(pipeline, demand)
+            raise
+
+        try:
+            return await submit()
+        finally:
+            self.release(pipeline, demand)
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Snapshot of task scheduling metrics.
+
+        Returns:
+            Queue depth, slot usage and queue time statistics
+        """
+        return {
+            "queued_tasks": len(self.queue),
+            "released_tasks": self.released_count,
+            "gpus_in_use": self.pool.in_use["gpus"],
+            "cpus_in_use": self.pool.in_use["cpus"],
+            "total_queue_time": self.total_queue_time,
+            "max_queue_time": self.max_queue_time,
+            "mean_queue_time": (
+                self.total_queue_time / self.released_count
+                if self.released_count
+                else 0.0
+            ),
+        }
@@ -0,0 +1,316 @@
+import csv
+import math
+from typing import Any, Optional
+
+CSV_COLUMNS = (
+    "scope",
+    "name",
+    "count",
+    "failures",
+    "total_s",
+    "p50_s",
+    "p95_s",
+    "max_s",
+    "queue_s",
+    "queue_p95_s",
+    "duration_s",
+    "status",
+)
+
+
+class Histogram:
+    """
+    Fixed-size log-bucketed histogram of durations in seconds.
+
+    128 buckets growing by 2**0.25 from 1 ms cover 1 ms to ~50 days with a
+    relative error of at most 19% on percentiles, in constant memory.
+    """
+
+    MIN_VALUE = 1e-3
+    GROWTH = 2**0.25
+    BUCKETS = 128
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * self.BUCKETS
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Add a sample.
+
+        Args:
+            value: Duration in seconds
+        """
+        if value <= self.MIN_VALUE:
+            index = 0
+        else:
+            index = min(
+                self.BUCKETS - 1,
+                int(math.log(value / self.MIN_VALUE, self.GROWTH)) + 1,
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Upper bound of the bucket holding the percentile (capped at the
+            largest sample), 0.0 when empty
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self.MIN_VALUE * self.GROWTH**index, self.max)
+        return self.max
+
+
+class _TaskStats:
+    """Aggregate of every call of one task name."""
+
+    __slots__ = ("durations", "queue", "failures")
+
+    def __init__(self) -> None:
+        self.durations = Histogram()
+        self.queue = Histogram()
+        self.failures = 0
+
+
+class _PipelineStats:
+    """Constant-size summary of one pipeline."""
+
+    __slots__ = ("tasks", "failures", "task_time", "queue_time", "duration", "status")
+
+    def __init__(self) -> None:
+        self.tasks = 0
+        self.failures = 0
+        self.task_time = 0.0
+        self.queue_time = 0.0
+        self.duration: Optional[float] = None
+        self.status = "running"
+
+
+class RunStats:
+    """
+    Per-pipeline and per-task-name timing statistics of a manager run.
+
+    Task names share fixed-size histograms, pipelines keep a constant-size
+    summary each, so collection stays cheap for 10k-pipeline campaigns.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: dict[str, _TaskStats] = {}
+        self.pipelines: dict[str, _PipelineStats] = {}
+        self.pipeline_durations = Histogram()
+        self.admission_waits = Histogram()
+        self.adaptive = _TaskStats()
+
+    def _pipeline(self, name: str) -> _PipelineStats:
+        stats = self.pipelines.get(name)
+        if stats is None:
+            stats = self.pipelines[name] = _PipelineStats()
+        return stats
+
+    def record_task(
+        self,
+        pipeline_name: str,
+        task_name: str,
+        duration: float,
+        queue_time: float = 0.0,
+        failed: bool = False,
+    ) -> None:
+        """
+        Record a finished task.
+
+        Args:
+            pipeline_name: Pipeline that ran the task
+            task_name: Registered task name
+            duration: Run time in seconds
+            queue_time: Seconds spent waiting for resources before release
+            failed: Whether the task raised or was cancelled
+        """
+        task = self.tasks.get(task_name)
+        if task is None:
+            task = self.tasks[task_name] = _TaskStats()
+        task.durations.record(duration)
+        task.queue.record(queue_time)
+        task.failures += failed
+
+        pipeline = self._pipeline(pipeline_name)
+        pipeline.tasks += 1
+        pipeline.failures += failed
+        pipeline.task_time += duration
+        pipeline.queue_time += queue_time
+
+    def expected_duration(self, task_name: str) -> Optional[float]:
+        """
+        Median run time of a task name so far.
+
+        Args:
+            task_name: Registered task name
+
+        Returns:
+            Seconds, or None if the task has not finished yet
+        """
+        task = self.tasks.get(task_name)
+        if task is None or not task.durations.count:
+            return None
+        return task.durations.percentile(50)
+
+    def record_adaptive(self, duration: float, failed: bool = False) -> None:
+        """
+        Record an adaptive function call.
+
+        Args:
+            duration: Run time in seconds
+            failed: Whether the call raised or timed out
+        """
+        self.adaptive.durations.record(duration)
+        self.adaptive.failures += failed
+
+    def record_pipeline(
+        self, name: str, duration: float, status: str, admission_wait: float = 0.0
+    ) -> None:
+        """
+        Record a retired pipeline.
+
+        Args:
+            name: Pipeline name
+            duration: Seconds from launch to retirement
+            status: ``completed``, ``killed`` or ``failed``
+            admission_wait: Seconds the pipeline waited for admission
+        """
+        pipeline = self._pipeline(name)
+        pipeline.duration = duration
+        pipeline.status = status
+        self.pipeline_durations.record(duration)
+        self.admission_waits.record(admission_wait)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Build the statistics report.
+
+        Returns:
+            Dictionary with ``tasks`` (per task name), ``adaptive``,
+            ``pipelines`` (per pipeline) and ``pipeline_durations`` entries
+        """
+        return {
+            "tasks": {
+                name: _task_summary(task) for name, task in sorted(self.tasks.items())
+            },
+            "adaptive": _task_summary(self.adaptive),
+            "pipelines": {
+                name: {
+                    "tasks": p.tasks,
+                    "failures": p.failures,
+                    "task_time_s": p.task_time,
+                    "queue_time_s": p.queue_time,
+                    "duration_s": p.duration,
+                    "status": p.status,
+                }
+                for name, p in self.pipelines.items()
+            },
+            "pipeline_durations": {
+                "count": self.pipeline_durations.count,
+                "total_s": self.pipeline_durations.total,
+                "p50_s": self.pipeline_durations.percentile(50),
+                "p95_s": self.pipeline_durations.percentile(95),
+                "max_s": self.pipeline_durations.max,
+                "admission_wait_p95_s": self.admission_waits.percentile(95),
+            },
+        }
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Flatten the report into CSV rows (tasks, adaptive, then pipelines)."""
+        summary = self.summary()
+        rows = [
+            {"scope": "task", "name": name, **stats}
+            for name, stats in summary["tasks"].items()
+        ]
+        if summary["adaptive"]["count"]:
+            rows.append(
+                {"scope": "adaptive", "name": "adaptive", **summary["adaptive"]}
+            )
+        for name, p in summary["pipelines"].items():
+            rows.append(
+                {
+                    "scope": "pipeline",
+                    "name": name,
+                    "count": p["tasks"],
+                    "failures": p["failures"],
+                    "total_s": p["task_time_s"],
+                    "duration_s": p["duration_s"],
+                    "queue_s": p["queue_time_s"],
+                    "status": p["status"],
+                }
+            )
+        return rows
+
+    def to_csv(self, path: str) -> None:
+        """
+        Write every row of the report to a CSV file.
+
+        Args:
+            path: Output file
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def format_table(self) -> str:
+        """
+        Render task names, adaptive calls and pipeline totals as a text table.
+
+        Per-pipeline rows are left to the CSV to keep the table short.
+        """
+        header = (
+            f"{'name':<28} {'count':>7} {'fail':>5} {'total s':>10} "
+            f"{'p50 s':>9} {'p95 s':>9} {'queue s':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for row in self.rows():
+            if row["scope"] == "pipeline":
+                continue
+            lines.append(
+                f"{row['name'][:28]:<28} {row['count']:>7} {row['failures']:>5} "
+                f"{row['total_s']:>10.2f} {row['p50_s']:>9.3f} {row['p95_s']:>9.3f} "
+                f"{row['queue_s']:>9.2f}"
+            )
+
+        durations = self.pipeline_durations
+        failed = sum(p.status != "completed" for p in self.pipelines.values())
+        lines.append(
+            f"{'pipelines':<28} {durations.count:>7} {failed:>5} "
+            f"{durations.total:>10.2f} {durations.percentile(50):>9.3f} "
+            f"{durations.percentile(95):>9.3f} {self.admission_waits.total:>9.2f}"
+        )
+        return "\n".join(lines)
+
+
+def _task_summary(task: _TaskStats) -> dict[str, Any]:
+    """Summary of one task name."""
+    return {
+        "count": task.durations.count,
+        "failures": task.failures,
+        "total_s": task.durations.total,
+        "p50_s": task.durations.percentile(50),
+        "p95_s": task.durations.percentile(95),
+        "max_s": task.durations.max,
+        "queue_s": task.queue.total,
+        "queue_p95_s": task.queue.percentile(95),
+    }
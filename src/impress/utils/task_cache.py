@@ -0,0 +1,322 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+# Environment variables that change what a command resolves to by default
+DEFAULT_CACHE_ENVIRONMENT = ("PATH", "VIRTUAL_ENV", "CONDA_PREFIX", "LD_LIBRARY_PATH")
+
+PathSpec = Union[None, Iterable[str], Callable[..., Iterable[str]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    outputs BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+"""
+
+
+class CachedTask(NamedTuple):
+    """Registration of an executable task whose results are cached."""
+
+    func: Callable[..., Any]
+    command_task: Callable[..., Any]
+    inputs: PathSpec
+    outputs: PathSpec
+
+
+def resolve_paths(spec: PathSpec, *args: Any, **kwargs: Any) -> list[str]:
+    """
+    Resolve declared input or output paths of a task call.
+
+    Args:
+        spec: None, a list of paths, or a callable receiving the task's
+        arguments and returning paths
+        *args: Positional arguments of the task call
+        **kwargs: Keyword arguments of the task call
+
+    Returns:
+        List of paths
+    """
+    if spec is None:
+        return []
+    if callable(spec):
+        spec = spec(*args, **kwargs)
+    return [os.fspath(path) for path in spec]
+
+
+def _directory_size(path: str) -> int:
+    """Total size of the files under a path."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TaskCache:
+    """
+    Content-addressed, size-bounded on-disk cache of executable task results.
+
+    A cache key hashes the rendered command, the task description, selected
+    environment variables and the declared input files (size and mtime, or
+    their content). An entry stores the task's return value and copies of its
+    declared output files; on a hit, missing outputs are restored from those
+    copies. The least recently used entries are evicted once the store grows
+    beyond ``max_bytes``. Pipelines call it from worker threads, so the index
+    is shared across threads behind a lock.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 2**30,
+        hash_contents: bool = False,
+        environment: Iterable[str] = DEFAULT_CACHE_ENVIRONMENT,
+    ) -> None:
+        """
+        Open (or create) a task cache.
+
+        Args:
+            path: Cache directory
+            max_bytes: Upper bound on the size of stored values and outputs
+            hash_contents: Hash input file contents instead of size and mtime
+            environment: Names of environment variables included in the key
+        """
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.hash_contents: bool = hash_contents
+        self.environment: tuple[str, ...] = tuple(environment)
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self.objects_dir: str = os.path.join(path, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.conn: sqlite3.Connection = sqlite3.connect(
+            os.path.join(path, "index.db"), check_same_thread=False
+        )
+        self.conn.executescript(_SCHEMA)
+        self._lock: threading.RLock = threading.RLock()
+
+    def key(
+        self,
+        command: Any,
+        inputs: Iterable[str] = (),
+        task_description: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """
+        Compute the cache key of a task call.
+
+        Args:
+            command: Rendered command returned by the task body
+            inputs: Declared input files or directories
+            task_description: Merged task description of the call
+
+        Returns:
+            Hex digest identifying the call
+        """
+        digest = hashlib.sha256()
+        digest.update(repr(command).encode())
+        digest.update(
+            json.dumps(task_description or {}, sort_keys=True, default=str).encode()
+        )
+        for name in self.environment:
+            digest.update(f"{name}={os.environ.get(name, '')}\0".encode())
+        for path in inputs:
+            for entry in self._fingerprint(path):
+                digest.update(repr(entry).encode())
+        return digest.hexdigest()
+
+    def _fingerprint(self, path: str) -> list[tuple[Any, ...]]:
+        """Fingerprint a file, or every file under a directory."""
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+            )
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            return [(path, None)]
+
+        entries = []
+        for file_path in files:
+            if self.hash_contents:
+                entries.append((file_path, _file_digest(file_path)))
+            else:
+                stat = os.stat(file_path)
+                entries.append((file_path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Declared outputs that no longer exist are restored from the cache.
+        An entry whose stored outputs are gone counts as a miss and is dropped.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            ``(True, value)`` on a hit, ``(False, None)`` on a miss
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: str) -> tuple[bool, Any]:
+        """``lookup`` with the lock held."""
+        row = self.conn.execute(
+            "SELECT value, outputs FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+
+        outputs: list[tuple[str, str]] = pickle.loads(row[1])
+        for original, stored in outputs:
+            if os.path.exists(original):
+                continue
+            if not os.path.exists(stored):
+                self._drop(key)
+                self.misses += 1
+                return False, None
+            os.makedirs(os.path.dirname(original) or ".", exist_ok=True)
+            if os.path.isdir(stored):
+                shutil.copytree(stored, original)
+            else:
+                shutil.copy2(stored, original)
+
+        with self.conn:
+            self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        self.hits += 1
+        return True, pickle.loads(row[0])
+
+    def store(self, key: str, value: Any, outputs: Iterable[str] = ()) -> bool:
+        """
+        Store the result of a task call.
+
+        Args:
+            key: Cache key
+            value: Task return value (must be picklable)
+            outputs: Declared output files or directories to keep copies of
+
+        Returns:
+            True if the entry was stored, False if it could not be (value not
+            picklable, output missing or entry larger than the cache)
+        """
+        with self._lock:
+            return self._store(key, value, outputs)
+
+    def _store(self, key: str, value: Any, outputs: Iterable[str]) -> bool:
+        """``store`` with the lock held."""
+        try:
+            value_blob = pickle.dumps(value)
+        except Exception:
+            return False
+
+        outputs = list(outputs)
+        if not all(os.path.exists(path) for path in outputs):
+            return False
+
+        size = len(value_blob) + sum(_directory_size(path) for path in outputs)
+        if size > self.max_bytes:
+            return False
+
+        entry_dir = os.path.join(self.objects_dir, key)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        stored_outputs = []
+        for i, path in enumerate(outputs):
+            stored = os.path.join(entry_dir, str(i))
+            os.makedirs(entry_dir, exist_ok=True)
+            if os.path.isdir(path):
+                shutil.copytree(path, stored)
+            else:
+                shutil.copy2(path, stored)
+            stored_outputs.append((os.path.abspath(path), stored))
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, value_blob, pickle.dumps(stored_outputs), size, time.time()),
+            )
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits."""
+        total = self.size
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_used"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._drop(key)
+            self.evictions += 1
+            total -= size
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry and its stored outputs."""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        shutil.rmtree(os.path.join(self.objects_dir, key), ignore_errors=True)
+
+    @property
+    def size(self) -> int:
+        """Bytes currently held by the cache."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def metrics(self) -> dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            Dictionary with ``hits``, ``misses``, ``evictions``, ``entries``
+            and ``bytes``
+        """
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self.size,
+        }
+
+    def close(self) -> None:
+        """Close the cache index."""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from typing import Any, Callable, Optional
+
+
+def run_in_thread_loop(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a coroutine function to completion on a private event loop.
+
+    Meant to be submitted to a worker pool, where no event loop is running.
+    The loop is closed afterwards so worker threads do not leak loops.
+
+    Args:
+        func: Coroutine function
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        Whatever the coroutine returns
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(func(*args, **kwargs))
+    finally:
+        loop.close()
+
+
+class ThreadLoopCall:
+    """
+    A coroutine function call to run on a worker thread's private event loop.
+
+    Submit the instance to a worker pool like ``run_in_thread_loop``. Unlike
+    it, the call can be cancelled from any thread, and awaiting a future of
+    ``foreign_loop`` (the loop that offloaded the call) raises a RuntimeError
+    naming the call. Such a future is only ever completed on its own loop,
+    so awaiting it from the private loop cannot work.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        foreign_loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """
+        Initialize the call.
+
+        Args:
+            func: Coroutine function
+            *args: Positional arguments for ``func``
+            foreign_loop: Loop whose futures the call must not await
+        """
+        self.func: Callable[..., Any] = func
+        self.args: tuple[Any, ...] = args
+        self.foreign_loop: Optional[asyncio.AbstractEventLoop] = foreign_loop
+        self._lock: threading.Lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled: bool = False
+
+    def __call__(self) -> Any:
+        loop = asyncio.new_event_loop()
+        try:
+            with self._lock:
+                if self._cancelled:
+                    raise asyncio.CancelledError()
+                coro = self.func(*self.args)
+                if self.foreign_loop is not None:
+                    coro = _LoopGuard(coro, self.foreign_loop, self.func)
+                self._task = loop.create_task(_await(coro))
+                self._loop = loop
+            return loop.run_until_complete(self._task)
+        finally:
+            with self._lock:
+                self._loop = None
+            loop.close()
+
+    def cancel(self) -> None:
+        """Cancel the call, whether it is already running or not."""
+        with self._lock:
+            self._cancelled = True
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+async def _await(awaitable: Any) -> Any:
+    return await awaitable
+
+
+class _LoopGuard:
+    """Awaitable that drives a coroutine and rejects futures of another loop."""
+
+    __slots__ = ("coro", "foreign_loop", "func")
+
+    def __init__(self, coro: Any, foreign_loop: Any, func: Callable) -> None:
+        self.coro = coro
+        self.foreign_loop = foreign_loop
+        self.func = func
+
+    def __await__(self) -> Any:
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            try:
+                if error is None:
+                    yielded = self.coro.send(value)
+                else:
+                    yielded = self.coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+
+            value, error = None, None
+            if asyncio.isfuture(yielded) and yielded.get_loop() is self.foreign_loop:
+                yielded._asyncio_future_blocking = False
+                name = getattr(self.func, "__name__", repr(self.func))
+                error = RuntimeError(
+                    f"{name} awaited {yielded!r}, which belongs to the manager's "
+                    "event loop; offloaded adaptive functions run on a private "
+                    "loop and can only await work they start themselves"
+                )
+                continue
+
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                self.coro.close()
+                raise
+            except BaseException as e:
+                error = e
@@ -0,0 +1,252 @@
+import json
+import os
+import time
+from typing import Any, Optional
+
+TRACE_FORMATS = ("chrome", "otlp")
+
+
+class Span:
+    """A finished span."""
+
+    __slots__ = (
+        "name",
+        "category",
+        "track",
+        "start_ns",
+        "end_ns",
+        "span_id",
+        "parent_id",
+        "attributes",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        track: str,
+        start_ns: int,
+        end_ns: int,
+        span_id: int,
+        parent_id: Optional[int],
+        attributes: dict[str, Any],
+    ) -> None:
+        self.name = name
+        self.category = category
+        self.track = track
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+
+
+class Tracer:
+    """
+    In-memory span recorder with collector-free JSON exporters.
+
+    Spans are grouped into tracks (one per pipeline plus one for the manager)
+    and exported either as Chrome trace JSON (chrome://tracing, Perfetto) or
+    as OpenTelemetry OTLP/JSON (``resourceSpans``) that any OTLP file reader
+    can load.
+
+    Span categories recorded by IMPRESS:
+
+    - ``pipeline``: a pipeline from launch to retirement
+    - ``task`` / ``local``: an executable task from release to completion, or
+      a local task's execution
+    - ``queue``: time an executable task waited for the task scheduler
+    - ``adaptive``: an adaptive function call
+    - ``adaptive_wait``: a pipeline blocked in ``run_adaptive_step``
+    - ``spawn``: a child request from reception by the manager to launch
+    - ``manager``: one manager wake-up processing signals
+    """
+
+    def __init__(self, max_spans: Optional[int] = None) -> None:
+        """
+        Initialize the tracer.
+
+        Args:
+            max_spans: Stop recording after this many spans (None: unbounded)
+        """
+        self.max_spans: Optional[int] = max_spans
+        self.spans: list[Span] = []
+        self.dropped: int = 0
+        self._next_id: int = 1
+        # Offset that maps perf_counter_ns onto the Unix epoch
+        self._epoch_offset_ns: int = time.time_ns() - time.perf_counter_ns()
+        self.trace_id: str = os.urandom(16).hex()
+
+    @staticmethod
+    def now() -> int:
+        """Monotonic timestamp in nanoseconds."""
+        return time.perf_counter_ns()
+
+    def new_span_id(self) -> int:
+        """Reserve a span id, e.g. to parent spans before the span ends."""
+        span_id = self._next_id
+        self._next_id += 1
+        return span_id
+
+    def record(
+        self,
+        name: str,
+        category: str,
+        track: str,
+        start_ns: int,
+        end_ns: Optional[int] = None,
+        span_id: Optional[int] = None,
+        parent_id: Optional[int] = None,
+        **attributes: Any,
+    ) -> int:
+        """
+        Record a finished span.
+
+        Args:
+            name: Span name
+            category: Span category
+            track: Track (pipeline name or ``manager``)
+            start_ns: Start timestamp from ``now()``
+            end_ns: End timestamp (defaults to now)
+            span_id: Reserved span id (allocated if omitted)
+            parent_id: Parent span id
+            **attributes: Extra attributes
+
+        Returns:
+            Span id
+        """
+        if span_id is None:
+            span_id = self.new_span_id()
+        if self.max_spans is not None and len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return span_id
+
+        self.spans.append(
+            Span(
+                name,
+                category,
+                track,
+                start_ns,
+                self.now() if end_ns is None else end_ns,
+                span_id,
+                parent_id,
+                attributes,
+            )
+        )
+        return span_id
+
+    def to_chrome(self) -> dict[str, Any]:
+        """
+        Build a Chrome trace (Trace Event Format) document.
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        origin = min((span.start_ns for span in self.spans), default=0)
+        tracks: dict[str, int] = {"manager": 0}
+        events: list[dict[str, Any]] = []
+
+        for span in self.spans:
+            tid = tracks.setdefault(span.track, len(tracks))
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start_ns - origin) / 1e3,
+                    "dur": (span.end_ns - span.start_ns) / 1e3,
+                    "pid": 1,
+                    "tid": tid,
+                    "args": span.attributes,
+                }
+            )
+
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": tid,
+                "args": {"name": track},
+            }
+            for track, tid in tracks.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self) -> dict[str, Any]:
+        """
+        Build an OpenTelemetry OTLP/JSON ``ExportTraceServiceRequest``.
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        spans = []
+        for span in self.spans:
+            attributes = {
+                "impress.category": span.category,
+                "impress.track": span.track,
+            }
+            attributes.update(span.attributes)
+            otlp_span = {
+                "traceId": self.trace_id,
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns + self._epoch_offset_ns),
+                "endTimeUnixNano": str(span.end_ns + self._epoch_offset_ns),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in attributes.items()
+                ],
+            }
+            if span.parent_id is not None:
+                otlp_span["parentSpanId"] = f"{span.parent_id:016x}"
+            spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": "impress"}}
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "impress"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def export(self, path: str, trace_format: str = "chrome") -> None:
+        """
+        Write the recorded spans to a JSON file.
+
+        Args:
+            path: Output file
+            trace_format: ``"chrome"`` or ``"otlp"``
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if trace_format == "chrome":
+            document = self.to_chrome()
+        elif trace_format == "otlp":
+            document = self.to_otlp()
+        else:
+            raise ValueError(
+                f"Unknown trace format {trace_format!r}, "
+                f"expected one of {TRACE_FORMATS}"
+            )
+
+        with open(path, "w") as f:
+            json.dump(document, f, default=str)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
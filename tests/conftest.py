@@ -1,9 +1,10 @@
 # tests/conftest.py
+import asyncio
 import pytest
 import shutil
 from pathlib import Path
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from impress import ImpressManager
 
 
@@ -13,6 +14,13 @@ def pytest_sessionfinish(session, exitstatus):
         shutil.rmtree(pycache_dir)
 
 
+@pytest.fixture
+def work_dir(tmp_path, monkeypatch):
+    """Run in tmp_path so workflow engine session directories stay out of the tree"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
 @pytest.fixture
 def mock_execution_backend():
     """Mock execution backend"""
@@ -25,3 +33,82 @@ def impress_manager(mock_execution_backend):
     manager = ImpressManager(mock_execution_backend, use_colors=False)
     manager.logger = Mock()  # Mock the logger
     return manager
+
+
+class FakeWorkflowEngine:
+    """
+    In-memory stand-in for the asyncflow WorkflowEngine.
+
+    Works both as the manager's engine (patch ``WorkflowEngine`` with an
+    instance; ``create`` returns it) and as a pipeline's ``flow``. Executable
+    tasks render their command, record it in ``submitted`` as ``(task name,
+    command, task description)``, sleep ``delay`` seconds, hang until cancelled
+    if their name is in ``hang_on`` and return ``result`` formatted with the
+    command. ``running`` and ``peak`` count tasks in flight, and ``decorated``
+    lists the functions wrapped by ``executable_task``.
+    """
+
+    def __init__(self, result="{command}", delay=0.0, hang_on=()):
+        self.result = result
+        self.delay = delay
+        self.hang_on = set(hang_on)
+        self.decorated = []
+        self.submitted = []
+        self.futures = []
+        self.running = 0
+        self.peak = 0
+
+    async def create(self, backend=None):
+        return self
+
+    @property
+    def names(self):
+        """Names of the submitted tasks, in submission order."""
+        return [name for name, _, _ in self.submitted]
+
+    @property
+    def commands(self):
+        """Rendered commands of the submitted tasks, in submission order."""
+        return [command for _, command, _ in self.submitted]
+
+    def executable_task(self, **task_kwargs):
+        def decorator(func):
+            self.decorated.append(func.__name__)
+
+            def submit(*args, task_description=None, **kwargs):
+                future = asyncio.ensure_future(
+                    self._execute(func, args, kwargs, task_description)
+                )
+                self.futures.append(future)
+                return future
+
+            return submit
+
+        return decorator
+
+    async def _execute(self, func, args, kwargs, task_description):
+        command = await func(*args, **kwargs)
+        self.submitted.append((func.__name__, command, task_description))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if func.__name__ in self.hang_on:
+                await asyncio.Event().wait()
+        finally:
+            self.running -= 1
+        return self.result.format(command=command)
+
+
+@pytest.fixture
+def workflow_engine():
+    """A fresh FakeWorkflowEngine (configure it through its attributes)"""
+    return FakeWorkflowEngine()
+
+
+@pytest.fixture
+def engine(workflow_engine):
+    """The workflow_engine fake, patched in as the manager's WorkflowEngine"""
+    with patch("impress.impress_manager.WorkflowEngine", workflow_engine):
+        yield workflow_engine
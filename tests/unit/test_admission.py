@@ -0,0 +1,138 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.admission import AdmissionController
+
+from .test_manager_life_cycle import MockWorkflowEngine
+
+
+class DemandPipeline:
+    """Stand-in exposing only a resource demand"""
+
+    def __init__(self, name, gpus=0, cpus=0):
+        self.name = name
+        self.demand = {"gpus": gpus, "cpus": cpus}
+
+    def get_resource_demand(self):
+        return self.demand
+
+
+class TestAdmissionController:
+    def test_unlimited_admits_everything(self):
+        """Test that no declared capacity admits all pipelines at once"""
+        controller = AdmissionController()
+        pipelines = [DemandPipeline(f"p{i}", gpus=1) for i in range(5)]
+        for pipeline in pipelines:
+            controller.enqueue(pipeline)
+
+        assert controller.admit() == pipelines
+        assert controller.metrics()["queue_depth"] == 0
+
+    def test_gpu_capacity_limits_admission(self):
+        """Test that pipelines wait until GPU slots are released"""
+        controller = AdmissionController(gpus=2)
+        pipelines = [DemandPipeline(f"p{i}", gpus=1) for i in range(3)]
+        for pipeline in pipelines:
+            controller.enqueue(pipeline)
+
+        assert controller.admit() == pipelines[:2]
+        assert controller.metrics()["queue_depth"] == 1
+        assert controller.metrics()["gpus_in_use"] == 2
+
+        assert controller.release(pipelines[0])
+        assert controller.admit() == [pipelines[2]]
+        assert controller.metrics()["max_queue_depth"] == 1
+        assert controller.metrics()["admitted"] == 3
+
+    def test_max_in_flight(self):
+        """Test the in-flight pipeline cap"""
+        controller = AdmissionController(max_in_flight=1)
+        first, second = DemandPipeline("p1"), DemandPipeline("p2")
+        controller.enqueue(first)
+        controller.enqueue(second)
+
+        assert controller.admit() == [first]
+        assert controller.admit() == []
+        controller.release(first)
+        assert controller.admit() == [second]
+
+    def test_oversized_demand_is_clamped(self):
+        """Test that a pipeline larger than the allocation still runs"""
+        controller = AdmissionController(gpus=2)
+        pipeline = DemandPipeline("big", gpus=8)
+        controller.enqueue(pipeline)
+
+        assert controller.admit() == [pipeline]
+        assert controller.metrics()["gpus_in_use"] == 2
+
+    def test_release_unknown_pipeline(self):
+        """Test releasing a pipeline that never held slots"""
+        controller = AdmissionController()
+        assert controller.release(DemandPipeline("ghost")) is False
+
+
+class GpuPipeline(ImpressBasePipeline):
+    """Pipeline needing one GPU slot"""
+
+    running = 0
+    peak = 0
+
+    def register_pipeline_tasks(self):
+        pass
+
+    def get_resource_demand(self):
+        return {"gpus": 1, "cpus": 1}
+
+    async def run(self):
+        GpuPipeline.running += 1
+        GpuPipeline.peak = max(GpuPipeline.peak, GpuPipeline.running)
+        await asyncio.sleep(0.02)
+        GpuPipeline.running -= 1
+
+    async def finalize(self):
+        pass
+
+
+class TestManagerAdmission:
+    def test_resource_demand_from_task_description(self, workflow_engine):
+        """Test that executable task descriptions define the pipeline demand"""
+
+        class TwoTaskPipeline(ImpressBasePipeline):
+            def register_pipeline_tasks(self):
+                @self.auto_register_task()
+                async def mpnn(task_description={"gpus_per_rank": 1}):  # noqa: B006
+                    return "mpnn"
+
+                @self.auto_register_task()
+                async def relax(task_description={"cores_per_rank": 4}):  # noqa: B006
+                    return "relax"
+
+            async def run(self):
+                pass
+
+            async def finalize(self):
+                pass
+
+        pipeline = TwoTaskPipeline("p1", flow=workflow_engine)
+        assert pipeline.get_resource_demand() == {"gpus": 1, "cpus": 4}
+
+    @pytest.mark.asyncio
+    @patch("impress.impress_manager.WorkflowEngine", MockWorkflowEngine)
+    async def test_pipelines_wait_for_gpu_slots(self, mock_execution_backend):
+        """Test that the manager never runs more pipelines than GPU slots"""
+        manager = ImpressManager(mock_execution_backend, resources={"gpus": 2})
+        manager.logger = Mock()
+        GpuPipeline.running = GpuPipeline.peak = 0
+
+        setups = [PipelineSetup(name=f"p{i}", type=GpuPipeline) for i in range(6)]
+        await asyncio.wait_for(manager.start(setups), timeout=3.0)
+
+        metrics = manager.admission.metrics()
+        assert GpuPipeline.peak == 2
+        assert metrics["admitted"] == 6
+        assert metrics["queue_depth"] == 0
+        assert metrics["max_queue_depth"] == 4
+        assert metrics["max_wait_time"] > 0
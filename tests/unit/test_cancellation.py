@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup, pipeline_task
+
+
+class KilledPipeline(ImpressBasePipeline):
+    """Submits two 2-GPU folds, then kills itself while they run"""
+
+    def __init__(self, name, flow, **kwargs):
+        self.finalized = False
+        super().__init__(name, flow, **kwargs)
+
+    @pipeline_task()
+    async def fold(self, task_description={"gpus_per_rank": 2}):  # noqa: B006
+        return "/bin/true"
+
+    async def run(self):
+        folds = [self.fold(), self.fold()]
+        self.kill_parent = True
+        await asyncio.gather(*folds, return_exceptions=True)
+        self.state["survived"] = True
+
+    async def finalize(self):
+        self.finalized = True
+
+
+class ArgumentFinalizePipeline(KilledPipeline):
+    """finalize() needs arguments, so the cleanup lives in on_kill()"""
+
+    async def finalize(self, migrated):
+        raise AssertionError("finalize() must not be called without arguments")
+
+    async def on_kill(self):
+        self.finalized = True
+
+
+class StubbornPipeline(KilledPipeline):
+    """Ignores the first cancellation for a while"""
+
+    async def run(self):
+        self.kill_parent = True
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.3)
+
+
+class SlowToCancelPipeline(KilledPipeline):
+    """Needs a moment to wind down after being cancelled"""
+
+    async def run(self):
+        self.kill_parent = True
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.1)
+            raise
+
+
+@pytest.fixture
+def engine(engine):
+    engine.hang_on = {"fold"}
+    return engine
+
+
+async def run_manager(pipeline_type, **kwargs):
+    manager = ImpressManager(execution_backend=Mock(), use_colors=False, **kwargs)
+    manager.logger = Mock()
+    # Earlier folds took 100 s each
+    manager.run_stats.record_task("earlier", "fold", 100.0)
+    finished = []
+    manager.admission.release = Mock(side_effect=finished.append)
+    setup = PipelineSetup(name="p1", type=pipeline_type)
+    await asyncio.wait_for(manager.start([setup]), timeout=3.0)
+    return manager, finished[0]
+
+
+@pytest.mark.usefixtures("engine")
+class TestKilledPipelines:
+    @pytest.mark.asyncio
+    async def test_in_flight_tasks_cancelled(self, engine):
+        """Test that killing cancels running tasks, finalizes and reports"""
+        manager, pipeline = await run_manager(KilledPipeline)
+
+        assert len(engine.futures) == 2
+        assert all(future.cancelled() for future in engine.futures)
+        assert pipeline.finalized
+        assert "survived" not in pipeline.state
+        assert pipeline._inflight == {}
+        # 2 tasks x 2 GPUs x ~100 s still to go
+        assert manager.reclaimed_gpu_seconds == pytest.approx(400, rel=0.01)
+        manager.logger.tasks_cancelled.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_on_kill_hook(self):
+        """Test that a finalize() with arguments leaves cleanup to on_kill()"""
+        manager, pipeline = await run_manager(ArgumentFinalizePipeline)
+
+        assert pipeline.finalized
+        manager.logger.finalize_failed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_grace_period(self):
+        """Test that a pipeline ignoring cancellation is retired after a while"""
+        manager, pipeline = await run_manager(StubbornPipeline, kill_grace_period=0.05)
+
+        assert not pipeline.finalized
+        assert manager.reclaimed_gpu_seconds == 0.0
+        manager.logger.pipeline_killed.assert_called_once_with("p1")
+        await asyncio.sleep(0.35)  # let the stubborn run() finish
+
+    @pytest.mark.asyncio
+    async def test_retired_after_cancellation(self):
+        """Test that a killed pipeline is only retired once it has wound down"""
+        manager = ImpressManager(execution_backend=Mock(), use_colors=False)
+        manager.logger = Mock()
+        retired = []
+        manager.admission.release = Mock(
+            side_effect=lambda p: retired.append((p.name, p.finalized))
+        )
+        setup = PipelineSetup(name="p1", type=SlowToCancelPipeline)
+        await asyncio.wait_for(manager.start([setup]), timeout=3.0)
+
+        assert retired == [("p1", True)]
+
+    def test_unknown_task_durations_count_as_zero(self, impress_manager):
+        """Test that tasks without a finished sample reclaim nothing"""
+        timing = {"submitted": 0}
+        tasks = [("new_task", {"gpus_per_rank": 4}, timing)]
+
+        assert impress_manager._remaining_gpu_seconds(tasks) == 0.0
@@ -0,0 +1,265 @@
+import asyncio
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.checkpoint import CheckpointStore
+
+
+class CampaignPipeline(ImpressBasePipeline):
+    """Pipeline with executable, adaptive and local steps"""
+
+    def __init__(self, name, flow, generation=0, **kwargs):
+        self.generation = generation
+        self.taskcount = 0
+        super().__init__(name, flow, **kwargs)
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task()
+        async def backbone():
+            self.taskcount += 1
+            return f"backbone {self.taskcount}"
+
+        @self.auto_register_task(local_task=True)
+        async def analyse(output):
+            self.state["analysed"] = output
+            return len(output)
+
+        @self.auto_register_task()
+        async def fold():
+            self.taskcount += 1
+            return f"fold {self.taskcount}"
+
+    async def run(self):
+        self.state["backbone"] = await self.backbone()
+        await self.run_adaptive_step(wait=True)
+        self.state["length"] = await self.analyse(self.state["backbone"])
+        self.state["fold"] = await self.fold()
+
+    async def finalize(self):
+        pass
+
+
+adaptive_calls = []
+
+
+async def spawn_once(pipeline):
+    adaptive_calls.append(pipeline.name)
+    pipeline.state["choice"] = "fold"
+    if pipeline.generation == 0:
+        pipeline.submit_child_pipeline_request(
+            {
+                "name": f"{pipeline.name}-child",
+                "type": CampaignPipeline,
+                "adaptive_fn": spawn_once,
+                "generation": 1,
+            }
+        )
+
+
+async def spawn_then_wait(pipeline):
+    pipeline.submit_child_pipeline_request(
+        {"name": f"{pipeline.name}-child", "type": CampaignPipeline, "generation": 1}
+    )
+    await asyncio.sleep(0.2)
+
+
+def campaign_manager(path):
+    manager = ImpressManager(execution_backend=Mock(), checkpoint_path=path)
+    manager.logger = Mock()
+    return manager
+
+
+@pytest.fixture(autouse=True)
+def reset_adaptive_calls():
+    adaptive_calls.clear()
+
+
+@pytest.fixture
+def engine(engine):
+    engine.result = "ran {command}"
+    return engine
+
+
+class TestCheckpointStore:
+    def test_steps_round_trip(self, tmp_path):
+        """Test that recorded steps come back for unfinished pipelines only"""
+        store = CheckpointStore(str(tmp_path / "ckpt.db"))
+        setup = PipelineSetup(name="p1", type=CampaignPipeline)
+        first = store.add_pipeline(setup, None, None, 0, 0, 1.0)
+        second = store.add_pipeline(setup, None, None, 0, 0, 1.0)
+        store.record_step(first, 1, "task", "backbone", "out", {"taskcount": 1})
+        store.record_step(first, 2, "task", "analyse", lambda: None, {})
+        store.set_status(second, "completed")
+
+        records = store.unfinished_pipelines()
+
+        assert [record["id"] for record in records] == [first]
+        assert records[0]["root_id"] == first
+        assert records[0]["setup"]["type"] is CampaignPipeline
+        # Unpicklable results are not replayed
+        assert records[0]["steps"] == {1: ("task", "backbone", "out", {"taskcount": 1})}
+        store.close()
+
+    def test_writes_committed_off_the_calling_thread(self, tmp_path):
+        """Test that writes run on the writer thread and transactions are atomic"""
+        store = CheckpointStore(str(tmp_path / "ckpt.db"))
+        writers = set()
+        store.conn.set_trace_callback(
+            lambda sql: writers.add(threading.current_thread().name)
+        )
+        setup = PipelineSetup(name="p1", type=CampaignPipeline)
+        first = store.add_pipeline(setup, None, None, 0, 0, 1.0)
+        with pytest.raises(KeyError):
+            with store.transaction():
+                store.add_pipeline(setup, first, first, 1, 0, 1.0)
+                raise KeyError("step failed")
+        store.flush()
+
+        assert writers and all(w.startswith("impress-checkpoint") for w in writers)
+        assert [record["id"] for record in store.unfinished_pipelines()] == [first]
+        store.close()
+
+
+class TestResume:
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_steps(self, tmp_path, engine):
+        """Test that a resumed campaign reruns only unfinished work"""
+        path = str(tmp_path / "campaign.db")
+
+        # First run dies while the fold tasks are in flight
+        engine.hang_on = {"fold"}
+        manager = campaign_manager(path)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                manager.start(
+                    [
+                        PipelineSetup(
+                            name="p1", type=CampaignPipeline, adaptive_fn=spawn_once
+                        )
+                    ]
+                ),
+                timeout=0.5,
+            )
+        for task in manager.pipeline_tasks.values():
+            task.cancel()
+        manager.checkpoint.close()
+
+        assert adaptive_calls == ["p1", "p1-child"]
+        assert engine.names.count("backbone") == 2
+
+        # Resume with a healthy backend
+        engine.hang_on = set()
+        engine.submitted = []
+        resumed = campaign_manager(path)
+        await asyncio.wait_for(resumed.resume(), timeout=2.0)
+
+        # Only the fold steps ran again; adaptive steps and children were not repeated
+        assert engine.names == ["fold", "fold"]
+        assert adaptive_calls == ["p1", "p1-child"]
+        # The store is closed with the run and reopens on use
+        assert resumed.checkpoint._conn is None
+        assert resumed.checkpoint.unfinished_pipelines() == []
+
+    @pytest.mark.asyncio
+    async def test_children_recorded_with_their_adaptive_step(self, tmp_path, engine):
+        """Test that a child requested mid-step is only recorded with the step"""
+        path = str(tmp_path / "campaign.db")
+
+        def recorded():
+            store = CheckpointStore(path)
+            records = store.unfinished_pipelines()
+            store.close()
+            return {r["name"]: [s[0] for s in r["steps"].values()] for r in records}
+
+        engine.hang_on = {"fold"}
+        manager = campaign_manager(path)
+        run = asyncio.create_task(
+            manager.start(
+                [
+                    PipelineSetup(
+                        name="p1", type=CampaignPipeline, adaptive_fn=spawn_then_wait
+                    )
+                ]
+            )
+        )
+        await asyncio.sleep(0.1)
+        # The request was drained, but neither child nor step is recorded yet
+        assert recorded() == {"p1": ["task"]}
+
+        await asyncio.sleep(0.3)
+        steps = recorded()
+        assert list(steps) == ["p1", "p1-child"]
+        assert steps["p1"] == ["task", "adaptive", "task"]
+
+        run.cancel()
+        for task in manager.pipeline_tasks.values():
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_resume_restores_pipeline_attributes(self, tmp_path, engine):
+        """Test that state and counters continue where the crashed run stopped"""
+        path = str(tmp_path / "campaign.db")
+        engine.hang_on = {"fold"}
+        manager = campaign_manager(path)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                manager.start([PipelineSetup(name="p1", type=CampaignPipeline)]),
+                timeout=0.5,
+            )
+        for task in manager.pipeline_tasks.values():
+            task.cancel()
+
+        engine.hang_on = set()
+        resumed = campaign_manager(path)
+        finished = []
+        resumed.admission.release = Mock(side_effect=finished.append)
+        await asyncio.wait_for(resumed.resume(), timeout=2.0)
+
+        pipeline = finished[0]
+        assert pipeline.taskcount == 2
+        assert pipeline.state == {
+            "backbone": "ran backbone 1",
+            "analysed": "ran backbone 1",
+            "length": len("ran backbone 1"),
+            "fold": "ran fold 2",
+        }
+
+    @pytest.mark.asyncio
+    async def test_start_keeps_unfinished_campaign(self, tmp_path, engine):
+        """Test that start() neither silently discards nor replaces a campaign"""
+        path = str(tmp_path / "campaign.db")
+        store = CheckpointStore(path)
+        store.add_pipeline(
+            PipelineSetup(name="old", type=CampaignPipeline), None, None, 0, 0, 1.0
+        )
+        store.close()
+        setups = [PipelineSetup(name="new", type=CampaignPipeline)]
+
+        with pytest.raises(RuntimeError, match="unfinished"):
+            await campaign_manager(path).start(setups)
+
+        finished = []
+        resumed = campaign_manager(path)
+        resumed.admission.release = Mock(side_effect=finished.append)
+        await asyncio.wait_for(resumed.start(setups, resume=True), timeout=2.0)
+        assert [pipeline.name for pipeline in finished] == ["old"]
+
+        store = CheckpointStore(path)
+        store.add_pipeline(setups[0], None, None, 0, 0, 1.0)
+        store.close()
+        finished.clear()
+        overwritten = campaign_manager(path)
+        overwritten.admission.release = Mock(side_effect=finished.append)
+        await asyncio.wait_for(overwritten.start(setups, overwrite=True), timeout=2.0)
+        assert [pipeline.name for pipeline in finished] == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_resume_requires_a_path(self):
+        """Test that resume without any checkpoint file is rejected"""
+        manager = ImpressManager(execution_backend=Mock())
+
+        with pytest.raises(ValueError):
+            await manager.resume()
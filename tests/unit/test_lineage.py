@@ -0,0 +1,126 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.lineage import LineageGraph, LineageServer
+
+
+async def http_get(address, path):
+    """Minimal HTTP client returning (status code, JSON body)"""
+    if address.startswith("unix:"):
+        reader, writer = await asyncio.open_unix_connection(address[len("unix:") :])
+    else:
+        host, port = address.rsplit(":", 1)
+        reader, writer = await asyncio.open_connection(host, int(port))
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: impress\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), json.loads(body)
+
+
+class BranchingPipeline(ImpressBasePipeline):
+    """Root spawns two branches, then looks itself up over HTTP"""
+
+    def __init__(self, name, flow, start_step=1, **kwargs):
+        self.start_step = start_step
+        super().__init__(name, flow, **kwargs)
+
+    async def run(self):
+        await self.run_adaptive_step(wait=True)
+        if self.name == "root":
+            server = self._manager.lineage_server
+            self.state["live"] = await http_get(server.address, "/lineage/root")
+
+    async def finalize(self):
+        pass
+
+
+async def branch(pipeline):
+    if pipeline.name == "root":
+        pipeline.submit_child_pipeline_requests(
+            [
+                {
+                    "name": f"root_b{i}",
+                    "type": BranchingPipeline,
+                    "start_step": 4,
+                    "spawn_reason": f"{i + 1} failing models",
+                }
+                for i in range(2)
+            ]
+        )
+
+
+class TestLineageGraph:
+    def test_tree_queries(self):
+        """Test parent/child links, duplicate names and subtree snapshots"""
+        graph = LineageGraph()
+        root = graph.add("p1")
+        child = graph.add("p1_b1", parent=root, generation=1, spawn_reason="x")
+        grandchild = graph.add("p1_b1_b1", parent=child, generation=2)
+        again = graph.add("p1")
+
+        assert again == "p1#2"
+        assert graph.roots == ["p1", "p1#2"]
+        assert graph.ancestors(grandchild) == [child, root]
+        assert graph.descendants(root) == [child, grandchild]
+
+        graph.started(child)
+        graph.step(child, "fold", 3)
+        graph.finished(grandchild, "killed")
+        snapshot = graph.snapshot(child)
+        assert list(snapshot["pipelines"]) == [child, grandchild]
+        assert snapshot["counts"]["running"] == 1
+        assert snapshot["counts"]["killed"] == 1
+        assert snapshot["pipelines"][child]["step"] == "fold"
+        assert snapshot["pipelines"][child]["spawn_reason"] == "x"
+        assert graph.snapshot("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_server_routes(self, tmp_path):
+        """Test the unix socket endpoint and its error responses"""
+        graph = LineageGraph()
+        graph.add("p1")
+        server = LineageServer(graph.snapshot, f"unix:{tmp_path / 'lineage.sock'}")
+        address = await server.start()
+        try:
+            status, body = await http_get(address, "/lineage")
+            assert (status, body["roots"]) == (200, ["p1"])
+            status, body = await http_get(address, "/lineage/nope")
+            assert status == 404
+        finally:
+            await server.stop()
+
+
+class TestManagerLineage:
+    @pytest.mark.asyncio
+    async def test_live_lineage(self, engine):
+        """Test that the manager records the DAG and serves it while running"""
+        manager = ImpressManager(
+            execution_backend=Mock(),
+            use_colors=False,
+            lineage_endpoint="127.0.0.1:0",
+        )
+        manager.logger = Mock()
+        finished = []
+        manager.admission.release = Mock(side_effect=finished.append)
+        setup = PipelineSetup(name="root", type=BranchingPipeline, adaptive_fn=branch)
+        await asyncio.wait_for(manager.start([setup]), timeout=3.0)
+
+        root = next(p for p in finished if p.name == "root")
+        status, live = root.state["live"]
+        assert status == 200
+        assert live["pipelines"]["root"]["status"] == "running"
+        assert live["pipelines"]["root"]["children"] == ["root_b0", "root_b1"]
+
+        final = manager.lineage_snapshot()
+        assert final["counts"]["completed"] == 3
+        branch_node = final["pipelines"]["root_b1"]
+        assert branch_node["parent"] == "root"
+        assert branch_node["generation"] == 1
+        assert branch_node["start_step"] == 4
+        assert branch_node["spawn_reason"] == "2 failing models"
+        assert branch_node["step"] == "adaptive"
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.loop_monitor import LoopLagMonitor
+
+from .test_manager_life_cycle import MockWorkflowEngine
+
+
+class BlockingPipeline(ImpressBasePipeline):
+    """Pipeline whose local tasks block like a slow CSV read"""
+
+    def __init__(self, name, flow, block=0.0, spawn=False, **kwargs):
+        self.block = block
+        self.spawn = spawn
+        super().__init__(name, flow, **kwargs)
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task(local_task=True)
+        async def check_results():
+            time.sleep(self.block)
+            self.state["worker"] = threading.current_thread().name
+            if self.spawn:
+                self.submit_child_pipeline_request(
+                    {"name": f"{self.name}-child", "type": BlockingPipeline}
+                )
+            return "checked"
+
+        @self.auto_register_task(local_task=True, offload=False)
+        async def cheap():
+            self.state["cheap"] = threading.current_thread().name
+
+    async def run(self):
+        self.state["result"] = await self.check_results()
+        await self.cheap()
+
+    async def finalize(self):
+        pass
+
+
+async def run_manager(setups, **kwargs):
+    manager = ImpressManager(execution_backend=Mock(), **kwargs)
+    manager.logger = Mock()
+    finished = []
+    manager.admission.release = Mock(side_effect=finished.append)
+    with patch("impress.impress_manager.WorkflowEngine", MockWorkflowEngine):
+        await asyncio.wait_for(manager.start(setups), timeout=3.0)
+    return manager, {p.name: p for p in finished}
+
+
+class TestLocalTaskOffloading:
+    @pytest.mark.asyncio
+    async def test_local_tasks_run_on_worker_threads(self):
+        """Test that local tasks leave the event loop unless opted out"""
+        manager, finished = await run_manager(
+            [PipelineSetup(name="p1", type=BlockingPipeline)]
+        )
+
+        state = finished["p1"].state
+        assert state["result"] == "checked"
+        assert state["worker"].startswith("impress-local")
+        assert state["cheap"] == threading.current_thread().name
+        # The pools are shut down with the run
+        assert manager.local_task_executor is None
+
+    @pytest.mark.asyncio
+    async def test_zero_workers_runs_inline(self):
+        """Test that local_task_workers=0 keeps local tasks on the loop"""
+        manager, finished = await run_manager(
+            [PipelineSetup(name="p1", type=BlockingPipeline)], local_task_workers=0
+        )
+
+        assert manager.local_task_executor is None
+        assert finished["p1"].state["worker"] == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_child_requests_from_worker_threads(self):
+        """Test that signals raised on worker threads reach the manager"""
+        _, finished = await run_manager(
+            [PipelineSetup(name="p1", type=BlockingPipeline, kwargs={"spawn": True})]
+        )
+
+        assert set(finished) == {"p1", "p1-child"}
+
+    @pytest.mark.asyncio
+    async def test_offloading_reduces_loop_lag(self):
+        """Test that blocking local tasks only stall the loop when inline"""
+        setups = [
+            PipelineSetup(name=f"p{i}", type=BlockingPipeline, kwargs={"block": 0.1})
+            for i in range(4)
+        ]
+
+        inline, _ = await run_manager(
+            setups, local_task_workers=0, loop_lag_interval=0.005
+        )
+        offloaded, _ = await run_manager(
+            setups, local_task_workers=4, loop_lag_interval=0.005
+        )
+
+        assert inline.loop_lag.metrics()["max_lag_ms"] >= 90
+        assert offloaded.loop_lag.metrics()["max_lag_ms"] < 50
+        offloaded.logger.loop_lag_summary.assert_called_once()
+
+
+class TestLoopLagMonitor:
+    @pytest.mark.asyncio
+    async def test_detects_blocking(self):
+        """Test that a blocked loop shows up as lag"""
+        monitor = LoopLagMonitor(interval=0.005)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.05)
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+        metrics = monitor.metrics()
+        assert metrics["samples"] >= 2
+        assert metrics["max_lag_ms"] >= 40
@@ -0,0 +1,210 @@
+import io
+import json
+import time
+from unittest.mock import patch
+
+from impress.utils.logger import ImpressLogger, JsonLinesSink, LogLevel, LogWriter
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts flushes"""
+
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def make_logger(**kwargs):
+    stream = CountingStream()
+    kwargs.setdefault("writer", LogWriter(flush_interval=0.05))
+    return ImpressLogger(use_colors=False, output_stream=stream, **kwargs), stream
+
+
+class TestImpressLogger:
+    def test_level_filters_before_formatting(self):
+        """Test that messages below the level are never formatted"""
+        logger, stream = make_logger(level="INFO")
+        with patch.object(logger, "_format_message") as format_message:
+            logger.debug("tick")
+            logger.activity_summary(1, 2, 3)
+        logger.flush()
+
+        format_message.assert_not_called()
+        assert stream.getvalue() == ""
+
+    def test_event_helpers_skip_formatting_when_disabled(self):
+        """Test that per-event helpers return before colouring their message"""
+        logger, stream = make_logger(level="WARNING")
+        with patch.object(logger, "_colorize") as colorize:
+            logger.pipeline_started("p1")
+            logger.adaptive_started("p1")
+            logger.adaptive_completed("p1", duration=0.1)
+            logger.child_pipeline_submitted("p1-child", "p1")
+            logger.pipeline_completed("p1", duration=0.2)
+        logger.flush()
+
+        colorize.assert_not_called()
+        assert stream.getvalue() == ""
+
+    def test_batched_background_writes(self):
+        """Test that lines are written off-thread with one flush per batch"""
+        logger, stream = make_logger()
+        for i in range(100):
+            logger.info(f"line {i}")
+        logger.flush()
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 100
+        assert lines[0].endswith("[INFO] [MANAGER] line 0")
+        assert stream.flushes < 10
+
+    def test_rate_limit(self):
+        """Test that repeats are suppressed and the count reported later"""
+        logger, stream = make_logger(rate_limit=3, rate_window=60.0)
+        for _ in range(10):
+            logger.warning("CSV not found", "pipeline")
+        logger.info("other")
+        logger.rate_window = 0.0
+        logger.warning("CSV not found", "pipeline")
+        logger.flush()
+
+        assert stream.getvalue().count("CSV not found") == 4
+        assert "(7 repeats suppressed)" in stream.getvalue()
+
+    def test_suppressed_repeats_reported_on_flush(self):
+        """Test that flush() reports repeats still held back by the limit"""
+        logger, stream = make_logger(rate_limit=3, rate_window=60.0)
+        for _ in range(10):
+            logger.warning("CSV not found", "pipeline", pipeline_name="p1")
+        logger.flush()
+        logger.flush()
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 4
+        assert lines[-1].endswith("[p1] CSV not found (7 repeats suppressed)")
+
+    def test_rate_limit_is_opt_in(self):
+        """Test that identical messages all get through by default"""
+        logger, stream = make_logger()
+        for _ in range(50):
+            logger.warning("CSV not found", "pipeline")
+        logger.flush()
+
+        assert stream.getvalue().count("CSV not found") == 50
+
+    def test_synchronous(self):
+        """Test that the synchronous mode writes in the caller"""
+        logger, stream = make_logger(asynchronous=False, level=LogLevel.DEBUG)
+        logger.debug("now")
+
+        assert "[DEBUG] [MANAGER] now" in stream.getvalue()
+        assert stream.flushes == 1
+
+    def test_writer_close_drains(self):
+        """Test that closing the writer writes pending records"""
+        writer = LogWriter(flush_interval=10.0)
+        logger, stream = make_logger(writer=writer)
+        logger.info("pending")
+        writer.close()
+
+        assert "pending" in stream.getvalue()
+
+    def test_flush_does_not_wait_for_interval(self):
+        """Test that flush and close wake the writer instead of timing out"""
+        writer = LogWriter(flush_interval=10.0)
+        logger, stream = make_logger(writer=writer)
+        started = time.monotonic()
+        logger.info("first")
+        logger.flush()
+        assert "first" in stream.getvalue()
+
+        logger.info("second")
+        writer.close()
+
+        assert "second" in stream.getvalue()
+        assert time.monotonic() - started < 1.0
+
+    def test_backlog_drains_without_waiting(self):
+        """Test that full batches are followed without another interval"""
+        writer = LogWriter(flush_interval=10.0, max_batch=8)
+        logger, stream = make_logger(writer=writer)
+        started = time.monotonic()
+        for i in range(100):
+            logger.info(f"line {i}")
+        logger.flush()
+
+        assert len(stream.getvalue().splitlines()) == 100
+        assert time.monotonic() - started < 1.0
+        writer.close()
+
+
+class TestJsonLinesSink:
+    def read(self, path):
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_structured_records(self, tmp_path):
+        """Test that records carry the structured fields without colours"""
+        sink = JsonLinesSink(str(tmp_path / "run.jsonl"))
+        logger, stream = make_logger(sink=sink, console=False)
+        logger.use_colors = True
+        logger.adaptive_completed("p1", duration=0.25)
+        logger.task_finished("p1", "fold", 3.5, "ok")
+        logger.flush()
+
+        adaptive, task = self.read(tmp_path / "run.jsonl")
+        assert stream.getvalue() == ""
+        assert adaptive["event"] == "adaptive_completed"
+        assert adaptive["pipeline"] == "p1"
+        assert adaptive["duration"] == 0.25
+        assert adaptive["message"] == "Adaptive function completed for: p1"
+        assert (task["level"], task["step"], task["status"]) == ("DEBUG", "fold", "ok")
+        assert set(adaptive) >= {"ts", "level", "component", "step"}
+
+    def test_per_pipeline_files(self, tmp_path):
+        """Test that records shard into one file per pipeline"""
+        sink = JsonLinesSink(str(tmp_path), per_pipeline=True)
+        manager_logger, _ = make_logger(sink=sink, asynchronous=False)
+        pipeline_logger, _ = make_logger(sink=sink, asynchronous=False)
+        pipeline_logger.name = "p/1"
+
+        manager_logger.manager_starting(1)
+        manager_logger.pipeline_started("p/1")
+        pipeline_logger.pipeline_log("folding", step="fold")
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "manager.jsonl",
+            "p_1.jsonl",
+        ]
+        started, folding = self.read(tmp_path / "p_1.jsonl")
+        assert started["event"] == "pipeline_started"
+        assert (folding["component"], folding["step"]) == ("pipeline", "fold")
+
+    def test_rotation(self, tmp_path):
+        """Test that files rotate by size and keep backup_count backups"""
+        path = tmp_path / "run.jsonl"
+        sink = JsonLinesSink(str(path), max_bytes=1000, backup_count=2)
+        logger, _ = make_logger(sink=sink, console=False, rate_limit=0)
+        for i in range(100):
+            logger.info(f"message {i}")
+        logger.flush()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "run.jsonl",
+            "run.jsonl.1",
+            "run.jsonl.2",
+        ]
+        assert all(p.stat().st_size <= 1000 for p in tmp_path.iterdir())
+        assert self.read(path)[-1]["message"] == "message 99"
+
+    def test_sink_level(self, tmp_path):
+        """Test that the sink level is independent of the console level"""
+        sink = JsonLinesSink(str(tmp_path / "run.jsonl"), level="DEBUG")
+        logger, stream = make_logger(sink=sink, level="WARNING")
+        logger.debug("detail")
+        logger.flush()
+
+        assert stream.getvalue() == ""
+        assert self.read(tmp_path / "run.jsonl")[0]["message"] == "detail"
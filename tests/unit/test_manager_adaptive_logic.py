@@ -1,8 +1,13 @@
 import asyncio
-from unittest.mock import AsyncMock
+import threading
+import time
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from impress import ImpressManager
+from impress.utils.tracing import Tracer
+
 from .test_manager_core import MockPipeline
 
 
@@ -62,3 +67,206 @@ class TestAdaptiveFunctions:
         # Check that flags were reset even after exception
         assert pipeline.invoke_adaptive_step is False
         assert pipeline._adaptive_barrier.is_set()
+
+    @pytest.mark.asyncio
+    async def test_untimed_without_consumers(self, mock_execution_backend):
+        """Test that no timestamps are taken without tracing, stats or INFO logs"""
+        manager = ImpressManager(
+            execution_backend=mock_execution_backend,
+            log_level="WARNING",
+            collect_stats=False,
+        )
+        pipeline = MockPipeline("test_pipeline")
+        pipeline._adaptive_fn = AsyncMock()
+        pipeline.invoke_adaptive_step = True
+
+        with patch.object(Tracer, "now") as now:
+            await manager._run_adaptive_fn(pipeline)
+
+        now.assert_not_called()
+        pipeline._adaptive_fn.assert_called_once_with(pipeline)
+        assert pipeline._adaptive_barrier.is_set()
+
+
+def adaptive_pipeline(name, adaptive_fn):
+    pipeline = MockPipeline(name)
+    pipeline._adaptive_fn = adaptive_fn
+    pipeline.invoke_adaptive_step = True
+    pipeline._adaptive_barrier = asyncio.Event()
+    return pipeline
+
+
+class TestAdaptiveExecutor:
+    def test_runs_inline_by_default(self, impress_manager):
+        """Test that adaptive functions only go to a thread pool on request"""
+        assert impress_manager.adaptive_executor is None
+
+    @pytest.mark.asyncio
+    async def test_blocking_adaptive_fn_does_not_block_loop(
+        self, mock_execution_backend
+    ):
+        """Test that an offloaded blocking adaptive function runs off the event loop"""
+        manager = ImpressManager(mock_execution_backend, adaptive_offload=True)
+        manager.logger = Mock()
+        threads = []
+
+        async def blocking(pipeline):
+            threads.append(threading.current_thread().name)
+            time.sleep(0.2)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        await manager._run_adaptive_fn(adaptive_pipeline("p1", blocking))
+        ticking.cancel()
+
+        assert threads[0].startswith("impress-adaptive")
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_timeout_releases_pipeline(self, mock_execution_backend):
+        """Test that a hanging adaptive function is abandoned after the timeout"""
+        manager = ImpressManager(mock_execution_backend, adaptive_timeout=0.05)
+        manager.logger = Mock()
+
+        async def slow(pipeline):
+            await asyncio.sleep(1)
+
+        pipeline = adaptive_pipeline("p1", slow)
+        started = time.perf_counter()
+        await manager._run_adaptive_fn(pipeline)
+
+        assert time.perf_counter() - started < 0.5
+        assert pipeline._adaptive_barrier.is_set()
+        assert pipeline.invoke_adaptive_step is False
+        manager.logger.adaptive_timed_out.assert_called_once_with("p1", 0.05)
+        manager.logger.adaptive_completed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_offloaded_timeout_cancels_call(self, mock_execution_backend):
+        """Test that a timed-out offloaded call is cancelled on its thread"""
+        manager = ImpressManager(
+            mock_execution_backend, adaptive_offload=True, adaptive_timeout=0.05
+        )
+        manager.logger = Mock()
+        manager._bind_loop()
+        cancelled = threading.Event()
+
+        async def waits_forever(pipeline):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        await manager._run_adaptive_fn(adaptive_pipeline("p1", waits_forever))
+
+        assert await asyncio.to_thread(cancelled.wait, 1.0)
+        manager.logger.adaptive_timed_out.assert_called_once_with("p1", 0.05)
+        await manager.loop_lag.stop()
+        manager._shutdown_executors()
+
+    @pytest.mark.asyncio
+    async def test_offloaded_fn_awaiting_manager_future(self, mock_execution_backend):
+        """Test that awaiting a future of the manager's loop is reported"""
+        manager = ImpressManager(mock_execution_backend, adaptive_offload=True)
+        manager.logger = Mock()
+        pending = asyncio.get_running_loop().create_future()
+
+        async def awaits_manager(pipeline):
+            await pending
+
+        await manager._run_adaptive_fn(adaptive_pipeline("p1", awaits_manager))
+
+        (name, error), _ = manager.logger.adaptive_failed.call_args
+        assert name == "p1"
+        assert "awaits_manager" in error and "private loop" in error
+        manager._shutdown_executors()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("offload", [True, False])
+    async def test_concurrency_limit(self, mock_execution_backend, offload):
+        """Test that no more than adaptive_concurrency calls run at once"""
+        manager = ImpressManager(
+            mock_execution_backend, adaptive_concurrency=2, adaptive_offload=offload
+        )
+        manager.logger = Mock()
+        manager._bind_loop()
+
+        running = peak = 0
+        lock = threading.Lock()
+
+        async def tracked(pipeline):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(
+            *(
+                manager._run_adaptive_fn(adaptive_pipeline(f"p{i}", tracked))
+                for i in range(6)
+            )
+        )
+        await manager.loop_lag.stop()
+
+        assert peak == 2
+
+
+def batch_pipeline(name, batch_fn):
+    pipeline = adaptive_pipeline(name, None)
+    pipeline._adaptive_fn_batch = batch_fn
+    return pipeline
+
+
+class TestAdaptiveBatches:
+    @pytest.mark.asyncio
+    async def test_pipelines_within_window_share_one_call(self, mock_execution_backend):
+        """Test that steps requested within the window make a single call"""
+        manager = ImpressManager(
+            mock_execution_backend, adaptive_batch_window=0.05, adaptive_offload=False
+        )
+        manager.logger = Mock()
+        calls = []
+
+        async def rank(pipelines):
+            calls.append([p.name for p in pipelines])
+
+        pipelines = [batch_pipeline(f"p{i}", rank) for i in range(3)]
+        await asyncio.gather(*(manager._run_adaptive_fn(p) for p in pipelines))
+        await manager._run_adaptive_fn(batch_pipeline("late", rank))
+
+        assert calls == [["p0", "p1", "p2"], ["late"]]
+        assert all(p._adaptive_barrier.is_set() for p in pipelines)
+        assert manager._adaptive_batches == {}
+        manager.logger.adaptive_batch_started.assert_any_call("rank", 3)
+
+    @pytest.mark.asyncio
+    async def test_full_batch_and_failure(self, mock_execution_backend):
+        """Test that a full batch closes early and failures reach every member"""
+        manager = ImpressManager(
+            mock_execution_backend, adaptive_batch_window=10.0, adaptive_batch_size=2
+        )
+        manager.logger = Mock()
+
+        async def broken(pipelines):
+            raise RuntimeError("no CSV")
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            manager._run_adaptive_fn(batch_pipeline("p0", broken)),
+            manager._run_adaptive_fn(batch_pipeline("p1", broken)),
+        )
+
+        assert time.perf_counter() - started < 1.0
+        assert manager.logger.adaptive_failed.call_count == 2
+        manager.logger.adaptive_failed.assert_any_call("p1", "no CSV")
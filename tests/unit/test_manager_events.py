@@ -0,0 +1,146 @@
+import asyncio
+import gc
+import statistics
+import time
+from unittest.mock import patch
+
+import pytest
+from radical.asyncflow import NoopExecutionBackend
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+
+from .test_manager_core import MockPipeline
+from .test_manager_life_cycle import MockWorkflowEngine
+
+# Generous bound on the median adaptive round trip of ROUND_TRIP_PIPELINES
+# pipelines; typical figures are a few milliseconds (see
+# benchmarks/bench_manager_events.py)
+ROUND_TRIP_PIPELINES = 200
+ROUND_TRIP_P50_BOUND = 0.05
+
+
+class RoundTripPipeline(ImpressBasePipeline):
+    """Pipeline with no tasks: one adaptive round trip and done"""
+
+    def register_pipeline_tasks(self):
+        pass
+
+    async def run(self):
+        self.state["requested"] = time.perf_counter()
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def record_latency(pipeline):
+    pipeline.state["latency"] = time.perf_counter() - pipeline.state["requested"]
+
+
+class TestManagerEvents:
+    def test_signal_marks_pipeline_dirty(self, impress_manager):
+        """Test that signalling records the pipeline and wakes the loop"""
+        impress_manager._wakeup = asyncio.Event()
+        pipeline = MockPipeline("test_pipeline")
+
+        impress_manager._signal(pipeline)
+
+        assert pipeline in impress_manager._dirty
+        assert impress_manager._wakeup.is_set()
+
+    def test_flags_notify_manager(self, impress_manager):
+        """Test that raising pipeline flags signals the owning manager"""
+        pipeline = MockPipeline("test_pipeline")
+        pipeline._manager = impress_manager
+
+        pipeline.invoke_adaptive_step = True
+        assert pipeline in impress_manager._dirty
+
+        impress_manager._dirty.clear()
+        pipeline.invoke_adaptive_step = False
+        assert pipeline not in impress_manager._dirty
+
+        pipeline.kill_parent = True
+        assert pipeline in impress_manager._dirty
+
+    @pytest.mark.asyncio
+    @patch("impress.impress_manager.WorkflowEngine", MockWorkflowEngine)
+    async def test_adaptive_step_has_no_polling_delay(self, impress_manager):
+        """Test that adaptive steps start as soon as they are requested"""
+        latencies = []
+
+        async def adaptive_fn(pipeline):
+            latencies.append(asyncio.get_event_loop().time() - pipeline.requested)
+
+        class WaitingPipeline(MockPipeline):
+            def __init__(self, name: str, flow=None, **kwargs):
+                super().__init__(name, flow, **kwargs)
+                self._adaptive_barrier = asyncio.Event()
+
+            async def run(self):
+                # Let the manager go idle before requesting the step
+                await asyncio.sleep(0.05)
+                self.requested = asyncio.get_event_loop().time()
+                await self.run_adaptive_step(wait=True)
+
+        pipeline_setup = PipelineSetup(
+            name="waiting_pipeline",
+            type=WaitingPipeline,
+            adaptive_fn=adaptive_fn,
+        )
+
+        await asyncio.wait_for(impress_manager.start([pipeline_setup]), timeout=2.0)
+
+        assert len(latencies) == 1
+        assert latencies[0] < 0.1
+
+    @pytest.mark.asyncio
+    async def test_adaptive_round_trip_latency(self, tmp_path, monkeypatch):
+        """Test that the median adaptive round trip stays within its bound"""
+        monkeypatch.chdir(tmp_path)
+        manager = ImpressManager(NoopExecutionBackend(), use_colors=False)
+        latencies = []
+
+        async def adaptive_fn(pipeline):
+            await record_latency(pipeline)
+            latencies.append(pipeline.state["latency"])
+
+        setups = [
+            PipelineSetup(name=f"p{i}", type=RoundTripPipeline, adaptive_fn=adaptive_fn)
+            for i in range(ROUND_TRIP_PIPELINES)
+        ]
+
+        # A full collection of the test session's heap is not manager work
+        gc.collect()
+        await asyncio.wait_for(manager.start(setups), timeout=30.0)
+        await manager.flow.shutdown()
+
+        assert len(latencies) == ROUND_TRIP_PIPELINES
+        assert statistics.median(latencies) < ROUND_TRIP_P50_BOUND
+
+    @pytest.mark.asyncio
+    async def test_burst_is_handled_in_slices(self, tmp_path, monkeypatch):
+        """Test that adaptive steps start while a burst of signals is handled"""
+        monkeypatch.chdir(tmp_path)
+        manager = ImpressManager(NoopExecutionBackend(), use_colors=False)
+        events = []
+        process = manager._process_pipeline
+
+        def recording_process(pipeline):
+            events.append("process")
+            return process(pipeline)
+
+        async def adaptive_fn(pipeline):
+            events.append("adaptive")
+
+        manager._process_pipeline = recording_process
+        setups = [
+            PipelineSetup(name=f"p{i}", type=RoundTripPipeline, adaptive_fn=adaptive_fn)
+            for i in range(600)
+        ]
+        await asyncio.wait_for(manager.start(setups), timeout=30.0)
+        await manager.flow.shutdown()
+
+        # The first adaptive steps ran before every request had been looked at
+        first_adaptive = events.index("adaptive")
+        assert events[:first_adaptive].count("process") < 600
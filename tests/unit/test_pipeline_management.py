@@ -3,6 +3,9 @@ from unittest.mock import patch
 
 import pytest
 
+from impress import ImpressBasePipeline, PipelineSetup
+from impress.utils.logger import LogLevel
+
 from .test_manager_core import MockPipeline
 from .test_manager_life_cycle import MockWorkflowEngine
 
@@ -116,3 +119,136 @@ class TestChildPipelines:
         # Second retrieval should return None (cleared)
         result2 = pipeline.get_child_pipeline_request()
         assert result2 is None
+
+
+class QueueingPipeline(ImpressBasePipeline):
+    """Pipeline using the real child request queue of the base class"""
+
+    def register_pipeline_tasks(self):
+        pass
+
+    async def run(self):
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+class TestChildPipelineQueue:
+    def test_requests_are_not_overwritten(self):
+        """Test that consecutive child requests are all kept in order"""
+        pipeline = QueueingPipeline("parent")
+
+        pipeline.submit_child_pipeline_request({"name": "child_1"})
+        pipeline.submit_child_pipeline_request({"name": "child_2"})
+
+        assert pipeline.get_child_pipeline_request() == {"name": "child_1"}
+        assert pipeline.get_child_pipeline_requests() == [{"name": "child_2"}]
+        assert pipeline.get_child_pipeline_request() is None
+
+    def test_legacy_single_request_attribute(self, impress_manager):
+        """Test that the old single-request attribute maps onto the queue"""
+        pipeline = QueueingPipeline("parent")
+        pipeline._manager = impress_manager
+        assert pipeline.incoming_child_pipeline_request is None
+
+        pipeline.submit_child_pipeline_request({"name": "child_1"})
+        pipeline.incoming_child_pipeline_request = {"name": "child_2"}
+
+        assert pipeline in impress_manager._dirty
+        assert pipeline.incoming_child_pipeline_request == {"name": "child_2"}
+        pipeline.incoming_child_pipeline_request = None
+        assert pipeline.get_child_pipeline_requests() == []
+
+    def test_bulk_submission_notifies_manager_once(self, impress_manager):
+        """Test that a bulk submission queues every request"""
+        pipeline = QueueingPipeline("parent")
+        pipeline._manager = impress_manager
+
+        pipeline.submit_child_pipeline_requests(
+            [{"name": f"child_{i}"} for i in range(3)]
+        )
+
+        assert pipeline in impress_manager._dirty
+        assert [r["name"] for r in pipeline.get_child_pipeline_requests()] == [
+            "child_0",
+            "child_1",
+            "child_2",
+        ]
+
+    @pytest.mark.asyncio
+    @patch("impress.impress_manager.WorkflowEngine", MockWorkflowEngine)
+    async def test_fan_out_children_in_one_step(self, impress_manager):
+        """Test that one adaptive step can spawn several children"""
+
+        async def fan_out(pipeline):
+            if pipeline.name != "parent":
+                return
+            pipeline.submit_child_pipeline_requests(
+                [{"name": f"branch_{i}", "type": QueueingPipeline} for i in range(4)]
+            )
+
+        submitted_batches = []
+        original_submit = impress_manager.submit_new_pipelines
+
+        def tracking_submit(setups):
+            submitted_batches.append([setup.name for setup in setups])
+            original_submit(setups)
+
+        impress_manager.submit_new_pipelines = tracking_submit
+
+        pipeline_setup = PipelineSetup(
+            name="parent", type=QueueingPipeline, adaptive_fn=fan_out
+        )
+        await asyncio.wait_for(impress_manager.start([pipeline_setup]), timeout=3.0)
+
+        assert submitted_batches[1] == [f"branch_{i}" for i in range(4)]
+        assert len(impress_manager.pipeline_tasks) == 0
+
+
+class TestCompactPipelines:
+    def test_idle_pipeline_allocates_nothing_lazily_created(self):
+        """Test that logger, barrier and tables are only created when used"""
+        pipeline = QueueingPipeline("idle")
+
+        assert set(vars(pipeline)) == set()
+        assert pipeline.incoming_child_pipeline_requests is None
+        for attribute in ("_logger", "_barrier", "_inflight", "_cached_tasks"):
+            assert not hasattr(pipeline, attribute)
+
+        assert pipeline.logger.name == "idle"
+        assert pipeline.logger is pipeline.logger
+        assert pipeline._adaptive_barrier is pipeline._adaptive_barrier
+        assert pipeline.logger.level_colors is QueueingPipeline("x").logger.level_colors
+
+    def test_logger_uses_manager_settings(self, impress_manager):
+        """Test that a lazily created logger picks up the manager's log settings"""
+        impress_manager.log_level = LogLevel.ERROR
+        impress_manager.log_console = False
+        pipeline = QueueingPipeline("p1")
+        pipeline._manager = impress_manager
+
+        assert pipeline.logger.level is LogLevel.ERROR
+        assert pipeline.logger.console is False
+
+    def test_snapshot_covers_slots_and_subclass_attributes(self):
+        """Test that checkpoint snapshots still include slot attributes"""
+        pipeline = QueueingPipeline("p1")
+        pipeline.state["score"] = 0.5
+        pipeline.taskcount = 3
+
+        snapshot = pipeline.checkpoint_snapshot()
+        assert snapshot["state"] == {"score": 0.5}
+        assert snapshot["name"] == "p1"
+        assert snapshot["taskcount"] == 3
+
+        # Kill and lineage bookkeeping belongs to the run, not the snapshot
+        pipeline._killed_at = 12.5
+        pipeline._generation, pipeline._priority, pipeline._share = 1, 2, 0.5
+        assert not {"_killed_at", "_generation", "_priority", "_share"} & set(
+            pipeline.checkpoint_snapshot()
+        )
+
+        restored = QueueingPipeline("p1")
+        restored.restore_checkpoint_snapshot(snapshot)
+        assert (restored.state, restored.taskcount) == ({"score": 0.5}, 3)
@@ -0,0 +1,148 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from pydantic import ValidationError
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup, pipeline_task
+
+
+class ClassTaskPipeline(ImpressBasePipeline):
+    """Pipeline declaring its tasks on the class"""
+
+    def __init__(self, name, flow, events=None, **kwargs):
+        self.events = events if events is not None else []
+        super().__init__(name, flow, **kwargs)
+
+    @pipeline_task()
+    async def fold(self, target, task_description={"gpus_per_rank": 1}):  # noqa: B006
+        return f"fold {self.name} {target}"
+
+    @pipeline_task(local_task=True, offload=False)
+    async def check(self):
+        return self.name
+
+    async def on_prepare(self):
+        self.events.append("prepare")
+
+    async def run(self):
+        self.events.append("run")
+        self.state["check"] = await self.check()
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+class TestPipelineTask:
+    @pytest.mark.asyncio
+    async def test_decorated_once_per_class_and_flow(self, workflow_engine):
+        """Test that pipelines share the flow task but bind their own state"""
+        pipelines = [ClassTaskPipeline(f"p{i}", workflow_engine) for i in range(3)]
+
+        commands = await asyncio.gather(*[p.fold("x") for p in pipelines])
+
+        assert commands == ["fold p0 x", "fold p1 x", "fold p2 x"]
+        assert workflow_engine.decorated == ["fold"]
+        assert pipelines[0].fold is pipelines[0].fold
+
+    @pytest.mark.asyncio
+    async def test_local_task_and_resource_demand(self, workflow_engine):
+        """Test that local tasks bind the pipeline and demand is class-wide"""
+        pipeline = ClassTaskPipeline("p1", workflow_engine)
+
+        assert await pipeline.check() == "p1"
+        assert pipeline.get_resource_demand()["gpus"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prepare_runs_before_run(self, engine):
+        """Test that the manager awaits on_prepare() before run()"""
+        events = []
+        manager = ImpressManager(execution_backend=Mock(), use_colors=False)
+        manager.logger = Mock()
+        setup = PipelineSetup(
+            name="p1", type=ClassTaskPipeline, kwargs={"events": events}
+        )
+        await asyncio.wait_for(manager.start([setup]), timeout=3.0)
+
+        assert events == ["prepare", "run"]
+
+    @pytest.mark.asyncio
+    async def test_task_named_prepare(self, engine):
+        """Test that a task named prepare does not shadow the on_prepare hook"""
+        events = []
+
+        class PreparingPipeline(ClassTaskPipeline):
+            @pipeline_task(local_task=True, offload=False)
+            async def prepare(self):
+                self.events.append("prepare task")
+
+            async def run(self):
+                await self.prepare()
+                await super().run()
+
+        manager = ImpressManager(execution_backend=Mock(), use_colors=False)
+        manager.logger = Mock()
+        setup = PipelineSetup(
+            name="p1", type=PreparingPipeline, kwargs={"events": events}
+        )
+        await asyncio.wait_for(manager.start([setup]), timeout=3.0)
+
+        assert events == ["prepare", "prepare task", "run"]
+
+
+class TestUnvalidatedSetups:
+    def test_from_dict_without_validation(self):
+        """Test that unvalidated setups get fresh defaults and no parent"""
+        first = PipelineSetup.from_dict(
+            {"name": "c1", "type": ClassTaskPipeline, "events": []}, validate=False
+        )
+        second = PipelineSetup.from_dict(
+            {"name": "c2", "type": ClassTaskPipeline}, validate=False
+        )
+
+        assert (first.name, first.kwargs, first.share) == ("c1", {"events": []}, 1.0)
+        assert first.config is not second.config
+        assert first._parent is None
+
+    def test_only_validated_setups_reject_bad_types(self):
+        """Test that validation is what catches an invalid pipeline type"""
+        with pytest.raises(ValidationError):
+            PipelineSetup.from_dict({"name": "c1", "type": dict})
+
+        assert (
+            PipelineSetup.from_dict({"name": "c1", "type": dict}, validate=False).type
+            is dict
+        )
+
+    @pytest.mark.asyncio
+    async def test_manager_spawns_unvalidated_children(self, engine):
+        """Test that children spawn with validate_child_setups=False"""
+
+        async def fan_out(pipeline):
+            if pipeline.name == "parent":
+                pipeline.submit_child_pipeline_requests(
+                    [
+                        {"name": f"child_{i}", "type": ClassTaskPipeline}
+                        for i in range(3)
+                    ]
+                )
+
+        manager = ImpressManager(
+            execution_backend=Mock(), use_colors=False, validate_child_setups=False
+        )
+        manager.logger = Mock()
+        finished = []
+        manager.admission.release = Mock(side_effect=finished.append)
+        setup = PipelineSetup(
+            name="parent", type=ClassTaskPipeline, adaptive_fn=fan_out
+        )
+        await asyncio.wait_for(manager.start([setup]), timeout=3.0)
+
+        assert sorted(p.name for p in finished) == [
+            "child_0",
+            "child_1",
+            "child_2",
+            "parent",
+        ]
+        assert all(p.state["check"] == p.name for p in finished)
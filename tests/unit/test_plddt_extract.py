@@ -0,0 +1,262 @@
+import csv
+import importlib.util
+import json
+import operator
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPT = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "protien_binding_usecase"
+    / "plddt_extract_pipeline.py"
+)
+
+
+@pytest.fixture(scope="module")
+def plddt_extract():
+    spec = importlib.util.spec_from_file_location("plddt_extract_pipeline", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Let the scoring pool's workers unpickle score_model by reference
+    sys.modules[spec.name] = module
+    yield module
+    del sys.modules[spec.name]
+
+
+def loop_interface_pae(values3, target_length=10):
+    """The cell-by-cell loop the script used before vectorization"""
+    length = values3.shape[0]
+    running_sum = 0
+    counter2 = 0
+    target_range = range(length - target_length, length)
+    for row_index, row in enumerate(values3):
+        for col_index, _ in enumerate(row):
+            if operator.xor(row_index in target_range, col_index in target_range):
+                running_sum += values3[row_index][col_index]
+                counter2 += 1
+    return running_sum / counter2
+
+
+def pae_matrix(length, dtype, seed):
+    rng = np.random.default_rng(seed)
+    return (rng.random((length, length)) * 31.75).astype(dtype)
+
+
+class TestInterfacePae:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    @pytest.mark.parametrize("length,target_length", [(12, 10), (97, 10), (150, 33)])
+    def test_bit_identical_to_loop(self, plddt_extract, dtype, length, target_length):
+        """Test that the masked sum matches the original loop exactly"""
+        pae = pae_matrix(length, dtype, seed=length)
+        starts = plddt_extract.chain_starts_from_arg(f"-{target_length}", length)
+
+        expected = loop_interface_pae(pae, target_length)
+        result = plddt_extract.interface_pae(pae, starts)
+
+        assert result.dtype == expected.dtype
+        assert result == expected
+
+    def test_multiple_chains(self, plddt_extract):
+        """Test that every pair of residues on different chains is averaged"""
+        pae = pae_matrix(9, np.float64, seed=1)
+        chain = np.array([0, 0, 0, 1, 1, 2, 2, 2, 2])
+        expected = pae[chain[:, None] != chain[None, :]].mean()
+
+        starts = plddt_extract.chain_starts_from_arg("5,3", 9)
+
+        assert starts == [3, 5]
+        assert plddt_extract.interface_pae(pae, starts) == pytest.approx(expected)
+
+    def test_single_chain_rejected(self, plddt_extract):
+        """Test that a matrix without inter-chain pairs raises"""
+        with pytest.raises(ValueError, match="no inter-chain"):
+            plddt_extract.interface_pae(np.ones((4, 4)), [])
+
+
+def pdb_line(serial, name, residue, b_factor, chain="A"):
+    return (
+        f"ATOM  {serial:>5}  {name:<3} GLY {chain}{residue:>4}    "
+        f"{0.0:>8.3f}{0.0:>8.3f}{0.0:>8.3f}{1.0:>6.2f}{b_factor:>6.2f}"
+        f"           {name[0]}  \n"
+    )
+
+
+def write_model(path, b_factors, chain_of=lambda residue: "A"):
+    """One residue per row of ``b_factors`` (N, CA, C, O)"""
+    lines = []
+    for residue, row in enumerate(b_factors, start=1):
+        for name, b_factor in zip(("N", "CA", "C", "O"), row):
+            lines.append(
+                pdb_line(len(lines) + 1, name, residue, b_factor, chain_of(residue))
+            )
+    path.write_text("".join(lines) + "TER\nEND\n")
+
+
+class TestBackboneBFactors:
+    def test_average_plddt(self, plddt_extract, tmp_path):
+        """Test that residues average their N, CA and C B-factors"""
+        rows = [[90.0, 92.5, 91.0, 10.0], [70.25, 71.0, 69.5, 10.0], [50.0] * 4]
+        write_model(tmp_path / "model.pdb", rows, lambda r: "A" if r < 3 else "B")
+
+        plddt, residues = plddt_extract.average_plddt(tmp_path / "model.pdb")
+
+        per_residue = [(0.0 + n + ca + c) / 3 for n, ca, c, _ in rows]
+        assert residues == 3
+        assert plddt == (per_residue[0] + per_residue[1] + per_residue[2]) / 3
+
+    def test_chain_and_residue_boundaries(self, plddt_extract, tmp_path):
+        """Test that equal residue numbers on different chains stay apart"""
+        path = tmp_path / "model.pdb"
+        path.write_text(
+            pdb_line(1, "N", 1, 10.0, "A")
+            + pdb_line(2, "CA", 1, 20.0, "A")
+            + pdb_line(3, "N", 1, 30.0, "B")
+            + pdb_line(4, "C", 1, 40.0, "B")
+        )
+
+        backbone = plddt_extract.read_backbone_b_factors(path)
+
+        assert backbone.tolist() == [[10.0, 20.0, 0.0], [30.0, 0.0, 40.0]]
+
+    def test_empty_model(self, plddt_extract, tmp_path):
+        """Test that a model without ATOM records has no residues"""
+        (tmp_path / "empty.pdb").write_text("END\n")
+
+        assert plddt_extract.average_plddt(tmp_path / "empty.pdb") == (0.0, 0)
+
+
+def write_prediction(base, name, b_factor, pae):
+    """Best model, ranking JSON and top-ranked result pickle of one design"""
+    prediction = base / "af_pipeline_outputs_multi" / "p1" / "af/prediction"
+    for sub in ("best_models", "best_ptm", f"dimer_models/{name}"):
+        (prediction / sub).mkdir(parents=True, exist_ok=True)
+    write_model(prediction / f"best_models/{name}.pdb", [[b_factor] * 3 + [0.0]])
+    (prediction / f"best_ptm/{name}.json").write_text(
+        json.dumps(
+            {
+                "iptm+ptm": {"model_1": 0.5, "model_2": 0.75},
+                "order": ["model_2", "model_1"],
+            }
+        )
+    )
+    with open(prediction / f"dimer_models/{name}/result_model_2.pkl", "wb") as f:
+        pickle.dump({"predicted_aligned_error": pae}, f)
+
+
+def read_stats(base, iteration):
+    with open(base / f"af_stats_p1_pass_{iteration}.csv") as f:
+        return list(csv.reader(f))
+
+
+class TestScoring:
+    @pytest.fixture
+    def run_s5(self, plddt_extract, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setitem(sys.modules, "pyrosetta", None)
+        scored = []
+        score_model = plddt_extract.score_model
+
+        def counting_score_model(pdb_path, *args):
+            scored.append(Path(pdb_path).name)
+            return score_model(pdb_path, *args)
+
+        def run(iteration=1, workers=1):
+            """Run s5; with one worker, return the models that were scored"""
+            scored.clear()
+            if workers == 1:
+                monkeypatch.setattr(plddt_extract, "score_model", counting_score_model)
+            else:
+                monkeypatch.setattr(plddt_extract, "score_model", score_model)
+            monkeypatch.setattr(
+                sys,
+                "argv",
+                ["s5", f"--path={tmp_path}", f"--iter={iteration}", "--out=p1"]
+                + [f"--workers={workers}"],
+            )
+            plddt_extract.main()
+            return sorted(scored)
+
+        return run
+
+    def test_main_without_pyrosetta(self, tmp_path, run_s5):
+        """Test that the s5 script scores models with NumPy alone"""
+        pae = pae_matrix(20, np.float32, seed=3)
+        write_prediction(tmp_path, "design", 80.0, pae)
+
+        run_s5()
+
+        rows = read_stats(tmp_path, 1)
+        assert rows[0] == ["ID", "avg_plddt", "ptm", "avg_pae"]
+        assert rows[1][:3] == ["design.pdb", "80.0", "0.75"]
+        assert float(rows[1][3]) == pytest.approx(loop_interface_pae(pae))
+
+    def test_process_pool(self, tmp_path, run_s5):
+        """Test that models scored in worker processes are all written"""
+        for i in range(3):
+            write_prediction(tmp_path, f"d{i}", 60.0 + i, pae_matrix(20, float, i))
+
+        run_s5(workers=2)
+
+        rows = read_stats(tmp_path, 1)
+        assert sorted(row[:2] for row in rows[1:]) == [
+            ["d0.pdb", "60.0"],
+            ["d1.pdb", "61.0"],
+            ["d2.pdb", "62.0"],
+        ]
+
+    def test_rerun_appends_new_models_only(self, tmp_path, run_s5):
+        """Test that a rerun of the same pass appends rows for new models"""
+        write_prediction(tmp_path, "d0", 60.0, pae_matrix(20, float, 0))
+        assert run_s5() == ["d0.pdb"]
+
+        write_prediction(tmp_path, "d1", 70.0, pae_matrix(20, float, 1))
+        assert run_s5() == ["d1.pdb"]
+
+        rows = read_stats(tmp_path, 1)
+        assert [row[0] for row in rows] == ["ID", "d0.pdb", "d1.pdb"]
+
+    def test_unchanged_models_come_from_cache(self, tmp_path, run_s5):
+        """Test that the next pass rescores only models whose files changed"""
+        write_prediction(tmp_path, "d0", 60.0, pae_matrix(20, float, 0))
+        write_prediction(tmp_path, "d1", 70.0, pae_matrix(20, float, 1))
+        run_s5(iteration=1)
+
+        write_prediction(tmp_path, "d1", 75.0, pae_matrix(20, float, 1))
+        assert run_s5(iteration=2) == ["d1.pdb"]
+
+        first, second = read_stats(tmp_path, 1), read_stats(tmp_path, 2)
+        assert sorted(second) == sorted(
+            [
+                row if row[0] != "d1.pdb" else ["d1.pdb", "75.0", *row[2:]]
+                for row in first
+            ]
+        )
+
+    def test_rewritten_result_pickle_is_rescored(self, tmp_path, run_s5):
+        """Test that a new result pickle invalidates the cached scores"""
+        write_prediction(tmp_path, "d0", 60.0, pae_matrix(20, float, 0))
+        run_s5(iteration=1)
+
+        pae = pae_matrix(20, float, 5)
+        with open(
+            tmp_path / "af_pipeline_outputs_multi/p1/af/prediction"
+            "/dimer_models/d0/result_model_2.pkl",
+            "wb",
+        ) as f:
+            pickle.dump({"predicted_aligned_error": pae}, f)
+
+        assert run_s5(iteration=2) == ["d0.pdb"]
+        assert float(read_stats(tmp_path, 2)[1][3]) == pytest.approx(
+            loop_interface_pae(pae)
+        )
+
+    def test_workers_default_to_cpu_affinity(self, plddt_extract, monkeypatch):
+        """Test that only the CPUs the task may use are counted"""
+        monkeypatch.setattr(plddt_extract.os, "sched_getaffinity", lambda pid: {0, 3})
+
+        assert plddt_extract.available_cpus() == 2
@@ -0,0 +1,199 @@
+import importlib
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from impress.utils.admission import AdmissionController
+
+
+@pytest.fixture
+def protein_binding(monkeypatch):
+    monkeypatch.setenv("USER", "impress")
+    return importlib.import_module("impress.pipelines.protein_binding")
+
+
+def make_pipeline(protein_binding, flow, tmp_path, lengths, gpus=None, **kwargs):
+    pipeline = protein_binding.ProteinBindingPipeline(
+        "p1",
+        flow,
+        base_path=str(tmp_path),
+        iter_seqs={target: [["A" * n, 1.0]] for target, n in lengths.items()},
+        **kwargs,
+    )
+    pipeline._manager = Mock(
+        task_scheduler=None, admission=AdmissionController(gpus=gpus)
+    )
+    pipeline.logger = Mock()
+    return pipeline
+
+
+def fasta_batches(flow):
+    """The FASTA files of every submitted s4 command, in submission order"""
+    return [command.split()[3].split(",") for command in flow.commands]
+
+
+LENGTHS = {"t1": 120, "t2": 80, "t3": 100, "t4": 60, "t5": 90}
+
+
+class TestFoldBatches:
+    @pytest.mark.asyncio
+    async def test_one_task_per_target_by_default(
+        self, protein_binding, tmp_path, workflow_engine
+    ):
+        """Test that without batching every target gets its own s4 task"""
+        pipeline = make_pipeline(
+            protein_binding, workflow_engine, tmp_path, LENGTHS, gpus=2
+        )
+
+        await pipeline.run_alphafold(list(LENGTHS))
+
+        assert fasta_batches(workflow_engine) == [
+            [f"{target}.fa"] for target in LENGTHS
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batches_follow_gpu_slots_and_length(
+        self, protein_binding, tmp_path, workflow_engine
+    ):
+        """Test that targets are sorted by length and spread over the GPUs"""
+        pipeline = make_pipeline(
+            protein_binding,
+            workflow_engine,
+            tmp_path,
+            LENGTHS,
+            gpus=2,
+            fold_batching=True,
+        )
+
+        await pipeline.run_alphafold(list(LENGTHS))
+
+        assert sorted(fasta_batches(workflow_engine)) == [
+            ["t3.fa", "t1.fa"],
+            ["t4.fa", "t2.fa", "t5.fa"],
+        ]
+        for _, command, description in workflow_engine.submitted:
+            targets = [name[:-3] for name in command.split()[3].split(",")]
+            # Every target of the batch gets its best model collected
+            assert len(description["post_exec"]) == 3 * len(targets)
+            for target in targets:
+                assert any(f"/{target}/" in cp for cp in description["post_exec"])
+
+    @pytest.mark.asyncio
+    async def test_explicit_batch_size(
+        self, protein_binding, tmp_path, workflow_engine
+    ):
+        """Test that fold_batch_size overrides the GPU slot count"""
+        pipeline = make_pipeline(
+            protein_binding,
+            workflow_engine,
+            tmp_path,
+            LENGTHS,
+            gpus=8,
+            fold_batching=True,
+            fold_batch_size=4,
+        )
+
+        await pipeline.run_alphafold(list(LENGTHS))
+
+        assert sorted(map(len, fasta_batches(workflow_engine))) == [1, 4]
+
+    def test_unknown_gpu_count(self, protein_binding, tmp_path, workflow_engine):
+        """Test that without declared GPUs every target gets its own batch"""
+        pipeline = make_pipeline(
+            protein_binding, workflow_engine, tmp_path, LENGTHS, fold_batching=True
+        )
+
+        assert pipeline.gpu_slots() is None
+        assert pipeline.fold_batches(list(LENGTHS)) == [
+            ["t4"],
+            ["t2"],
+            ["t5"],
+            ["t3"],
+            ["t1"],
+        ]
+
+        pipeline.fold_batch_size = 2
+        assert pipeline.fold_batches(list(LENGTHS)) == [
+            ["t4", "t2"],
+            ["t5", "t3"],
+            ["t1"],
+        ]
+
+
+def write_mpnn_output(pipeline, target, scores):
+    seqs_dir = f"{pipeline.output_path_mpnn}/job_{pipeline.passes}/seqs"
+    os.makedirs(seqs_dir, exist_ok=True)
+    lines = [">input, score=9.9, global_score=9.9", "NATIVE"]
+    for i, score in enumerate(scores):
+        lines += [f">T=0.1, sample={i + 1}, score={score}, seq_recovery=0.5", f"S{i}"]
+    with open(f"{seqs_dir}/{target}.fa", "w") as fd:
+        fd.write("\n".join(lines) + "\n")
+
+
+class TestSequenceRanking:
+    @pytest.mark.asyncio
+    async def test_keeps_best_ranks_in_order(
+        self, protein_binding, tmp_path, workflow_engine
+    ):
+        """Test that s2 keeps the best-scored sequences the lineage can use"""
+        pipeline = make_pipeline(
+            protein_binding, workflow_engine, tmp_path, {}, seq_rank=1, sub_order=1
+        )
+        pipeline._manager = None
+        scores = [0.9, 0.4, 1.2, 0.4, 0.7, 0.3, 1.0, 0.8]
+        write_mpnn_output(pipeline, "t1", scores)
+
+        await pipeline.s2()
+
+        # Ranks 0-1 for this pipeline, then one per further sub-pipeline level
+        assert pipeline.seqs_to_keep() == 4
+        assert pipeline.iter_seqs["t1"] == [
+            ["S5", 0.3],
+            ["S1", 0.4],
+            ["S3", 0.4],
+            ["S4", 0.7],
+        ]
+
+    def test_streaming_parser(self, protein_binding, tmp_path, workflow_engine):
+        """Test that the parser skips the input record and tags scores"""
+        pipeline = make_pipeline(protein_binding, workflow_engine, tmp_path, {})
+        write_mpnn_output(pipeline, "t1", [0.5, 0.25])
+
+        seqs = protein_binding.read_mpnn_fasta(
+            f"{pipeline.output_path_mpnn}/job_1/seqs/t1.fa"
+        )
+
+        assert next(seqs) == ["S0", 0.5]
+        assert list(seqs) == [["S1", 0.25]]
+
+
+class TestScoringTask:
+    @pytest.mark.asyncio
+    async def test_workers_match_requested_cores(
+        self, protein_binding, tmp_path, workflow_engine
+    ):
+        """Test that s5 starts as many scoring processes as it asks cores for"""
+        pipeline = make_pipeline(
+            protein_binding, workflow_engine, tmp_path, {}, score_workers=6
+        )
+
+        await pipeline.s5(task_description=pipeline.s5_description())
+
+        _, command, description = workflow_engine.submitted[0]
+        assert "--workers=6" in command.split()
+        assert description["cores_per_rank"] == 6
+
+
+class TestKilledPipeline:
+    @pytest.mark.asyncio
+    async def test_on_kill_runs_finalize(
+        self, protein_binding, tmp_path, workflow_engine
+    ):
+        """Test that killing the pipeline still runs its finalize() cleanup"""
+        pipeline = make_pipeline(protein_binding, workflow_engine, tmp_path, {})
+        pipeline.current_scores = {"t1": 0.5}
+
+        await pipeline.on_kill()
+
+        assert pipeline.previous_scores == {"t1": 0.5}
@@ -0,0 +1,303 @@
+import asyncio
+import heapq
+from unittest.mock import Mock, patch
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.scheduler import (
+    FairShareQueue,
+    ResourcePool,
+    TaskScheduler,
+    task_demand,
+)
+
+from .test_manager_life_cycle import MockWorkflowEngine
+
+
+class StubPipeline:
+    """Lightweight pipeline stand-in carrying scheduling lineage"""
+
+    def __init__(self, name, root=None, priority=0, generation=0, share=1.0):
+        self.name = name
+        self._lineage_root = root or self
+        self._priority = priority
+        self._generation = generation
+        self._share = share
+
+
+make_pipeline = StubPipeline
+
+
+class TestFairShareQueue:
+    def test_priority_wins(self):
+        """Test that higher priority items are released first"""
+        queue = FairShareQueue()
+        queue.push("low", "a", priority=0)
+        queue.push("high", "b", priority=5)
+
+        assert queue.pop() == "high"
+        assert queue.pop() == "low"
+        assert len(queue) == 0
+
+    def test_shallow_generations_first_within_lineage(self):
+        """Test that root work of a lineage precedes its deep branches"""
+        queue = FairShareQueue()
+        queue.push("branch", "a", depth=3)
+        queue.push("root", "a", depth=0)
+
+        assert [queue.pop(), queue.pop()] == ["root", "branch"]
+
+    def test_lineage_usage_is_weighted(self):
+        """Test that the least served lineage (per weight) goes first"""
+        queue = FairShareQueue()
+        queue.push("a1", "a", weight=1.0)
+        queue.push("b1", "b", weight=2.0)
+        queue.set_usage("a", 0.4)
+        queue.set_usage("b", 0.6)
+
+        # b: 0.6 / 2.0 = 0.3 < a: 0.4 / 1.0
+        assert queue.pop() == "b1"
+
+    def test_fifo_policy(self):
+        """Test that the fifo policy ignores priority and usage"""
+        queue = FairShareQueue(policy="fifo")
+        queue.push("first", "a", priority=0)
+        queue.push("second", "b", priority=9)
+        queue.set_usage("a", 1.0)
+
+        assert [queue.pop(), queue.pop()] == ["first", "second"]
+
+    def test_unknown_policy(self):
+        """Test that unknown policies are rejected"""
+        with pytest.raises(ValueError, match="Unknown scheduling policy"):
+            FairShareQueue(policy="random")
+
+    def test_pop_empty(self):
+        """Test popping an empty queue"""
+        with pytest.raises(IndexError):
+            FairShareQueue().pop()
+
+
+class TestResourcePool:
+    def test_dominant_share(self):
+        """Test that usage is the largest fraction of any capped resource"""
+        pool = ResourcePool(gpus=4, cpus=100)
+        pool.acquire("a", {"gpus": 1, "cpus": 50})
+
+        assert pool.share("a") == 0.5
+        assert pool.share("b") == 0.0
+
+        pool.release("a", {"gpus": 1, "cpus": 50})
+        assert pool.share("a") == 0.0
+
+
+def simulate(policy):
+    """
+    Virtual-time simulation of a 2-GPU allocation.
+
+    Campaign A has fanned out into 12 deep branch tasks at t=0, campaign B
+    submits 4 root tasks at t=1. Every task takes 10 time units.
+    """
+    scheduler = TaskScheduler(gpus=2, policy=policy)
+    campaign_a = make_pipeline("a")
+    branch = make_pipeline("a_b1", root=campaign_a, generation=2)
+    campaign_b = make_pipeline("b")
+
+    clock = 0.0
+    events = []
+    finished = {"a": [], "b": []}
+    seq = 0
+
+    def submit(pipeline, lineage):
+        description = {"gpus_per_rank": 1}
+        demand = scheduler.pool.clamp(task_demand(description))
+
+        def on_release():
+            nonlocal seq
+            seq += 1
+            heapq.heappush(events, (clock + 10, seq, pipeline, lineage, demand))
+            return True
+
+        scheduler.submit(pipeline, description, on_release, clock)
+
+    for _ in range(12):
+        submit(branch, "a")
+
+    clock = 1.0
+    for _ in range(4):
+        submit(campaign_b, "b")
+
+    busy_time = 0.0
+    while events:
+        clock, _, pipeline, lineage, demand = heapq.heappop(events)
+        busy_time += 10 * demand["gpus"]
+        finished[lineage].append(clock)
+        scheduler.release(pipeline, demand, clock)
+
+    makespan = clock
+    return {
+        "makespan": makespan,
+        "throughput": 16 / makespan,
+        "utilization": busy_time / (2 * makespan),
+        "b_done": max(finished["b"]),
+    }
+
+
+class TestSchedulingSimulation:
+    def test_fair_share_protects_root_campaign(self):
+        """Test that fair share shortens B's makespan without losing throughput"""
+        fifo = simulate("fifo")
+        fair = simulate("fair")
+
+        # FIFO makes B wait behind all of A's branches
+        assert fifo["b_done"] == 80
+        # Fair share interleaves the two campaigns as soon as slots free up
+        assert fair["b_done"] == 50
+
+        # Scheduling is work conserving: same makespan, throughput, utilization
+        assert fair["makespan"] == fifo["makespan"] == 80
+        assert fair["throughput"] == fifo["throughput"]
+        assert fair["utilization"] == fifo["utilization"] == 1.0
+
+
+class TestTaskScheduler:
+    @pytest.mark.asyncio
+    async def test_run_waits_for_slots(self):
+        """Test that tasks beyond the GPU slots wait for a release"""
+        scheduler = TaskScheduler(gpus=1)
+        pipeline = make_pipeline("p")
+        running, peak = 0, 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "done"
+
+        results = await asyncio.gather(
+            *[scheduler.run(pipeline, {"gpus_per_rank": 1}, work) for _ in range(3)]
+        )
+
+        assert results == ["done"] * 3
+        assert peak == 1
+        assert scheduler.metrics()["released_tasks"] == 3
+        assert scheduler.pool.in_use["gpus"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_slot(self):
+        """Test that a task cancelled while queued does not leak its slot"""
+        scheduler = TaskScheduler(gpus=1)
+        pipeline = make_pipeline("p")
+        gate = asyncio.Event()
+
+        async def blocking():
+            await gate.wait()
+
+        first = asyncio.ensure_future(
+            scheduler.run(pipeline, {"gpus_per_rank": 1}, blocking)
+        )
+        second = asyncio.ensure_future(
+            scheduler.run(pipeline, {"gpus_per_rank": 1}, blocking)
+        )
+        await asyncio.sleep(0)
+
+        second.cancel()
+        gate.set()
+        await first
+        with pytest.raises(asyncio.CancelledError):
+            await second
+
+        assert scheduler.pool.in_use["gpus"] == 0
+        assert len(scheduler.queue) == 0
+
+
+class LineagePipeline(ImpressBasePipeline):
+    """Pipeline that spawns one child through its adaptive step"""
+
+    def register_pipeline_tasks(self):
+        pass
+
+    async def run(self):
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+class TestManagerLineage:
+    @pytest.mark.asyncio
+    @patch("impress.impress_manager.WorkflowEngine", MockWorkflowEngine)
+    async def test_children_inherit_lineage(self, impress_manager):
+        """Test that children record their root campaign, depth and priority"""
+        pipelines = {}
+
+        async def spawn(pipeline):
+            pipelines[pipeline.name] = pipeline
+            if pipeline.name == "root":
+                pipeline.submit_child_pipeline_request(
+                    {"name": "child", "type": LineagePipeline, "adaptive_fn": spawn}
+                )
+            elif pipeline.name == "child":
+                pipeline.submit_child_pipeline_request(
+                    {
+                        "name": "grandchild",
+                        "type": LineagePipeline,
+                        "adaptive_fn": spawn,
+                        "priority": 1,
+                    }
+                )
+
+        setup = PipelineSetup(
+            name="root", type=LineagePipeline, adaptive_fn=spawn, priority=3
+        )
+        await asyncio.wait_for(impress_manager.start([setup]), timeout=3.0)
+
+        root, child = pipelines["root"], pipelines["child"]
+        grandchild = pipelines["grandchild"]
+        assert child._lineage_root is root
+        assert grandchild._lineage_root is root
+        assert (root._generation, child._generation, grandchild._generation) == (
+            0,
+            1,
+            2,
+        )
+        assert (root._priority, child._priority, grandchild._priority) == (3, 3, 1)
+
+
+class FoldingPipeline(ImpressBasePipeline):
+    """Pipeline running two concurrent GPU tasks"""
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task()
+        async def fold(task_description={"gpus_per_rank": 1}):  # noqa: B006
+            return "/bin/true"
+
+    async def run(self):
+        await asyncio.gather(self.fold(), self.fold())
+
+    async def finalize(self):
+        pass
+
+
+class TestManagerTaskScheduling:
+    @pytest.mark.asyncio
+    async def test_tasks_respect_gpu_slots(self, mock_execution_backend, engine):
+        """Test that task scheduling never runs more GPU tasks than slots"""
+        manager = ImpressManager(
+            mock_execution_backend, resources={"gpus": 2}, task_scheduling=True
+        )
+        manager.logger = Mock()
+        engine.delay = 0.01
+
+        setups = [PipelineSetup(name=f"p{i}", type=FoldingPipeline) for i in range(4)]
+        await asyncio.wait_for(manager.start(setups), timeout=3.0)
+
+        metrics = manager.task_scheduler.metrics()
+        assert engine.peak == 2
+        assert metrics["released_tasks"] == 8
+        assert metrics["gpus_in_use"] == 0
+        # Whole pipelines are no longer held back by admission control
+        assert manager.admission.metrics()["max_queue_depth"] == 0
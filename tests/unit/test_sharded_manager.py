@@ -0,0 +1,94 @@
+import os
+
+import pytest
+from radical.asyncflow import NoopExecutionBackend
+
+from impress import ImpressBasePipeline, PipelineSetup, ShardedImpressManager
+
+# Pipeline types, adaptive functions and backend factories must be importable
+# from the shard processes, so they live at module level
+
+
+class ShardPipeline(ImpressBasePipeline):
+    """Root requests one adaptive step; children just finish"""
+
+    def __init__(self, name, flow, start_step=1, **kwargs):
+        self.start_step = start_step
+        super().__init__(name, flow, **kwargs)
+
+    async def run(self):
+        self.state["pid"] = os.getpid()
+        if self.start_step == 1:
+            await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def spawn_children(pipeline):
+    pipeline.submit_child_pipeline_requests(
+        [
+            {
+                "name": f"{pipeline.name}_b{i}",
+                "type": ShardPipeline,
+                "start_step": 2,
+                "spawn_reason": "branch",
+            }
+            for i in range(2)
+        ]
+    )
+
+
+def broken_backend():
+    raise RuntimeError("no allocation")
+
+
+class TestShardedManager:
+    @pytest.mark.asyncio
+    async def test_children_and_lineage_reach_the_coordinator(
+        self, tmp_path, monkeypatch
+    ):
+        """Test that roots spread over shards and children come back as lineage"""
+        monkeypatch.chdir(tmp_path)
+        manager = ShardedImpressManager(
+            NoopExecutionBackend, shards=2, use_colors=False, loop_lag_interval=None
+        )
+        setups = [
+            PipelineSetup(
+                name=f"root{i}", type=ShardPipeline, adaptive_fn=spawn_children
+            )
+            for i in range(4)
+        ]
+        await manager.start(setups)
+
+        snapshot = manager.lineage_snapshot()
+        assert snapshot["counts"]["completed"] == 12
+        assert snapshot["roots"] == [f"root{i}" for i in range(4)]
+        child = snapshot["pipelines"]["root3_b1"]
+        assert (child["parent"], child["generation"]) == ("root3", 1)
+        assert child["spawn_reason"] == "branch"
+        assert child["start_step"] == 2
+        assert snapshot["pipelines"]["root0"]["step"] == "adaptive"
+
+        assert sum(manager.placed) == 12
+        assert all(manager.placed)
+        assert manager.live == [0, 0]
+        assert sorted(manager.shard_stats) == [0, 1]
+        assert manager.shard_stats[0]["adaptive"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_dead_shard_fails_the_campaign(self, tmp_path, monkeypatch):
+        """Test that a shard that cannot start raises instead of hanging"""
+        monkeypatch.chdir(tmp_path)
+        manager = ShardedImpressManager(broken_backend, shards=1, use_colors=False)
+
+        with pytest.raises(RuntimeError, match="Shard 0 exited unexpectedly"):
+            await manager.start([PipelineSetup(name="root", type=ShardPipeline)])
+
+        # The coordinator thread is joined and cannot post to the closed loop
+        assert not manager._coordinator.is_alive()
+
+    def test_checkpointing_rejected(self):
+        """Test that sharded campaigns refuse a checkpoint path"""
+        with pytest.raises(ValueError):
+            ShardedImpressManager(NoopExecutionBackend, checkpoint_path="c.db")
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from impress import ImpressBasePipeline, PipelineSetup
+from impress.backends.simulation import (
+    Constant,
+    Empirical,
+    LogNormal,
+    SimulationBackend,
+    durations_from_trace,
+    run_virtual,
+    simulate,
+)
+from impress.utils.tracing import Tracer
+
+
+class FoldingPipeline(ImpressBasePipeline):
+    """Pipeline with a CPU preparation step and four GPU folds"""
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task()
+        async def prepare(task_description={}):  # noqa: B006
+            return "/bin/true"
+
+        @self.auto_register_task()
+        async def fold(task_description={"gpus_per_rank": 1}):  # noqa: B006
+            return "/bin/true"
+
+    async def run(self):
+        await self.prepare()
+        await asyncio.gather(*[self.fold() for _ in range(4)])
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def spawn_once(pipeline):
+    if not pipeline.name.endswith("-child"):
+        pipeline.submit_child_pipeline_request(
+            {"name": f"{pipeline.name}-child", "type": FoldingPipeline}
+        )
+
+
+EXAMPLE = Path(__file__).parents[2] / "examples" / "discontinuous_scaffolds"
+
+
+def campaign(count=2):
+    return [
+        PipelineSetup(name=f"p{i}", type=FoldingPipeline, adaptive_fn=spawn_once)
+        for i in range(count)
+    ]
+
+
+class TestVirtualClock:
+    def test_sleep_is_instant(self):
+        """Test that virtual time jumps over idle waits"""
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            await asyncio.sleep(3600)
+            return loop.time()
+
+        assert run_virtual(main()) == pytest.approx(3600)
+
+
+@pytest.mark.usefixtures("work_dir")
+class TestSimulationBackend:
+    def test_makespan_and_utilization(self):
+        """Test that GPU contention shapes the predicted makespan"""
+        backend = SimulationBackend(
+            {"prepare": Constant(60), "fold": Constant(3600)},
+            resources={"gpus": 4},
+        )
+        report = simulate(campaign(), backend, use_colors=False)
+
+        # 4 pipelines (2 roots, 2 children) with 4 one-hour folds on 4 GPUs:
+        # the folds serialize after the roots' preparation, and the
+        # children prepare while GPUs are busy
+        assert report["tasks"] == 20
+        assert report["per_task"]["fold"]["count"] == 16
+        assert report["peak_gpus"] == 4
+        assert report["gpu_seconds"] == pytest.approx(16 * 3600)
+        assert report["makespan_s"] == pytest.approx(60 + 4 * 3600)
+        assert report["gpu_utilization"] == pytest.approx(
+            16 * 3600 / (4 * report["makespan_s"])
+        )
+        assert report["cpu_utilization"] is None
+
+    def test_deterministic(self):
+        """Test that a seed reproduces the same prediction"""
+
+        def run():
+            backend = SimulationBackend(
+                {"fold": LogNormal(600, 0.5)}, resources={"gpus": 2}, seed=7
+            )
+            return simulate(campaign(3), backend, use_colors=False)
+
+        assert run() == run()
+
+    def test_failures(self):
+        """Test that simulated failures surface as failed tasks"""
+        backend = SimulationBackend(failure_rates={"prepare": 1.0})
+        report = simulate(campaign(1), backend, use_colors=False)
+
+        assert report["failed"] == 1
+        assert "fold" not in report["per_task"]
+
+
+class TestDurations:
+    def test_from_chrome_and_otlp_traces(self, tmp_path):
+        """Test that task spans of either trace format become distributions"""
+        tracer = Tracer()
+        tracer.record("fold", "task", "p1", 0, 2_000_000_000)
+        tracer.record("fold", "task", "p1", 0, 4_000_000_000)
+        tracer.record("check", "local", "p1", 0, 1_000_000_000)
+
+        for trace_format in ("chrome", "otlp"):
+            path = tmp_path / f"{trace_format}.json"
+            tracer.export(str(path), trace_format)
+            durations = durations_from_trace(str(path))
+
+            assert set(durations) == {"fold"}
+            assert isinstance(durations["fold"], Empirical)
+            assert sorted(durations["fold"].samples) == pytest.approx([2.0, 4.0])
+
+        fitted = durations_from_trace(str(tmp_path / "otlp.json"), fit="lognormal")
+        assert fitted["fold"].median == pytest.approx(8**0.5)
+
+    def test_unknown_fit(self, tmp_path):
+        """Test that an unknown fit fails fast"""
+        path = tmp_path / "trace.json"
+        path.write_text(json.dumps({"traceEvents": []}))
+        with pytest.raises(ValueError):
+            durations_from_trace(str(path), fit="gamma")
+
+
+class TestExampleCampaign:
+    def test_runs_every_stage(self, work_dir, monkeypatch):
+        """Test that stub scores carry the example campaign through all stages"""
+        pytest.importorskip("pandas")
+        monkeypatch.syspath_prepend(str(EXAMPLE))
+        from simulate_discontinuous_scaffolds import (
+            ESTIMATED_DURATIONS,
+            simulate_campaign,
+        )
+
+        report = simulate_campaign(ESTIMATED_DURATIONS, gpus=2)
+
+        assert report["failed"] == 0
+        assert set(report["per_task"]) == set(ESTIMATED_DURATIONS)
+        assert {entry["count"] for entry in report["per_task"].values()} == {2}
+        # Only the workflow engine's session directory lands in the working
+        # directory; the pipelines write to a temporary one
+        assert all(name.startswith("asyncflow.session.") for name in os.listdir())
@@ -0,0 +1,101 @@
+import asyncio
+import csv
+from unittest.mock import Mock
+
+import pytest
+
+from impress import ImpressManager, PipelineSetup
+from impress.utils.stats import Histogram, RunStats
+
+from .test_tracing import TracedPipeline, spawn_child
+
+
+class TestHistogram:
+    def test_percentiles(self):
+        """Test that percentiles land within one bucket of the true value"""
+        histogram = Histogram()
+        for i in range(1, 101):
+            histogram.record(i / 100)
+
+        assert histogram.count == 100
+        assert histogram.total == pytest.approx(50.5)
+        assert 0.5 <= histogram.percentile(50) <= 0.5 * Histogram.GROWTH
+        assert 0.95 <= histogram.percentile(95) <= 0.95 * Histogram.GROWTH
+        assert histogram.percentile(100) == 1.0
+
+    def test_constant_size(self):
+        """Test that extreme samples do not grow the histogram"""
+        histogram = Histogram()
+        for value in (0.0, 1e-9, 1e9):
+            histogram.record(value)
+
+        assert len(histogram.counts) == Histogram.BUCKETS
+        assert histogram.counts[0] == 2
+        assert histogram.counts[-1] == 1
+        assert histogram.max == 1e9
+
+    def test_empty(self):
+        """Test that an empty histogram reports zero"""
+        assert Histogram().percentile(95) == 0.0
+
+
+class TestRunStats:
+    def test_csv_and_table(self, tmp_path):
+        """Test that task, adaptive and pipeline rows are dumped"""
+        stats = RunStats()
+        stats.record_task("p1", "fold", 2.0, queue_time=0.5)
+        stats.record_task("p1", "fold", 4.0, failed=True)
+        stats.record_adaptive(0.1)
+        stats.record_pipeline("p1", 7.0, "completed", admission_wait=1.0)
+
+        path = tmp_path / "stats.csv"
+        stats.to_csv(str(path))
+        with open(path) as f:
+            rows = {(r["scope"], r["name"]): r for r in csv.DictReader(f)}
+
+        fold = rows[("task", "fold")]
+        assert (fold["count"], fold["failures"]) == ("2", "1")
+        assert float(fold["total_s"]) == 6.0
+        assert float(fold["queue_s"]) == 0.5
+        assert ("adaptive", "adaptive") in rows
+        pipeline = rows[("pipeline", "p1")]
+        assert pipeline["status"] == "completed"
+        # Run time has its own column; task-only statistics stay empty
+        assert float(pipeline["duration_s"]) == 7.0
+        assert pipeline["max_s"] == pipeline["p50_s"] == ""
+        assert fold["duration_s"] == ""
+
+        table = stats.format_table()
+        assert "fold" in table and "pipelines" in table
+
+
+class TestManagerStats:
+    @pytest.mark.asyncio
+    async def test_manager_stats(self, tmp_path, engine):
+        """Test that a run exposes and dumps per-task and per-pipeline stats"""
+        path = tmp_path / "stats.csv"
+        manager = ImpressManager(Mock(), stats_path=str(path))
+        manager.logger = Mock()
+        setups = [
+            PipelineSetup(name="p1", type=TracedPipeline, adaptive_fn=spawn_child)
+        ]
+        engine.delay = 0.01
+        await asyncio.wait_for(manager.start(setups), timeout=3.0)
+
+        stats = manager.stats()
+        assert stats["tasks"]["fold"]["count"] == 4
+        assert stats["tasks"]["check"]["count"] == 2
+        assert stats["adaptive"]["count"] == 2
+        assert set(stats["pipelines"]) == {"p1", "p1-child"}
+        assert stats["pipelines"]["p1"]["status"] == "completed"
+        assert stats["pipeline_durations"]["count"] == 2
+        assert stats["tasks"]["fold"]["p95_s"] >= stats["tasks"]["fold"]["p50_s"]
+
+        manager.logger.run_statistics.assert_called_once()
+        assert path.exists()
+
+    def test_disabled(self):
+        """Test that stats collection can be turned off"""
+        manager = ImpressManager(Mock(), collect_stats=False)
+        assert manager.run_stats is None
+        assert manager.stats() == {}
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.task_cache import TaskCache
+
+
+class AnalysisPipeline(ImpressBasePipeline):
+    """Pipeline running the same cached analysis twice"""
+
+    def __init__(self, name, flow, pdb_dir, **kwargs):
+        self.pdb_dir = pdb_dir
+        super().__init__(name, flow, **kwargs)
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task(cache=True, cache_inputs=lambda: [self.pdb_dir])
+        async def backbone_analysis():
+            return f"analyse {self.pdb_dir}"
+
+    async def run(self):
+        self.state["first"] = await self.backbone_analysis()
+        self.state["second"] = await self.backbone_analysis()
+
+    async def finalize(self):
+        pass
+
+
+class TickingPipeline(ImpressBasePipeline):
+    """Pipeline that only awaits short sleeps and records when it is done"""
+
+    def register_pipeline_tasks(self):
+        pass
+
+    async def run(self):
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+        self.state["done_at"] = time.monotonic()
+
+    async def finalize(self):
+        pass
+
+
+@pytest.fixture
+def pdb_dir(tmp_path):
+    directory = tmp_path / "pdbs"
+    directory.mkdir()
+    (directory / "a.pdb").write_text("ATOM 1")
+    return directory
+
+
+class TestTaskCache:
+    def test_key_tracks_inputs_and_environment(self, tmp_path, pdb_dir, monkeypatch):
+        """Test that input files and environment variables change the key"""
+        cache = TaskCache(str(tmp_path / "cache"), environment=["IMPRESS_TEST_ENV"])
+        key = cache.key("cmd", [str(pdb_dir)])
+
+        assert cache.key("cmd", [str(pdb_dir)]) == key
+        assert cache.key("other", [str(pdb_dir)]) != key
+
+        (pdb_dir / "b.pdb").write_text("ATOM 2")
+        changed = cache.key("cmd", [str(pdb_dir)])
+        assert changed != key
+
+        monkeypatch.setenv("IMPRESS_TEST_ENV", "1")
+        assert cache.key("cmd", [str(pdb_dir)]) != changed
+
+    def test_content_hashing_ignores_mtime(self, tmp_path, pdb_dir):
+        """Test that content hashing survives touching a file"""
+        cache = TaskCache(str(tmp_path / "cache"), hash_contents=True)
+        key = cache.key("cmd", [str(pdb_dir)])
+        os.utime(pdb_dir / "a.pdb", (0, 0))
+
+        assert cache.key("cmd", [str(pdb_dir)]) == key
+
+    def test_hit_restores_missing_outputs(self, tmp_path):
+        """Test that a hit returns the value and restores deleted outputs"""
+        cache = TaskCache(str(tmp_path / "cache"))
+        output = tmp_path / "scores.csv"
+        output.write_text("id,score\n1,0.9\n")
+
+        assert cache.store("k", {"rc": 0}, [str(output)])
+        output.unlink()
+
+        assert cache.lookup("k") == (True, {"rc": 0})
+        assert output.read_text() == "id,score\n1,0.9\n"
+        assert cache.lookup("missing") == (False, None)
+        assert cache.metrics()["hits"] == 1
+        assert cache.metrics()["misses"] == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries go first"""
+        cache = TaskCache(str(tmp_path / "cache"), max_bytes=2500)
+        payload = "x" * 1000
+        cache.store("a", payload)
+        cache.store("b", payload)
+        cache.lookup("a")
+        cache.store("c", payload)
+
+        assert cache.lookup("b") == (False, None)
+        assert cache.lookup("a")[0] and cache.lookup("c")[0]
+        assert cache.metrics()["evictions"] == 1
+        assert cache.size <= 2500
+
+
+@pytest.fixture
+def engine(engine):
+    engine.result = "stdout of {command}"
+    return engine
+
+
+class TestCachedTasks:
+    @pytest.mark.asyncio
+    async def test_identical_calls_are_submitted_once(self, tmp_path, pdb_dir, engine):
+        """Test that a repeated cached task reuses the first result"""
+        cache = TaskCache(str(tmp_path / "cache"))
+        manager = ImpressManager(execution_backend=Mock(), task_cache=cache)
+        manager.logger = Mock()
+
+        finished = []
+        manager.admission.release = Mock(side_effect=finished.append)
+        setup = PipelineSetup(
+            name="p1", type=AnalysisPipeline, kwargs={"pdb_dir": str(pdb_dir)}
+        )
+        await asyncio.wait_for(manager.start([setup]), timeout=2.0)
+
+        expected = f"stdout of analyse {pdb_dir}"
+        assert engine.commands == [f"analyse {pdb_dir}"]
+        assert finished[0].state == {"first": expected, "second": expected}
+        assert cache.metrics()["hits"] == 1
+        manager.logger.task_cache_summary.assert_called_once_with(1, 1)
+
+    @pytest.mark.asyncio
+    async def test_cache_is_opt_in(self, pdb_dir, engine):
+        """Test that cached tasks run normally without a manager cache"""
+        manager = ImpressManager(execution_backend=Mock())
+        manager.logger = Mock()
+
+        setup = PipelineSetup(
+            name="p1", type=AnalysisPipeline, kwargs={"pdb_dir": str(pdb_dir)}
+        )
+        await asyncio.wait_for(manager.start([setup]), timeout=2.0)
+
+        assert len(engine.commands) == 2
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_does_not_block_the_loop(self, tmp_path, pdb_dir, engine):
+        """Test that a slow input fingerprint leaves other pipelines running"""
+        cache = TaskCache(str(tmp_path / "cache"))
+        manager = ImpressManager(execution_backend=Mock(), task_cache=cache)
+        manager.logger = Mock()
+        finished = {}
+        manager.admission.release = Mock(
+            side_effect=lambda p: finished.setdefault(p.name, p)
+        )
+        fingerprinted = []
+        fingerprint = TaskCache._fingerprint
+
+        def slow_fingerprint(self, path):
+            time.sleep(0.3)
+            fingerprinted.append(time.monotonic())
+            return fingerprint(self, path)
+
+        setups = [
+            PipelineSetup(
+                name="cached", type=AnalysisPipeline, kwargs={"pdb_dir": str(pdb_dir)}
+            ),
+            PipelineSetup(name="ticking", type=TickingPipeline),
+        ]
+        with patch.object(TaskCache, "_fingerprint", slow_fingerprint):
+            await asyncio.wait_for(manager.start(setups), timeout=5.0)
+
+        assert finished["ticking"].state["done_at"] < fingerprinted[0]
+        assert len(engine.commands) == 1
@@ -0,0 +1,159 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from impress import ImpressBasePipeline, ImpressManager, PipelineSetup
+from impress.utils.tracing import Tracer
+
+
+class TracedPipeline(ImpressBasePipeline):
+    """Pipeline exercising every traced step"""
+
+    def __init__(self, name, flow, spawn=True, **kwargs):
+        self.spawn = spawn
+        super().__init__(name, flow, **kwargs)
+
+    def register_pipeline_tasks(self):
+        @self.auto_register_task()
+        async def fold(task_description={"gpus_per_rank": 1}):  # noqa: B006
+            return "/bin/true"
+
+        @self.auto_register_task(local_task=True)
+        async def check():
+            return True
+
+    async def run(self):
+        await asyncio.gather(self.fold(), self.fold())
+        await self.check()
+        await self.run_adaptive_step(wait=True)
+
+    async def finalize(self):
+        pass
+
+
+async def spawn_child(pipeline):
+    if pipeline.spawn:
+        pipeline.submit_child_pipeline_request(
+            {"name": f"{pipeline.name}-child", "type": TracedPipeline, "spawn": False}
+        )
+
+
+async def run_traced(path, trace_format="chrome", **kwargs):
+    manager = ImpressManager(
+        Mock(), trace_path=str(path), trace_format=trace_format, **kwargs
+    )
+    manager.logger = Mock()
+    setups = [PipelineSetup(name="p1", type=TracedPipeline, adaptive_fn=spawn_child)]
+    await asyncio.wait_for(manager.start(setups), timeout=3.0)
+    with open(path) as f:
+        return manager, json.load(f)
+
+
+class TestTracer:
+    def test_chrome_document(self):
+        """Test that spans become complete events on named tracks"""
+        tracer = Tracer()
+        tracer.record("fold", "task", "p1", 1_000, 5_000, status="ok")
+        tracer.record("wake", "manager", "manager", 2_000, 3_000)
+
+        document = tracer.to_chrome()
+        names = {
+            e["args"]["name"]: e["tid"]
+            for e in document["traceEvents"]
+            if e["ph"] == "M"
+        }
+        fold = next(e for e in document["traceEvents"] if e["name"] == "fold")
+
+        assert names == {"manager": 0, "p1": 1}
+        assert (fold["ts"], fold["dur"], fold["tid"]) == (0.0, 4.0, 1)
+        assert fold["args"] == {"status": "ok"}
+
+    def test_otlp_document(self):
+        """Test that OTLP spans carry ids, parents and typed attributes"""
+        tracer = Tracer()
+        parent = tracer.new_span_id()
+        tracer.record("fold", "task", "p1", 10, 20, parent_id=parent, retries=2)
+        tracer.record("p1", "pipeline", "p1", 0, 30, span_id=parent)
+
+        spans = tracer.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        fold, pipeline = spans
+
+        assert fold["parentSpanId"] == pipeline["spanId"]
+        assert "parentSpanId" not in pipeline
+        assert int(fold["endTimeUnixNano"]) - int(fold["startTimeUnixNano"]) == 10
+        assert {"key": "retries", "value": {"intValue": "2"}} in fold["attributes"]
+
+    def test_max_spans(self):
+        """Test that recording stops at the span budget"""
+        tracer = Tracer(max_spans=1)
+        tracer.record("a", "task", "p1", 0, 1)
+        tracer.record("b", "task", "p1", 0, 1)
+
+        assert len(tracer.spans) == 1
+        assert tracer.dropped == 1
+
+
+@pytest.fixture
+def engine(engine):
+    engine.delay = 0.01
+    return engine
+
+
+@pytest.mark.usefixtures("engine")
+class TestManagerTracing:
+    @pytest.mark.asyncio
+    async def test_campaign_spans(self, tmp_path):
+        """Test that a traced campaign covers every span category"""
+        manager, document = await run_traced(tmp_path / "trace.json")
+
+        events = [e for e in document["traceEvents"] if e["ph"] == "X"]
+        categories = {e["cat"] for e in events}
+        assert {
+            "pipeline",
+            "task",
+            "local",
+            "adaptive",
+            "adaptive_wait",
+            "spawn",
+            "manager",
+        } <= categories
+
+        tracks = {
+            e["args"]["name"]: e["tid"]
+            for e in document["traceEvents"]
+            if e["ph"] == "M"
+        }
+        spawn = next(e for e in events if e["cat"] == "spawn")
+        assert spawn["tid"] == tracks["p1-child"]
+        assert sum(e["cat"] == "task" for e in events) == 4
+
+    @pytest.mark.asyncio
+    async def test_queue_spans_and_otlp_lineage(self, tmp_path):
+        """Test that scheduler waits show up and children nest under parents"""
+        manager, document = await run_traced(
+            tmp_path / "trace.json",
+            trace_format="otlp",
+            resources={"gpus": 1},
+            task_scheduling=True,
+        )
+
+        spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        by_name = {s["name"]: s for s in spans if s["name"] in ("p1", "p1-child")}
+        category = {
+            s["spanId"]: next(
+                a["value"]["stringValue"]
+                for a in s["attributes"]
+                if a["key"] == "impress.category"
+            )
+            for s in spans
+        }
+
+        assert by_name["p1-child"]["parentSpanId"] == by_name["p1"]["spanId"]
+        assert "queue" in category.values()
+
+    def test_unknown_format_rejected(self):
+        """Test that an unknown trace format fails fast"""
+        with pytest.raises(ValueError):
+            ImpressManager(Mock(), trace_path="trace.json", trace_format="xml")